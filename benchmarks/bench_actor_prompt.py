@@ -0,0 +1,75 @@
+"""
+Measures the actor prompt's size and build time across Reflexion trials.
+
+Each trial adds one lesson to memory and builds the actor prompt once per step, the way
+ReactAgent does. Reports, per trial, the prompt's estimated tokens and the median build
+time with the lessons passed as a ReflectionContext (render cached per trial) and as a
+plain list of strings.
+
+Usage:
+    python -m benchmarks.bench_actor_prompt [--trials N] [--steps S] [--budget TOKENS] [--runs R]
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from src.agent import PromptBuilder
+from src.components import Reflection
+from src.components.memory import SimpleMemory
+from src.tools import all_tools
+from src.utils.text import estimate_tokens
+
+
+def _lesson(i: int) -> Reflection:
+    return Reflection(id=str(uuid.uuid4()), root_cause_analysis="n/a", confidence=0.9,
+                      actionable_heuristic=f"Lesson {i}: verify every figure against the primary source before finishing.")
+
+
+def _step(i: int) -> dict:
+    return {"thought": f"Step {i}: look this up.", "action": "search", "action_input": f"query {i}",
+            "observation": "A search result snippet. " * 20}
+
+
+def _build_time(task: str, trajectory: list, reflections, budget: int, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        PromptBuilder.build_actor_prompt(task=task, tools=all_tools, trajectory=trajectory,
+                                         reflections=reflections, reflection_token_budget=budget)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=8, help="Actor steps (prompt builds) per trial.")
+    parser.add_argument("--budget", type=int, default=500, help="reflection_token_budget, as in ReactAgent.")
+    parser.add_argument("--runs", type=int, default=50, help="Builds per measurement; the median is reported.")
+    args = parser.parse_args()
+
+    task = "What is the population of France divided by the population of Paris?"
+    memory = SimpleMemory(max_size=args.trials)
+    header = f"{'trial':>5}{'lessons':>9}{'tokens (step 1)':>17}{'tokens (last)':>15}{'context us':>12}{'list us':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for trial in range(1, args.trials + 1):
+        context = memory.get_context()
+        as_list = list(context.heuristics)
+        sizes, context_times, list_times, trajectory = [], [], [], []
+        for step in range(args.steps):
+            messages = PromptBuilder.build_actor_prompt(task=task, tools=all_tools, trajectory=trajectory,
+                                                        reflections=context, reflection_token_budget=args.budget)
+            sizes.append(sum(estimate_tokens(m["content"]) for m in messages))
+            context_times.append(_build_time(task, trajectory, context, args.budget, args.runs))
+            list_times.append(_build_time(task, trajectory, as_list, args.budget, args.runs))
+            trajectory.append(_step(step))
+        print(f"{trial:>5}{len(context):>9}{sizes[0]:>17}{sizes[-1]:>15}"
+              f"{statistics.median(context_times) * 1e6:>12.1f}{statistics.median(list_times) * 1e6:>10.1f}")
+        memory.add(_lesson(trial))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compares the HTML-to-text extractors on a corpus of pages.
+
+Usage:
+    python -m benchmarks.bench_html_extract [PAGES_DIR] [--runs N] [--scale K]
+
+Without PAGES_DIR the corpus is synthetic: three generated pages (see
+benchmarks/synthetic_pages.py) with filler text and heavy boilerplate, not real sites.
+Pass a directory of saved .html pages to measure real markup. --scale repeats each
+page's <main> content K times to simulate very large pages.
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_pages import synthetic_pages
+from src.tools.html_extract import LxmlExtractor, SoupExtractor
+
+
+def _scale(markup: bytes, factor: int) -> bytes:
+    if factor <= 1 or b"<main>" not in markup:
+        return markup
+    head, rest = markup.split(b"<main>", 1)
+    main, tail = rest.split(b"</main>", 1)
+    return head + b"<main>" + main * factor + b"</main>" + tail
+
+
+def _time(extractor, markup: bytes, runs: int):
+    timings, text = [], ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        text = extractor.extract(markup, "utf-8")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages_dir", nargs="?", type=Path, help="Saved .html pages; defaults to the synthetic corpus.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per page; the median is reported.")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat each page's main content this many times.")
+    args = parser.parse_args()
+
+    if args.pages_dir is None:
+        pages = synthetic_pages()
+    else:
+        pages = {p.name: p.read_bytes() for p in sorted(args.pages_dir.iterdir()) if p.suffix in (".html", ".htm")}
+    if not pages:
+        raise SystemExit(f"No .html pages found in {args.pages_dir}")
+
+    extractors = {"lxml": LxmlExtractor(), "soup": SoupExtractor()}
+    header = f"{'page':<24}{'size KiB':>10}" + "".join(f"{name + ' ms':>12}{name + ' chars':>14}" for name in extractors) + f"{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+
+    totals = {name: 0.0 for name in extractors}
+    for page_name, page in pages.items():
+        markup = _scale(page, args.scale)
+        row = f"{page_name:<24}{len(markup) / 1024:>10.1f}"
+        results = {}
+        for name, extractor in extractors.items():
+            seconds, chars = _time(extractor, markup, args.runs)
+            results[name] = seconds
+            totals[name] += seconds
+            row += f"{seconds * 1000:>12.2f}{chars:>14}"
+        row += f"{results['soup'] / results['lxml']:>9.1f}x"
+        print(row)
+
+    print("-" * len(header))
+    print(f"Total: lxml {totals['lxml'] * 1000:.1f} ms, soup {totals['soup'] * 1000:.1f} ms "
+          f"({totals['soup'] / totals['lxml']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
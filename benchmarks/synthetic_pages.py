@@ -0,0 +1,110 @@
+"""
+Generates the synthetic HTML corpus used by bench_html_extract.
+
+The pages are not real saved pages: they are deterministic filler shaped like common page
+types (a news article, an API reference and a search listing), wrapped in the boilerplate
+that makes real pages slow to extract: a large <style> block, inline JSON <script> blobs,
+a mega-menu <nav>, a cookie banner, a related-links sidebar and a link-heavy footer.
+
+Usage:
+    python -m benchmarks.synthetic_pages OUT_DIR
+
+Writes the pages to OUT_DIR, e.g. to inspect them or to edit a copy by hand.
+"""
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Dict
+
+SEED = 0
+WORDS = ("the during planet moon orbit crater dust storm wind ice water pole equator surface "
+         "atmosphere pressure temperature season winter summer rover landing site sample analysis "
+         "data mission scientists observed measured reported average camera spectrometer magnetic "
+         "field gravity solar volcano").split()
+
+
+def _sentence(rng: random.Random, low: int = 8, high: int = 22) -> str:
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random, sentences: int = 4) -> str:
+    return "<p>" + " ".join(_sentence(rng) for _ in range(sentences)) + "</p>"
+
+
+def _news_article(rng: random.Random) -> str:
+    body = ['<article><header><h1>Dust Storms on Mars Reach Record Size</h1><p class="byline">By A. Writer</p></header>']
+    for _ in range(8):
+        body.append(f"<h2>{_sentence(rng, 5, 5)}</h2>")
+        body.extend(_paragraph(rng) for _ in range(5))
+    return "".join(body) + "</article>"
+
+
+def _api_docs(rng: random.Random) -> str:
+    body = ["<article><h1>HttpClient reference</h1>"]
+    for i in range(25):
+        rows = "".join(f"<tr><td>arg{j}</td><td>{_sentence(rng)}</td></tr>" for j in range(6))
+        body.append(f"<section><h2>Method {i}</h2>{_paragraph(rng, 3)}"
+                    f"<pre><code>client.method_{i}(url, timeout=5)\n</code></pre>"
+                    f"<table><tr><th>Parameter</th><th>Description</th></tr>{rows}</table></section>")
+    return "".join(body) + "</article>"
+
+
+def _search_listing(rng: random.Random) -> str:
+    cards = "".join(f'<div class="card"><h3>{_sentence(rng, 6, 6)}</h3><p>{_sentence(rng)}</p>'
+                    '<span class="share-buttons">Share Tweet Email</span></div>' for _ in range(150))
+    return f'<div class="results">{cards}</div>'
+
+
+PAGES: Dict[str, tuple] = {
+    "api_docs.html": ("HttpClient reference", _api_docs),
+    "news_article.html": ("Dust Storms on Mars", _news_article),
+    "search_listing.html": ("Results", _search_listing),
+}
+
+
+def _boilerplate(rng: random.Random):
+    """ The <head> extras and the chrome around <main>, shared by every page. """
+    style = "\n".join(f".c{i} {{ margin: {i}px; padding: {i % 7}px; color: #{i:06x}; }}" for i in range(800))
+    scripts = "".join(f"<script>window.__data{i} = {json.dumps({'items': [rng.random() for _ in range(200)]})};</script>"
+                      for i in range(8))
+    nav = "".join(f'<li><a href="/section/{s}">Section {s}</a><ul>'
+                  + "".join(f'<li><a href="/section/{s}/{t}">Topic {s}.{t}</a></li>' for t in range(12))
+                  + "</ul></li>" for s in range(15))
+    header = ('<header class="masthead"><a href="/">Example</a></header>'
+              '<div id="cookie-consent" class="cookie-banner"><p>We use cookies to improve your experience.</p>'
+              f'<button>Accept</button></div><nav class="site-nav"><ul>{nav}</ul></nav>')
+    related = "".join(f'<li><a href="/r/{i}">{_sentence(rng, 6, 6)}</a></li>' for i in range(25))
+    columns = "".join(f'<div class="footer-col"><h4>Links {c}</h4><ul>'
+                      + "".join(f'<li><a href="/f/{c}/{i}">Footer link {i}</a></li>' for i in range(10))
+                      + "</ul></div>" for c in range(6))
+    footer = (f'<aside class="sidebar"><h3>Related</h3><ul>{related}</ul></aside>'
+              f'<footer class="site-footer">{columns}<p>Copyright 2025 Example Media. All rights reserved.</p></footer>')
+    return f"<style>{style}</style>{scripts}", header, footer
+
+
+def synthetic_pages(seed: int = SEED) -> Dict[str, bytes]:
+    """ Returns {file name: markup}; the same seed always gives byte-identical pages. """
+    pages = {}
+    for name, (title, build_main) in PAGES.items():
+        rng = random.Random(seed)
+        head, header, footer = _boilerplate(rng)
+        pages[name] = (f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{title}</title>{head}</head>'
+                       f"<body>{header}<main>{build_main(rng)}</main>{footer}</body></html>").encode("utf-8")
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir", type=Path)
+    args = parser.parse_args()
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    for name, markup in synthetic_pages().items():
+        (args.out_dir / name).write_bytes(markup)
+        print(f"wrote {args.out_dir / name} ({len(markup) / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
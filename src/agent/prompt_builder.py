@@ -1,8 +1,8 @@
 import logging
 import json
 
-from typing import List, Dict, Any
-from src.components import EvaluationReport, EvaluationStatus
+from typing import List, Dict, Any, Optional, Union
+from src.components import EvaluationReport, EvaluationStatus, ReflectionContext
 
 logger = logging.getLogger(__name__)
 
@@ -12,14 +12,17 @@ class PromptBuilder:
     """
 
     @staticmethod
-    def build_actor_prompt(task: str, tools: List[Any], trajectory: List[Dict[str, Any]], reflections: List[str] = None) -> List[Dict[str, str]]:
+    def build_actor_prompt(task: str, tools: List[Any], trajectory: List[Dict[str, Any]],
+                           reflections: Optional[Union[ReflectionContext, List[str]]] = None,
+                           reflection_token_budget: Optional[int] = None) -> List[Dict[str, str]]:
         """
         Builds the prompt for the ReAct agent (the Actor) as a message list.
         Args:
             task: User's task
             tools: Available tools
             trajectory: Current attempt history (for continuation)
-            context: Additional context (e.g., reflections from past attempts)
+            reflections: Lessons from past attempts, as a ReflectionContext (from memory) or a list of strings
+            reflection_token_budget: Maximum estimated tokens spent on reflections (newest kept)
         
         Returns:
             List of Dictionaries 
@@ -27,7 +30,7 @@ class PromptBuilder:
         # Extract tool names
         tool_names_list = [t.name for t in tools]
         search_tool_name = next((name for name in tool_names_list if 'search' in name.lower()), 'search')
-        browse_tool_name = next((name for name in tool_names_list if 'inquisitive' in name.lower()), 'web_browse') 
+        browse_tool_name = next((name for name in tool_names_list if 'adaptive' in name.lower() or 'inquisitive' in name.lower()), 'web_browse') 
         finish_tool_name = next((name for name in tool_names_list if 'finish' in name.lower()), 'finish')
         
         tool_names_str = ", ".join([f"`{name}`" for name in tool_names_list])
@@ -50,10 +53,11 @@ class PromptBuilder:
         
         # Reflections from previous failed attempts
         reflections_section = ""
-        if reflections:
-            reflection_items = "\n".join(f"  • {r}" for r in reflections)
+        reflection_items = PromptBuilder._coerce_reflections(reflections).render(reflection_token_budget)
+        if reflection_items:
             reflections_section = (
                 "\n<past_failures>\n"
+                "## Lessons from Past Attempts\n"
                 "You have attempted this task before. Learn from these mistakes:\n"
                 f"{reflection_items}\n"
                 "</past_failures>"
@@ -75,7 +79,9 @@ class PromptBuilder:
             f"  • Use `{search_tool_name}` to discover relevant sources (returns URLs and snippets)\n"
             "   • NEVER trust search snippets alone - they are often outdated or incomplete\n"
             f"  • ALWAYS verify by browsing: Use `{browse_tool_name}` with the URL and a specific question\n"
-            f"  • Only use `dynamic_web_reader` if `{browse_tool_name}` fails (JavaScript-heavy sites)\n\n"
+            + (f"  • Only use `dynamic_web_reader` if `{browse_tool_name}` fails (JavaScript-heavy sites)\n"
+               if "dynamic_web_reader" in tool_names_list else "")
+            + "\n"
             
             "**Step 3: CRITICAL RULES FOR Action Input**\n"
             "   1. **NO CONVERSATIONAL TEXT**: The 'Action Input' must contain ONLY the arguments for the tool. Do NOT add notes, explanations, or 'I will now...' before or after the input."
@@ -308,6 +314,101 @@ class PromptBuilder:
             {"role": "user", "content": user_content}
         ]
 
+    @staticmethod
+    def build_judge_reflector_prompt(task: str, actor_result: Dict[str, Any]) -> List[Dict[str, str]]:
+        """
+        Builds a single prompt that asks for the evaluation AND, when the attempt fell
+        short, the reflection. Same rubric as build_evaluator_prompt, same "Cause, Impact,
+        Heuristic" framework as the reflector prompts, but the task and trajectory are
+        sent only once.
+        """
+        trajectory = actor_result.get("trajectory", [])
+        answer = actor_result.get("final_answer", "")
+        actor_status = actor_result.get("status", "unknown")
+
+        system_content = """
+            You are an expert AI evaluator and root-cause analyst. You first judge whether an AI agent completed its task, then, if it did not fully succeed, you diagnose why and write one lesson for its next attempt. Respond with a single JSON object.
+
+            # PART 1: EVALUATION
+            ## Status Definitions
+            - **FULL_SUCCESS**: The answer is correct, complete, and directly addresses the user's intent.
+            - **PARTIAL_SUCCESS**: Some but not all requirements (sub-goals) were fulfilled.
+            - **FAILURE**: The answer is incorrect, incomplete, or irrelevant.
+
+            ## Rules
+            1.  Judge the correctness of the final answer against the task's core requirements.
+            2.  Do NOT penalize extra, correct information unless the task demanded conciseness.
+            3.  Decompose multi-part tasks into sub-goals and state 'X of Y sub-goals completed.'
+
+            ## Confidence Guidelines
+            - **0.95-1.0**: The answer is objectively verifiable as correct (or incorrect).
+            - **0.80-0.95**: Strong evidence, minor uncertainty.
+            - **0.60-0.80**: Plausible but with notable uncertainties.
+            - **Below 0.60**: High uncertainty; still make a definitive judgment.
+
+            # PART 2: REFLECTION (only if status is not FULL_SUCCESS)
+            Follow the "Cause, Impact, Heuristic" framework using the trajectory:
+            1.  **Cause**: For FAILURE, the fundamental flawed assumption in the agent's strategy. For PARTIAL_SUCCESS, the specific technical reason the failing sub-task broke.
+            2.  **Impact**: How that cause led to the verdict above.
+            3.  **Heuristic**: One generalizable, actionable rule that prevents this class of error. For PARTIAL_SUCCESS, a targeted fix that preserves the working parts of the strategy.
+            4.  **Valid Prefix**: How many leading trajectory steps were correct and can be kept as-is (the steps before the first mistake; 0 if the strategy was wrong from the start).
+            If the status is FULL_SUCCESS, set "reflection" to null.
+
+            **Important**: Return ONLY the JSON object, with no additional text or explanations.
+            **Output in this EXACT JSON format**:
+            ```json
+            {
+                "status": "FULL_SUCCESS" | "PARTIAL_SUCCESS" | "FAILURE",
+                "reason": "A clear, specific explanation of your judgment.",
+                "confidence": 0.0-1.0,
+                "confidence_reasoning": "I am this confident because... The primary risk is...",
+                "metadata": {},
+                "reflection": {
+                    "root_cause_analysis": "The core flawed assumption was...",
+                    "actionable_heuristic": "Heuristic: A single, powerful, and generalizable rule.",
+                    "confidence": 0.0-1.0,
+                    "valid_prefix_steps": 0,
+                    "metadata": {"impact": "This led to the agent incorrectly..."}
+                } | null
+            }
+            ```
+            """
+
+        user_content = (
+            f"# TASK GIVEN TO AGENT\n{task}\n\n"
+            f"# AGENT'S FINAL ANSWER\n{answer}\n\n"
+            f"# AGENT'S EXECUTION CONTEXT\n"
+            f"- **Final Status**: {actor_status}\n"
+            f"- **Execution Length**: Agent took {len(trajectory)} steps to reach this answer.\n\n"
+            f"## Agent's Full Trajectory\n"
+            f"{PromptBuilder._format_trajectory(trajectory)}\n\n"
+            f"---\n# YOUR EVALUATION AND REFLECTION (JSON ONLY)"
+        )
+
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_content}
+        ]
+
+    @staticmethod
+    def build_memory_consolidation_prompt(heuristics: List[str], max_items: int) -> List[Dict[str, str]]:
+        """
+        Builds the prompt that merges overlapping lessons into a compact set.
+        Used off the hot path by ConsolidatingMemory.
+        """
+        system_content = f"""
+            # ROLE: You are an editor of an AI agent's lessons-learned notebook.
+            # TASK: Merge the lessons below into AT MOST {max_items} lessons. Combine lessons that say the same thing, keep every distinct piece of advice, and keep each lesson a single, actionable sentence. Do not invent new advice.
+            # OUTPUT FORMAT: You MUST respond ONLY with a valid JSON object in the following format:
+            ```json
+            {{"heuristics": ["Heuristic: ...", "Heuristic: ..."]}}
+            ```"""
+        user_content = "# LESSONS\n" + "\n".join(f"{i}. {h}" for i, h in enumerate(heuristics, 1))
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_content}
+        ]
+
     @staticmethod
     def build_reflector_prompt(task: str, trajectory: List[Dict], eval_report: EvaluationReport) -> List[Dict]:
         """
@@ -339,12 +440,14 @@ class PromptBuilder:
             2.  **Impact**: How did this flawed assumption lead directly to the agent's failure, as seen in the trajectory?
             3.  **Heuristic**: What is the new, generalizable strategic rule the agent must follow to avoid this entire CLASS of error in the future? This must be an actionable instruction.
             # METADATA: As part of your analysis, populate the metadata field. The 'impact' field should be a concise summary of your detailed 'Impact' analysis above.
+            # VALID PREFIX: Count how many leading steps of the trajectory were correct and can be kept as-is, i.e. the steps BEFORE the first mistake. If the strategy was wrong from the first step, use 0.
             # OUTPUT FORMAT
             You MUST respond ONLY with a valid JSON object in the following format:```json
             {{
                 "root_cause_analysis": "The core flawed assumption was...",   
                 "actionable_heuristic": "Heuristic: A single, powerful, and generalizable rule.",
                 "confidence": 0.0-1.0,
+                "valid_prefix_steps": 0,
                 "metadata": {{"impact": "This led to the agent incorrectly..."}}
             }} 
             """
@@ -370,18 +473,36 @@ class PromptBuilder:
         2.  **Impact**: How did this specific error prevent the agent from completing the final part of its otherwise successful plan?
         3.  **Heuristic**: What is a concise, tactical rule the agent should add to its existing strategy to handle this specific exception in the future?
         # METADATA: Populate the metadata field. The 'impact' field should be a concise summary of your detailed 'Impact' analysis.
+        # VALID PREFIX: Count how many leading steps of the trajectory were correct and can be kept as-is, i.e. the steps BEFORE the failing one. The agent will resume from there.
         # OUTPUT FORMAT: You MUST respond ONLY with a valid JSON object mapping to this schema:
         ```json
             {{
                 "root_cause_analysis": "The specific technical error was...",
                 "actionable_heuristic": "Heuristic: A targeted rule to fix the specific error.",
                 "confidence": 0.0-1.0,
+                "valid_prefix_steps": 0,
                 "metadata": {{"impact": "This prevented the agent from processing the final sub-task because..."}}
             }}
         ```"""
         user_content = PromptBuilder._create_user_prompt(task, trajectory, eval_report)
         return [{"role": "system", "content": system_content}, {"role": "user", "content": user_content}]
     
+    @staticmethod
+    def _coerce_reflections(reflections: Any) -> ReflectionContext:
+        """
+        Normalizes the reflections argument. A bare string is rejected: iterating it
+        would render one bullet per character.
+        """
+        if reflections is None:
+            return ReflectionContext()
+        if isinstance(reflections, ReflectionContext):
+            return reflections
+        if isinstance(reflections, (list, tuple)) and all(isinstance(r, str) for r in reflections):
+            return ReflectionContext(reflections)
+        raise TypeError(
+            f"reflections must be a ReflectionContext or a list of strings, got {type(reflections).__name__}."
+        )
+
     @staticmethod    # A helper function to format tools into a string.
     def _format_tools_to_string(tools: List[Any]) -> str:
         """Formats a list of Tool objects into a string for the prompt."""
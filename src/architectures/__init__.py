@@ -1,5 +1,33 @@
 from .base import BaseAgent
 from .react import ReactAgent
 from .reflexion import ReflexionAgent
+from .events import (
+    AgentEvent,
+    StepStarted,
+    LLMTokenDelta,
+    ActionParsed,
+    ToolStarted,
+    ToolFinished,
+    TrialStarted,
+    TrialEvaluated,
+    ReflectionAdded,
+    AttemptEvent,
+    AgentFinished,
+)
 
-__all__ = ["BaseAgent", "ReactAgent", "ReflexionAgent"]
\ No newline at end of file
+__all__ = [
+    "BaseAgent",
+    "ReactAgent",
+    "ReflexionAgent",
+    "AgentEvent",
+    "StepStarted",
+    "LLMTokenDelta",
+    "ActionParsed",
+    "ToolStarted",
+    "ToolFinished",
+    "TrialStarted",
+    "TrialEvaluated",
+    "ReflectionAdded",
+    "AttemptEvent",
+    "AgentFinished",
+]
@@ -1,27 +1,29 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
 from src.tools.base import Tool
+from .events import AgentEvent, AgentFinished
 
 class BaseAgent(ABC):
     """Base interface for all agent architectures"""
-    
+
     # def __init__(self, tools: List[Tool]):
     #     self.tools = tools
     #     # A quick lookup dictionary for tools (name -> tool_instance)
     #     self.tool_dict = {tool.name: tool for tool in self.tools}
-    
+
     @abstractmethod
     def run(self, goal: str, context: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Executes the agent on a specific goal.
-        
+
         Args:
             goal: The user's main task or query.
             context: Optional additional context (e.g., reflections from previous failed attempts).
-            
+
         Returns:
             A dictionary containing:
-            - status: "finished" | "max_steps_reached" | "error",
+            - status: "finished" | "max_steps_reached" | "error" | "cancelled",
             - final_answer: "The string provided in the 'Finish' action, or None.",
             - trajectory: [
                 {"step": 1, "thought": "...", "action": "...", ...},
@@ -29,4 +31,45 @@ class BaseAgent(ABC):
                 ],
             - error_message: "A description of any terminal error, or None."
         """
-        pass
\ No newline at end of file
+        pass
+
+    def run_iter(self, task: str, context: Optional[List[str]] = None) -> Iterator[AgentEvent]:
+        """
+        Executes the agent and yields typed events as they happen.
+        The last event is always an AgentFinished carrying the same dict run() returns.
+
+        The default implementation has nothing to stream and simply wraps run().
+        Architectures that can report progress override this and make run() consume it.
+        """
+        yield AgentFinished(result=self.run(task, context=context))
+
+    async def arun_iter(self, task: str, context: Optional[List[str]] = None) -> AsyncIterator[AgentEvent]:
+        """
+        Async variant of run_iter(). The blocking generator is advanced in a worker
+        thread so LLM and tool calls never block the caller's event loop.
+        """
+        events = self.run_iter(task, context=context)
+        sentinel = object()
+        try:
+            while True:
+                event = await asyncio.to_thread(next, events, sentinel)
+                if event is sentinel:
+                    break
+                yield event
+        finally:
+            try:
+                events.close()
+            except ValueError:
+                # The worker thread is still inside next(); the generator is closed once it is garbage-collected.
+                pass
+
+    @staticmethod
+    def _consume(events: Iterator[AgentEvent]) -> Dict[str, Any]:
+        """ Drains an event stream and returns the result of its terminal AgentFinished event. """
+        result = None
+        for event in events:
+            if isinstance(event, AgentFinished):
+                result = event.result
+        if result is None:
+            raise RuntimeError("Agent event stream ended without an AgentFinished event.")
+        return result
@@ -0,0 +1,87 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any
+
+from src.components import EvaluationReport, Reflection
+
+
+@dataclass
+class AgentEvent:
+    """ Base class for every event yielded by an agent's run_iter(). """
+
+
+@dataclass
+class StepStarted(AgentEvent):
+    """ The actor is starting a new ReAct step. """
+    step: int
+    max_steps: int
+
+
+@dataclass
+class LLMTokenDelta(AgentEvent):
+    """ A chunk of text streamed back from the actor LLM for the current step. """
+    step: int
+    delta: str
+
+
+@dataclass
+class ActionParsed(AgentEvent):
+    """ The LLM output for a step was parsed into Thought / Action / Action Input. """
+    step: int
+    thought: str
+    action: str
+    action_input: str
+
+
+@dataclass
+class ToolStarted(AgentEvent):
+    """ A tool is about to be executed. """
+    step: int
+    tool: str
+    action_input: str
+
+
+@dataclass
+class ToolFinished(AgentEvent):
+    """ A tool finished executing. `duration` is wall-clock seconds. """
+    step: int
+    tool: str
+    observation: str
+    duration: float
+
+
+@dataclass
+class TrialStarted(AgentEvent):
+    """ The Reflexion orchestrator is starting a new trial. """
+    trial: int
+    max_trials: int
+
+
+@dataclass
+class TrialEvaluated(AgentEvent):
+    """ The evaluator has judged a trial. """
+    trial: int
+    eval_report: EvaluationReport
+
+
+@dataclass
+class ReflectionAdded(AgentEvent):
+    """ A reflection was generated for a failed trial and offered to memory. """
+    trial: int
+    reflection: Reflection
+
+
+@dataclass
+class AttemptEvent(AgentEvent):
+    """
+    Wraps an event produced by one of several concurrent attempts inside a
+    best-of-N Reflexion trial, so consumers can tell the attempts apart.
+    """
+    trial: int
+    attempt: int
+    event: AgentEvent
+
+
+@dataclass
+class AgentFinished(AgentEvent):
+    """ Terminal event. `result` is exactly what run() returns. """
+    result: Dict[str, Any] = field(default_factory=dict)
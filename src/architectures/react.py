@@ -13,11 +13,15 @@ Recommended attribution for forks or derivative works.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from typing import List, Dict, Any, Optional, Iterator, Union
 
 
 from .base import BaseAgent
+from .events import AgentEvent, StepStarted, LLMTokenDelta, ActionParsed, ToolStarted, ToolFinished, AgentFinished
 from src.agent import PromptBuilder 
+from src.components import ReflectionContext
 from src.tools import Tool
 from src.llm import LLMInterface, LLMConnectionError
 from .constants import FINISH, ERROR
@@ -27,48 +31,99 @@ logger = logging.getLogger(__name__)
 class ReactAgent(BaseAgent):
     """ ReAct architecture: Reasoning + Acting in loop."""
     
-    def __init__(self, tools: List[Tool], llm_interface: LLMInterface, parser: Any, max_steps: int = 10):
+    def __init__(self, tools: List[Tool], llm_interface: LLMInterface, parser: Any, max_steps: int = 10, stream_tokens: bool = False,
+                 reflection_token_budget: Optional[int] = 500):
+        """
+        Args:
+            tools: Tools the agent may call.
+            llm_interface: The actor LLM.
+            parser: Callable turning raw LLM text into (thought, action, action_input).
+            max_steps: Maximum number of Thought/Action/Observation steps.
+            stream_tokens: If True, the LLM response is streamed and surfaced as
+                           LLMTokenDelta events by run_iter(). Otherwise one delta
+                           carrying the full response is emitted per step.
+            reflection_token_budget: Maximum estimated tokens of past-attempt lessons in each
+                                     prompt (newest kept). None means no limit.
+        """
         self.tools = tools
         self.tool_dict = {tool.name: tool for tool in self.tools} # A quick lookup dictionary for tools (name -> tool_instance)
         self.llm = llm_interface
         self.parser = parser
         self.max_steps = max_steps
+        self.stream_tokens = stream_tokens
+        self.reflection_token_budget = reflection_token_budget
 
-    def run(self, task: str, context: Optional[List[str]] = None) -> Dict[str, Any]:
-        """ Runs the ReAct loop."""
-        
-        trajectory = []
-        logger.info(f"Starting ReAct Agent with task: {task}")
+    def run(self, task: str, context: Optional[Union[ReflectionContext, List[str]]] = None,
+            seed_trajectory: Optional[List[Dict[str, Any]]] = None,
+            cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """ Runs the ReAct loop. Thin consumer of run_iter(). """
+        return self._consume(self.run_iter(task, context=context, seed_trajectory=seed_trajectory, cancel_event=cancel_event))
+
+    def run_iter(self, task: str, context: Optional[Union[ReflectionContext, List[str]]] = None,
+                 seed_trajectory: Optional[List[Dict[str, Any]]] = None,
+                 cancel_event: Optional[threading.Event] = None) -> Iterator[AgentEvent]:
+        """
+        Runs the ReAct loop, yielding an event for every stage of every step.
+
+        If `seed_trajectory` is given, the loop resumes after those steps instead of starting
+        from scratch: they are shown to the LLM as already taken, and are not re-executed.
+        The seed does not count against max_steps.
+
+        If `cancel_event` is set, the loop stops before its next LLM call and finishes
+        with status "cancelled" (used by best-of-N Reflexion to stop losing attempts).
+        """
+        trajectory = [dict(step) for step in seed_trajectory or []]
+        offset = len(trajectory)
+        total_steps = offset + self.max_steps
+        if offset:
+            logger.info(f"Resuming ReAct Agent after {offset} reused steps with task: {task}")
+        else:
+            logger.info(f"Starting ReAct Agent with task: {task}")
                 
-        for step in range(self.max_steps):
-            logger.info(f"--- Step {step + 1}/{self.max_steps} ---")
+        for step in range(offset, total_steps):
+            logger.info(f"--- Step {step + 1}/{total_steps} ---")
+            yield StepStarted(step=step + 1, max_steps=total_steps)
 
             # 1. Build the Message-Based Prompt: pass the CURRENT trajectory to the stateless builder
             messages = PromptBuilder.build_actor_prompt(
                 task=task, 
                 tools=self.tools, 
                 trajectory=trajectory, 
-                reflections=context
+                reflections=context,
+                reflection_token_budget=self.reflection_token_budget
             )
             
-            # 2. Call the LLM 
+            # 2. Call the LLM (unless the run was cancelled meanwhile)
+            if cancel_event is not None and cancel_event.is_set():
+                yield AgentFinished(result=self._handle_cancelled(trajectory))
+                return
             logger.info(f"Step {step+1}: Calling LLM...")
             try:
-                response_message = self.llm.get_chat_completion(messages)
+                content = yield from self._call_llm(step + 1, messages)
             except LLMConnectionError as e:
-                return self._handle_llm_error(e, trajectory)
+                yield AgentFinished(result=self._handle_llm_error(e, trajectory))
+                return
             
             # Parse response and Normalize
-            thought, action, action_input = self.parser(response_message['content'])
+            thought, action, action_input = self.parser(content)
             logging.info(f"Parsed Thought: {thought}")
             logging.info(f"Parsed Action: '{action}' | Parsed Input: '{action_input}'")
+            yield ActionParsed(step=step + 1, thought=thought, action=action, action_input=action_input)
             
             
             # Case 1: Terminal action - Finish
             if action == FINISH:
-                return self._handle_finish_action(thought, action_input, trajectory)
+                yield AgentFinished(result=self._handle_finish_action(thought, action_input, trajectory))
+                return
             
+            # Case 2: Tool call (parse errors and hallucinated tools produce an observation without running anything)
+            is_tool_call = action in self.tool_dict
+            if is_tool_call:
+                yield ToolStarted(step=step + 1, tool=action, action_input=action_input)
+            started_at = time.perf_counter()
             observation = self._execute_action(action, action_input)
+            if is_tool_call:
+                yield ToolFinished(step=step + 1, tool=action, observation=observation, duration=time.perf_counter() - started_at)
 
             trajectory.append({
             "thought": thought,
@@ -80,7 +135,23 @@ class ReactAgent(BaseAgent):
             logger.info(f"Observation: {observation}")
         
         # This block is only reached if the for loop completes without a "Finish" action.
-        return self._handle_max_steps_reached(trajectory)
+        yield AgentFinished(result=self._handle_max_steps_reached(trajectory))
+
+    def _call_llm(self, step: int, messages: List[Dict[str, str]]):
+        """
+        Sub-generator that calls the actor LLM, yields LLMTokenDelta events and
+        returns the full response text. Raises LLMConnectionError on failure.
+        """
+        if not self.stream_tokens:
+            response_message = self.llm.get_chat_completion(messages)
+            yield LLMTokenDelta(step=step, delta=response_message['content'])
+            return response_message['content']
+
+        chunks = []
+        for delta in self.llm.stream_chat_completion(messages):
+            chunks.append(delta)
+            yield LLMTokenDelta(step=step, delta=delta)
+        return "".join(chunks)
         
     def _truncate_observation(self, observation: str, max_length: int = 5000) -> str:
         """
@@ -123,6 +194,16 @@ class ReactAgent(BaseAgent):
             "error_message": None
         }
         
+    def _handle_cancelled(self, trajectory: List[Dict]) -> Dict[str, Any]:
+        """ Handles a run stopped from outside through its cancel_event. """
+        logger.info("ReAct Agent cancelled before its next LLM call.")
+        return {
+            "status": "cancelled",
+            "final_answer": None,
+            "trajectory": trajectory,
+            "error_message": "The run was cancelled."
+        }
+
     def _handle_max_steps_reached(self, trajectory: List[Dict]) -> Dict[str, Any]:
         """ Handles the case where the agent runs out of steps. """
         logger.warning("ReAct Agent reached max steps without finishing.")
@@ -12,11 +12,17 @@ TL;DR: Use freely, modify, redistribute, just retain this notice.
 Recommended attribution for forks or derivative works.
 """
 
+import inspect
 import logging
-from typing import List, Dict, Any, Optional
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterator, Callable
 
 from .base import BaseAgent
-from src.components import EvaluationStatus
+from .constants import FINISH, ERROR
+from .events import AgentEvent, TrialStarted, TrialEvaluated, ReflectionAdded, AttemptEvent, AgentFinished
+from src.components import EvaluationStatus, EvaluationReport, Reflection
 from src.components.evaluators import BaseEvaluator
 from src.components.reflectors import BaseReflector
 from src.components.memory import BaseMemory
@@ -24,6 +30,14 @@ from src.components.memory import BaseMemory
 
 logger = logging.getLogger(__name__)
 
+def _accepts_keyword(method: Callable, name: str) -> bool:
+    """ Whether an actor method takes the keyword `name` (e.g. `cancel_event`), directly or via **kwargs. """
+    try:
+        parameters = inspect.signature(method).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in parameters or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+
 class ReflexionAgent(BaseAgent):
     """
     Reflexion architecture: It wraps an "Actor" agent and enhances it with a strategic, multi-trial
@@ -38,7 +52,9 @@ class ReflexionAgent(BaseAgent):
                  max_trials: int = 3,
                  success_threshold: float = 0.95,
                  failure_threshold: float = 0.80,
-                 uncertainty_policy: str = "retry"):
+                 uncertainty_policy: str = "retry",
+                 parallel_attempts: int = 1,
+                 actor_factory: Optional[Callable[[], BaseAgent]] = None):
         """
         Initializes the ReflexionAgent.
 
@@ -52,6 +68,15 @@ class ReflexionAgent(BaseAgent):
             failure_threshold: The confidence level required to trust an evaluation and reflect on it.
             uncertainty_policy: The action to take when confidence is in the uncertainty zone.
                                ("retry", "escalate", "accept").
+            parallel_attempts: Number of independent actor attempts per trial (best-of-N).
+                               With 1 (default) trials run strictly sequentially. With K > 1
+                               each trial runs K attempts concurrently, the first confident
+                               FULL_SUCCESS wins and the rest are cancelled; otherwise the
+                               reflections of all failed attempts feed the next trial.
+            actor_factory: Builds a fresh, independent actor for each concurrent attempt (e.g. a new
+                           ReactAgent with its own LLM client). Required when parallel_attempts > 1.
+                           The evaluator and reflector are shared by the attempt threads, so they
+                           must be thread-safe.
         """
         self.actor = actor
         self.evaluator = evaluator
@@ -69,19 +94,39 @@ class ReflexionAgent(BaseAgent):
                 f"Supported policies are: {valid_policies}"
             )
         self.uncertainty_policy = uncertainty_policy
+        if parallel_attempts < 1:
+            raise ValueError("parallel_attempts must be at least 1.")
+        if parallel_attempts > 1 and actor_factory is None:
+            raise ValueError("parallel_attempts > 1 requires an actor_factory that builds an independent actor per attempt.")
+        self.parallel_attempts = parallel_attempts
+        self.actor_factory = actor_factory
 
     def run(self, task: str, context: Optional[List[str]] = None) -> Dict[str, Any]:
-        """ Executes the full Reflexion loop: Act -> Evaluate -> Reflect. """
+        """ Executes the full Reflexion loop: Act -> Evaluate -> Reflect. Thin consumer of run_iter(). """
+        return self._consume(self.run_iter(task, context=context))
+
+    def run_iter(self, task: str, context: Optional[List[str]] = None) -> Iterator[AgentEvent]:
+        """
+        Executes the full Reflexion loop, yielding trial-level events alongside
+        the actor's own step-level events.
+        """
+        if self.parallel_attempts > 1:
+            yield from self._run_best_of_n_iter(task)
+            return
+
         logger.info(f"--- Starting Reflexion Agent for task: '{task}' ---")
-        self.memory.clear()
+        self.memory.start_task(task)
         trial_history = []
         actor_result = {} # Initialize to ensure it's available for the final report
+        seed_trajectory = [] # Steps from the previous trial that the Reflector judged sound
 
         for attempt in range(1, self.max_trials + 1):
             logger.info(f"--- Starting Trial {attempt}/{self.max_trials} ---")
+            yield TrialStarted(trial=attempt, max_trials=self.max_trials)
 
             # 1. ACT
-            actor_result = self.actor.run(task, context=self.memory.get_context())
+            actor_result = yield from self._act(task, context=self.memory.get_context(), seed_trajectory=seed_trajectory)
+            seed_trajectory = []
 
             # 2. EVALUATE (with robust error handling)
             try:
@@ -89,7 +134,9 @@ class ReflexionAgent(BaseAgent):
                 logger.info(f"Evaluation: {eval_report.status} (Confidence: {eval_report.confidence})")
             except Exception as e:
                 logger.error(f"Evaluator failed on attempt {attempt}: {e}", exc_info=True)
-                return self._create_final_report("evaluator_error", actor_result, trial_history, attempt)
+                yield AgentFinished(result=self._create_final_report("evaluator_error", actor_result, trial_history, attempt))
+                return
+            yield TrialEvaluated(trial=attempt, eval_report=eval_report)
 
             reflection_for_this_trial = None
 
@@ -97,13 +144,16 @@ class ReflexionAgent(BaseAgent):
             if self._is_successful(eval_report):
                 logger.info("Confident success achieved. Terminating.")
                 trial_history.append({"trial_number": attempt, "actor_result": actor_result, "eval_report": eval_report, "reflection": None})
-                return self._create_final_report("success", actor_result, trial_history, attempt)
+                yield AgentFinished(result=self._create_final_report("success", actor_result, trial_history, attempt))
+                return
 
             elif self._should_reflect(eval_report):
                 logger.warning(f"Trial {attempt} failed with high confidence. Generating reflection.")
                 try:
-                    reflection_for_this_trial = self.reflector.reflect(task, actor_result, eval_report)
+                    reflection_for_this_trial = self._reflect(task, actor_result, eval_report)
                     self.memory.add(reflection_for_this_trial)
+                    seed_trajectory = self._reusable_prefix(actor_result, reflection_for_this_trial)
+                    yield ReflectionAdded(trial=attempt, reflection=reflection_for_this_trial)
                 except Exception as e:
                     logger.error(f"Reflector failed on attempt {attempt}: {e}", exc_info=True)
                     # Recoverable: Log and continue to the next trial without the new lesson.
@@ -113,7 +163,8 @@ class ReflexionAgent(BaseAgent):
                 logger.warning(f"Evaluation in uncertainty zone (Confidence: {eval_report.confidence:.2f}). Policy: '{self.uncertainty_policy}'")
                 if self.uncertainty_policy == "accept":
                     trial_history.append({"trial_number": attempt, "actor_result": actor_result, "eval_report": eval_report, "reflection": None})
-                    return self._create_final_report("success_by_policy", actor_result, trial_history, attempt)
+                    yield AgentFinished(result=self._create_final_report("success_by_policy", actor_result, trial_history, attempt))
+                    return
                 # For "retry" or "escalate", we simply continue to the next attempt.
                 # A more advanced "escalate" would have logic here.
 
@@ -127,7 +178,219 @@ class ReflexionAgent(BaseAgent):
 
         # 4. HANDLE MAX TRIALS FAILURE
         logger.error(f"Agent failed to complete task after {self.max_trials} trials.")
-        return self._create_final_report("failure_max_trials", actor_result, trial_history, self.max_trials)
+        yield AgentFinished(result=self._create_final_report("failure_max_trials", actor_result, trial_history, self.max_trials))
+
+    def _act(self, task: str, context: Any, seed_trajectory: Optional[List[Dict]] = None):
+        """
+        Sub-generator that runs the actor for one trial and returns its result dict.
+        Actors implementing BaseAgent are streamed so their step events reach the caller;
+        their terminal AgentFinished is swallowed here because it is not the end of the Reflexion run.
+        A non-empty seed_trajectory resumes the actor after those steps, if the actor can resume.
+        """
+        streaming = isinstance(self.actor, BaseAgent)
+        kwargs = {"context": context}
+        if seed_trajectory:
+            if _accepts_keyword(self.actor.run_iter if streaming else self.actor.run, "seed_trajectory"):
+                logger.info(f"Resuming the actor after {len(seed_trajectory)} reused steps.")
+                kwargs["seed_trajectory"] = seed_trajectory
+            else:
+                logger.info(f"{type(self.actor).__name__} cannot resume from reused steps. Starting the trial from scratch.")
+
+        if not streaming:
+            return self.actor.run(task, **kwargs)
+
+        actor_result = {}
+        for event in self.actor.run_iter(task, **kwargs):
+            if isinstance(event, AgentFinished):
+                actor_result = event.result
+            else:
+                yield event
+        return actor_result
+
+    def _run_best_of_n_iter(self, task: str) -> Iterator[AgentEvent]:
+        """
+        Best-of-N variant of the Reflexion loop. Each trial runs `parallel_attempts`
+        independent Act -> Evaluate (-> Reflect) pipelines concurrently. Events from the
+        attempts are wrapped in AttemptEvent and yielded as they happen.
+        """
+        logger.info(f"--- Starting Reflexion Agent (best-of-{self.parallel_attempts}) for task: '{task}' ---")
+        self.memory.start_task(task)
+        trial_history = []
+        actor_result = {}
+
+        for trial in range(1, self.max_trials + 1):
+            logger.info(f"--- Starting Trial {trial}/{self.max_trials} ({self.parallel_attempts} concurrent attempts) ---")
+            yield TrialStarted(trial=trial, max_trials=self.max_trials)
+
+            outcomes = []
+            winner = None
+            round_events = yield from self._run_attempts(task, trial, self.memory.get_context())
+            for outcome in round_events:
+                outcomes.append(outcome)
+                if outcome["eval_report"] is not None and self._is_successful(outcome["eval_report"]):
+                    winner = outcome
+                    break
+
+            evaluated = [o for o in outcomes if o["eval_report"] is not None]
+            for outcome in outcomes:
+                trial_history.append({
+                    "trial_number": trial,
+                    "attempt": outcome["attempt"],
+                    "actor_result": outcome["actor_result"],
+                    "eval_report": outcome["eval_report"],
+                    "reflection": outcome["reflection"]
+                })
+
+            if winner is not None:
+                logger.info(f"Attempt {winner['attempt']} achieved confident success. Terminating.")
+                yield AgentFinished(result=self._create_final_report("success", winner["actor_result"], trial_history, trial))
+                return
+
+            if not evaluated:
+                logger.error(f"Evaluator failed for every attempt of trial {trial}.")
+                last = outcomes[-1]["actor_result"] if outcomes else actor_result
+                yield AgentFinished(result=self._create_final_report("evaluator_error", last, trial_history, trial))
+                return
+
+            best = max(evaluated, key=lambda o: o["eval_report"].confidence)
+            actor_result = best["actor_result"]
+
+            uncertain = [o for o in evaluated if not self._should_reflect(o["eval_report"])]
+            if uncertain and self.uncertainty_policy == "accept":
+                accepted = max(uncertain, key=lambda o: o["eval_report"].confidence)
+                logger.warning(f"Accepting uncertain attempt {accepted['attempt']} by policy.")
+                yield AgentFinished(result=self._create_final_report("success_by_policy", accepted["actor_result"], trial_history, trial))
+                return
+
+            # Every failed attempt's lesson feeds the next trial.
+            for outcome in evaluated:
+                if outcome["reflection"] is not None:
+                    self.memory.add(outcome["reflection"])
+                    yield ReflectionAdded(trial=trial, reflection=outcome["reflection"])
+
+        logger.error(f"Agent failed to complete task after {self.max_trials} trials.")
+        yield AgentFinished(result=self._create_final_report("failure_max_trials", actor_result, trial_history, self.max_trials))
+
+    def _run_attempts(self, task: str, trial: int, context: Any):
+        """
+        Sub-generator that runs one best-of-N trial. It forwards attempt events as they
+        arrive and returns the attempt outcomes in completion order, stopping early at the
+        first confident success (remaining attempts are cancelled).
+        """
+        cancel = threading.Event()
+        inbox = queue.Queue()
+        executor = ThreadPoolExecutor(max_workers=self.parallel_attempts, thread_name_prefix="reflexion-attempt")
+        outcomes = []
+        try:
+            for attempt in range(1, self.parallel_attempts + 1):
+                executor.submit(self._attempt_worker, task, trial, attempt, context, cancel, inbox)
+
+            pending = self.parallel_attempts
+            while pending:
+                kind, payload = inbox.get()
+                if kind == "event":
+                    yield payload
+                    continue
+
+                pending -= 1
+                if payload is None:  # The attempt was cancelled.
+                    continue
+                outcomes.append(payload)
+                if payload["eval_report"] is not None:
+                    yield AttemptEvent(trial=trial, attempt=payload["attempt"],
+                                       event=TrialEvaluated(trial=trial, eval_report=payload["eval_report"]))
+                    if self._is_successful(payload["eval_report"]):
+                        break
+        finally:
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        return outcomes
+
+    def _attempt_worker(self, task: str, trial: int, attempt: int, context: Any,
+                        cancel: threading.Event, inbox: queue.Queue) -> None:
+        """
+        Runs a single attempt on its own freshly built actor. Always posts exactly one
+        ("done", outcome) message to the inbox; the outcome is None if the attempt was cancelled.
+        """
+        outcome = None
+        try:
+            outcome = self._run_attempt(task, trial, attempt, context, cancel, inbox)
+        except Exception as e:
+            logger.error(f"Attempt {attempt} of trial {trial} crashed: {e}", exc_info=True)
+        finally:
+            inbox.put(("done", outcome))
+
+    def _run_attempt(self, task: str, trial: int, attempt: int, context: Any,
+                     cancel: threading.Event, inbox: queue.Queue) -> Optional[Dict[str, Any]]:
+        """
+        Act -> Evaluate (-> Reflect) for one attempt. Returns None if cancelled.
+        Actors whose run_iter()/run() accept a `cancel_event` also stop on their own
+        before their next LLM call, not just between the events they emit.
+        """
+        actor = self.actor_factory()
+        actor_result = None
+
+        if isinstance(actor, BaseAgent):
+            kwargs = {"cancel_event": cancel} if _accepts_keyword(actor.run_iter, "cancel_event") else {}
+            events = actor.run_iter(task, context=context, **kwargs)
+            try:
+                for event in events:
+                    if cancel.is_set():
+                        logger.info(f"Attempt {attempt} of trial {trial} cancelled.")
+                        return None
+                    if isinstance(event, AgentFinished):
+                        actor_result = event.result
+                    else:
+                        inbox.put(("event", AttemptEvent(trial=trial, attempt=attempt, event=event)))
+            finally:
+                events.close()
+        else:
+            kwargs = {"cancel_event": cancel} if _accepts_keyword(actor.run, "cancel_event") else {}
+            actor_result = actor.run(task, context=context, **kwargs)
+
+        if cancel.is_set():
+            return None
+
+        outcome = {"attempt": attempt, "actor_result": actor_result or {}, "eval_report": None, "reflection": None}
+        try:
+            outcome["eval_report"] = self.evaluator.evaluate(task, actor_result=outcome["actor_result"])
+            logger.info(f"Attempt {attempt} evaluation: {outcome['eval_report'].status} "
+                        f"(Confidence: {outcome['eval_report'].confidence})")
+        except Exception as e:
+            logger.error(f"Evaluator failed on attempt {attempt} of trial {trial}: {e}", exc_info=True)
+            return outcome
+
+        if cancel.is_set() or not self._should_reflect(outcome["eval_report"]):
+            return outcome
+
+        try:
+            outcome["reflection"] = self._reflect(task, outcome["actor_result"], outcome["eval_report"])
+        except Exception as e:
+            logger.error(f"Reflector failed on attempt {attempt} of trial {trial}: {e}", exc_info=True)
+        return outcome
+
+    def _reusable_prefix(self, actor_result: Dict, reflection: Reflection) -> List[Dict]:
+        """
+        The leading steps of the failed trajectory the Reflector marked as valid, to seed the
+        next trial. Stops before any terminal or error step, which must always be redone.
+        """
+        valid_steps = getattr(reflection, "valid_prefix_steps", 0)
+        if not isinstance(valid_steps, int) or valid_steps <= 0:
+            return []
+        prefix = []
+        for step in (actor_result.get("trajectory") or [])[:valid_steps]:
+            if not isinstance(step, dict) or step.get("action") in (FINISH, ERROR):
+                break
+            prefix.append(step)
+        return prefix
+
+    def _reflect(self, task: str, actor_result: Dict, eval_report: EvaluationReport) -> Reflection:
+        """ Uses the reflection a fused judge-and-reflect evaluator attached to the report, if any. """
+        reflection = getattr(eval_report, "reflection", None)
+        if reflection is not None:
+            logger.info("Using the reflection produced during evaluation.")
+            return reflection
+        return self.reflector.reflect(task, actor_result, eval_report)
 
     def _is_successful(self, eval_report: Dict) -> bool:
         """ Determines if the trial constitutes a final, successful outcome. """
@@ -153,7 +416,8 @@ class ReflexionAgent(BaseAgent):
         return is_confident_enough_to_learn
 
     def _create_final_report(self, status: str, actor_result: Dict, trial_history: List[Dict], trials: int) -> Dict[str, Any]:
-        """ Helper method to create a consistent, rich final report. """
+        """ Helper method to create a consistent, rich final report. Every run ends here, so it also closes the task in memory. """
+        self.memory.record_outcome(status in ("success", "success_by_policy"))
         return {
             "status": status,
             "final_answer": actor_result.get("final_answer"),
@@ -1,3 +1,3 @@
-from .types import EvaluationReport, Reflection, EvaluationStatus
+from .types import EvaluationReport, Reflection, EvaluationStatus, ReflectionContext
 
-__all__ = ["EvaluationReport", "EvaluationStatus", "Reflection"]
+__all__ = ["EvaluationReport", "EvaluationStatus", "Reflection", "ReflectionContext"]
@@ -1,4 +1,11 @@
 from .base import BaseEvaluator
 from .llm_judge import LLMJudgeEvaluator
+from .ground_truth_evaluator import GroundTruthEvaluator
+from .sandbox_pool import SandboxPool
+from .unit_test_evaluator import UnitTestEvaluator
+from .caching_evaluator import CachingEvaluator
+from .cascade_evaluator import CascadeEvaluator
+from .judge_reflector import LLMJudgeReflector
 
-__all__ = ["BaseEvaluator", "LLMJudgeEvaluator"]
\ No newline at end of file
+__all__ = ["BaseEvaluator", "LLMJudgeEvaluator", "GroundTruthEvaluator", "SandboxPool", "UnitTestEvaluator",
+           "CachingEvaluator", "CascadeEvaluator", "LLMJudgeReflector"]
@@ -0,0 +1,128 @@
+"""
+Sandbox zygote process used by SandboxPool.
+
+This script is started once per pool slot with `python -I`. It pre-imports common
+standard-library modules and then serves JSON-line jobs from stdin. Every job runs in
+a freshly forked child with CPU, memory, file-size and process limits, so jobs never see each
+other's state and the interpreter start-up cost is paid once per slot, not per test.
+
+Request:  {"id": ..., "code": str, "test": str, "timeout": float, "memory_mb": int, "cpu_seconds": int}
+Response: {"id": ..., "passed": bool, "error": str | null, "duration": float}
+"""
+import json
+import os
+import resource
+import select
+import signal
+import sys
+import time
+import traceback
+
+# Pre-warm modules that agent-written solutions commonly import.
+import collections, itertools, functools, math, re, string, heapq, bisect  # noqa: E401,F401
+import datetime, decimal, fractions, statistics, random, typing, dataclasses  # noqa: E401,F401
+
+MAX_RESULT_BYTES = 64 * 1024
+
+
+def _limit(kind: int, value: int) -> None:
+    try:
+        resource.setrlimit(kind, (value, value))
+    except (ValueError, OSError):
+        pass  # Not permitted on this platform/user; the wall-clock timeout still applies.
+
+
+def _run_child(job: dict, write_fd: int) -> None:
+    """ Runs inside the forked child. Never returns. """
+    os.setsid()
+    cpu_seconds = int(job.get("cpu_seconds") or max(1, int(job["timeout"]) + 1))
+    _limit(resource.RLIMIT_CPU, cpu_seconds)
+    _limit(resource.RLIMIT_AS, int(job["memory_mb"]) * 1024 * 1024)
+    _limit(resource.RLIMIT_FSIZE, 1024 * 1024)
+    # No new processes, so a fork bomb cannot escape the per-job limits and the killpg() on timeout
+    _limit(resource.RLIMIT_NPROC, 0)
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+
+    namespace = {"__name__": "__sandbox__"}
+    try:
+        exec(compile(job["code"], "<solution>", "exec"), namespace)
+        exec(compile(job["test"], "<test>", "exec"), namespace)
+        result = {"passed": True, "error": None}
+    except AssertionError as e:
+        detail = str(e) or job["test"].strip().splitlines()[-1]
+        result = {"passed": False, "error": f"AssertionError: {detail}"}
+    except BaseException as e:  # The solution is untrusted; report anything it raises.
+        frame = traceback.extract_tb(e.__traceback__)[-1] if e.__traceback__ else None
+        where = f" ({frame.filename}, line {frame.lineno})" if frame else ""
+        result = {"passed": False, "error": f"{type(e).__name__}: {e}{where}"}
+
+    os.write(write_fd, json.dumps(result).encode()[:MAX_RESULT_BYTES])
+    os._exit(0)
+
+
+def _run_job(job: dict) -> dict:
+    read_fd, write_fd = os.pipe()
+    started = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        _run_child(job, write_fd)
+    os.close(write_fd)
+
+    deadline = started + float(job["timeout"])
+    data, timed_out = b"", False
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        ready, _, _ = select.select([read_fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        data += chunk
+    os.close(read_fd)
+
+    if timed_out:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    _, status = os.waitpid(pid, 0)
+    duration = time.monotonic() - started
+
+    if timed_out:
+        return {"passed": False, "error": f"Timeout: test exceeded {job['timeout']}s", "duration": duration}
+    if os.WIFSIGNALED(status):
+        sig = os.WTERMSIG(status)
+        reason = "CPU time limit exceeded" if sig == signal.SIGXCPU else f"killed by signal {sig} (likely memory limit)"
+        return {"passed": False, "error": f"Crashed: {reason}", "duration": duration}
+    try:
+        result = json.loads(data.decode())
+    except ValueError:
+        result = {"passed": False, "error": "Crashed: sandbox child produced no result"}
+    result["duration"] = duration
+    return result
+
+
+def main() -> None:
+    print(json.dumps({"ready": True}), flush=True)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        try:
+            result = _run_job(job)
+        except Exception as e:
+            result = {"passed": False, "error": f"SandboxError: {e}", "duration": 0.0}
+        result["id"] = job.get("id")
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
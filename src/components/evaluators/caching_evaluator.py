@@ -0,0 +1,60 @@
+import logging
+import uuid
+from typing import Dict, Any, Optional
+
+from .base import BaseEvaluator
+from src.components import EvaluationReport
+from src.utils.cache import BoundedCache
+from src.utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class CachingEvaluator(BaseEvaluator):
+    """
+    Memoizes another evaluator's verdicts on the normalised (task, final_answer) pair.
+
+    Reflexion actors frequently resubmit an answer they already produced in an earlier
+    trial; this turns the repeat into a cache hit instead of another Judge call.
+    Reports produced by a failed evaluation (zero confidence or an 'error' in the
+    metadata) are never cached, so transient API errors are retried.
+    """
+
+    def __init__(self, evaluator: BaseEvaluator, cache: Optional[BoundedCache] = None,
+                 max_size: int = 1024, ttl: Optional[float] = None, path: Optional[str] = None):
+        """
+        Args:
+            evaluator: The evaluator whose verdicts are cached.
+            cache: A pre-built (possibly shared) cache. Overrides max_size/ttl/path.
+            max_size: Maximum number of cached verdicts.
+            ttl: Seconds after which a cached verdict expires.
+            path: JSON file to load the cache from and save() it to.
+        """
+        self.evaluator = evaluator
+        self.cache = cache or BoundedCache(max_size=max_size, ttl=ttl, path=path)
+
+    def evaluate(self, task: str, actor_result: Dict[str, Any]) -> EvaluationReport:
+        final_answer = actor_result.get("final_answer")
+        if actor_result.get("status") != "finished" or not final_answer:
+            # The wrapped evaluator's pre-checks are already free.
+            return self.evaluator.evaluate(task, actor_result=actor_result)
+
+        key = (normalize_text(task), normalize_text(final_answer))
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("Verdict cache hit. Skipping evaluation.")
+            report = EvaluationReport.from_dict(cached)
+            report.metadata["cached"] = True
+            if report.reflection is not None:
+                # A fresh id, as in CachingReflector, so memory stores the replayed lesson as a new entry.
+                report.reflection.id = f"ref_{uuid.uuid4()}"
+            return report
+
+        report = self.evaluator.evaluate(task, actor_result=actor_result)
+        if report.confidence > 0.0 and "error" not in report.metadata:
+            self.cache.set(key, report.to_dict())
+        return report
+
+    def save(self, path: Optional[str] = None) -> None:
+        """ Persists the verdict cache to JSON. """
+        self.cache.save(path)
@@ -0,0 +1,75 @@
+import logging
+from typing import Dict, Any
+
+from .base import BaseEvaluator
+from .llm_judge import LLMJudgeEvaluator
+from src.llm import LLMInterface
+from src.components import EvaluationReport, EvaluationStatus
+
+logger = logging.getLogger(__name__)
+
+
+class CascadeEvaluator(BaseEvaluator):
+    """
+    A two-tier judge: a small, fast model decides the clear-cut cases and the
+    expensive model is only consulted inside the uncertainty zone.
+
+    The bands mirror ReflexionAgent: a cheap verdict is final if it is a FULL_SUCCESS
+    with confidence >= success_threshold, or any other status with confidence >=
+    failure_threshold. Everything else escalates to the strong judge. The report's
+    metadata records which tier decided, plus the cheap tier's verdict, so the
+    thresholds can be tuned from logs.
+    """
+
+    def __init__(self, cheap: BaseEvaluator, strong: BaseEvaluator,
+                 success_threshold: float = 0.95, failure_threshold: float = 0.80):
+        """
+        Args:
+            cheap: The fast first-pass evaluator (e.g. a judge on llama-3.1-8b-instant or Ollama).
+            strong: The expensive evaluator used for uncertain verdicts.
+            success_threshold: Confidence a cheap FULL_SUCCESS needs to be final. Should match the agent's.
+            failure_threshold: Confidence any other cheap verdict needs to be final. Should match the agent's.
+        """
+        if not 0.0 <= failure_threshold <= success_threshold <= 1.0:
+            raise ValueError("Thresholds must satisfy 0 <= failure_threshold <= success_threshold <= 1.")
+        self.cheap = cheap
+        self.strong = strong
+        self.success_threshold = success_threshold
+        self.failure_threshold = failure_threshold
+
+    @classmethod
+    def from_llms(cls, cheap_llm: LLMInterface, strong_llm: LLMInterface, **kwargs) -> "CascadeEvaluator":
+        """ Builds a cascade of two LLMJudgeEvaluators sharing the same rubric. """
+        return cls(LLMJudgeEvaluator(cheap_llm), LLMJudgeEvaluator(strong_llm), **kwargs)
+
+    def evaluate(self, task: str, actor_result: Dict[str, Any]) -> EvaluationReport:
+        """ Evaluates with the cheap tier first, escalating only uncertain verdicts. """
+        cheap_report = self.cheap.evaluate(task, actor_result=actor_result)
+        cheap_summary = {
+            "cheap_status": cheap_report.status.value,
+            "cheap_confidence": cheap_report.confidence,
+        }
+
+        if self._is_decisive(cheap_report):
+            cheap_report.metadata.update(decided_by="cheap", **cheap_summary)
+            return cheap_report
+
+        logger.info(
+            f"Cheap judge is uncertain ({cheap_report.status.value}, confidence {cheap_report.confidence:.2f}). "
+            "Escalating to the strong judge..."
+        )
+        strong_report = self.strong.evaluate(task, actor_result=actor_result)
+
+        if strong_report.confidence == 0.0 and cheap_report.confidence > 0.0:
+            # The strong judge errored; an uncertain verdict is still better than none.
+            logger.warning("Strong judge failed. Falling back to the cheap verdict.")
+            cheap_report.metadata.update(decided_by="cheap", strong_error=strong_report.reason, **cheap_summary)
+            return cheap_report
+
+        strong_report.metadata.update(decided_by="strong", **cheap_summary)
+        return strong_report
+
+    def _is_decisive(self, report: EvaluationReport) -> bool:
+        if report.status == EvaluationStatus.FULL_SUCCESS:
+            return report.confidence >= self.success_threshold
+        return report.confidence >= self.failure_threshold
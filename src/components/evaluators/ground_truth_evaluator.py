@@ -0,0 +1,292 @@
+import logging
+import math
+import re
+from typing import Dict, Any, Optional, List, Tuple
+
+from .base import BaseEvaluator
+from src.components import EvaluationReport, EvaluationStatus
+from src.utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# A quantity is an optional currency sign, a number (with optional thousands separators
+# or exponent), an optional scale (a word, or a letter attached to the number as in
+# "1.5M" / "$2B") and an optional unit. Scales are matched before units.
+_QUANTITY = re.compile(
+    r"(?P<currency>[$€£¥])?\s*"
+    r"(?P<number>[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?(?:[eE][-+]?\d+)?|[-+]?\.\d+)"
+    r"(?:(?P<short_scale>[mbt])(?![a-z])|\s*(?P<scale>thousand|million|billion|trillion|bn|mn|k)(?![a-z]))?"
+    r"\s*(?P<unit>%|°[cf]|[^\W\d_]+)?",
+    re.IGNORECASE
+)
+
+_SCALES = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mn": 1e6, "million": 1e6,
+           "b": 1e9, "bn": 1e9, "billion": 1e9, "t": 1e12, "trillion": 1e12}
+
+# Only units listed here are compared; any other trailing word is treated as "no unit".
+_UNIT_ALIASES = {
+    "$": "usd", "usd": "usd", "dollar": "usd", "dollars": "usd",
+    "€": "eur", "eur": "eur", "euro": "eur", "euros": "eur",
+    "£": "gbp", "gbp": "gbp", "pound": "gbp", "pounds": "gbp",
+    "¥": "jpy", "jpy": "jpy", "yen": "jpy",
+    "%": "%", "percent": "%", "pct": "%",
+    "km": "km", "kilometer": "km", "kilometers": "km", "kilometre": "km", "kilometres": "km",
+    "m": "m", "meter": "m", "meters": "m", "metre": "m", "metres": "m",
+    "kg": "kg", "kilogram": "kg", "kilograms": "kg",
+    "g": "g", "gram": "g", "grams": "g",
+    "°c": "°c", "celsius": "°c", "°f": "°f", "fahrenheit": "°f",
+    "s": "s", "sec": "s", "second": "s", "seconds": "s",
+    "min": "min", "minute": "min", "minutes": "min",
+    "h": "h", "hr": "h", "hour": "h", "hours": "h",
+}
+
+Quantity = Tuple[float, Optional[str]]
+
+
+def extract_quantities(text: str) -> List[Quantity]:
+    """ Extracts every (value, canonical unit) pair mentioned in a piece of text. """
+    quantities = []
+    for match in _QUANTITY.finditer(text or ""):
+        try:
+            value = float(match.group("number").replace(",", ""))
+        except ValueError:
+            continue
+        scale, unit = match.group("scale"), match.group("currency") or match.group("unit")
+        short_scale = match.group("short_scale")
+        if short_scale:
+            # A lowercase "42m" with no currency is metres; "1.5M", "$3m", "2b", "4T" are scales.
+            if short_scale == "m" and not match.group("currency"):
+                unit = unit or short_scale
+            else:
+                scale = short_scale
+        if scale:
+            value *= _SCALES[scale.lower()]
+        quantities.append((value, _UNIT_ALIASES.get(unit.lower()) if unit else None))
+    return quantities
+
+
+class GroundTruthEvaluator(BaseEvaluator):
+    """
+    A deterministic evaluator that checks the actor's final answer against a known
+    ground truth, without any LLM or network call.
+
+    Expected answers can be:
+    - numbers, or strings such as "30", "$1.5 million" or "42 km" (compared with tolerance and units),
+    - plain strings (compared case- and whitespace-insensitively, as a substring by default),
+    - compiled regular expressions (searched in the answer),
+    - a list/tuple/set of any of the above (any one matching is enough).
+
+    When it cannot decide (no ground truth for the task, a free-text answer that does
+    not literally contain the expected text, a number whose unit or scale differs
+    from the expected one, or several different numbers) it delegates to `fallback`,
+    typically an LLMJudgeEvaluator, so the expensive judge is only paid for when needed.
+
+    Reports never include the expected answer: they are passed to the reflector, and a
+    lesson quoting the ground truth would leak it into later trials.
+    """
+
+    SUCCESS_CONFIDENCE = 1.0
+    FAILURE_CONFIDENCE = 0.9
+    UNDECIDED_CONFIDENCE = 0.5
+
+    def __init__(self,
+                 ground_truth: Optional[Dict[str, Any]] = None,
+                 fallback: Optional[BaseEvaluator] = None,
+                 rel_tol: float = 1e-3,
+                 abs_tol: float = 1e-6,
+                 match_substring: bool = True):
+        """
+        Args:
+            ground_truth: Mapping of task -> expected answer. Tasks are matched after normalization.
+            fallback: Evaluator used when the ground truth check cannot decide.
+            rel_tol: Relative tolerance for numeric comparison.
+            abs_tol: Absolute tolerance for numeric comparison.
+            match_substring: If True, a text answer passes when it contains the expected text;
+                             if False, the normalized texts must be equal.
+        """
+        self.ground_truth = {}
+        for task, expected in (ground_truth or {}).items():
+            self.add(task, expected)
+        self.fallback = fallback
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+        self.match_substring = match_substring
+
+    def add(self, task: str, expected: Any) -> None:
+        """ Registers (or replaces) the expected answer for a task. """
+        self.ground_truth[normalize_text(task)] = expected
+
+    def evaluate(self, task: str, actor_result: Dict[str, Any]) -> EvaluationReport:
+        """
+        Evaluates the attempt against the registered ground truth.
+        Falls back to `self.fallback` only when the deterministic check is inconclusive.
+        """
+        # --- 1. Pre-checks for Fast Failure ---
+        actor_status = actor_result.get("status")
+        if actor_status != "finished":
+            return EvaluationReport(
+                status=EvaluationStatus.FAILURE,
+                confidence=1.0,
+                reason=f"Evaluation skipped. Actor did not finish successfully (status: '{actor_status}').",
+                metadata={"decided_by": "ground_truth"}
+            )
+
+        final_answer = actor_result.get("final_answer")
+        if not final_answer:
+            return EvaluationReport(
+                status=EvaluationStatus.FAILURE,
+                confidence=1.0,
+                reason="Actor finished but provided no final answer to evaluate.",
+                metadata={"decided_by": "ground_truth"}
+            )
+
+        # --- 2. Deterministic check ---
+        key = normalize_text(task)
+        if key not in self.ground_truth:
+            return self._undecided(task, actor_result, "No ground truth registered for this task.")
+
+        expected = self.ground_truth[key]
+        verdict = self._match_any(task, str(final_answer), expected)
+        if verdict is None:
+            return self._undecided(task, actor_result, "Could not decide deterministically against the ground truth.")
+
+        passed, match_type, detail = verdict
+        metadata = {"decided_by": "ground_truth", "match_type": match_type}
+        if passed:
+            return EvaluationReport(
+                status=EvaluationStatus.FULL_SUCCESS,
+                confidence=self.SUCCESS_CONFIDENCE,
+                reason=f"Final answer matches the ground truth ({match_type}: {detail}).",
+                metadata=metadata
+            )
+        return EvaluationReport(
+            status=EvaluationStatus.FAILURE,
+            confidence=self.FAILURE_CONFIDENCE,
+            reason=f"Final answer does not match the ground truth ({match_type}: {detail}).",
+            metadata=metadata
+        )
+
+    def _undecided(self, task: str, actor_result: Dict[str, Any], reason: str) -> EvaluationReport:
+        """ Delegates to the fallback evaluator, or reports an uncertain verdict if there is none. """
+        if self.fallback is not None:
+            logger.info(f"Ground truth inconclusive ({reason}) Falling back to {type(self.fallback).__name__}.")
+            report = self.fallback.evaluate(task, actor_result=actor_result)
+            report.metadata.setdefault("decided_by", "fallback")
+            return report
+
+        return EvaluationReport(
+            status=EvaluationStatus.FAILURE,
+            confidence=self.UNDECIDED_CONFIDENCE,
+            reason=reason,
+            metadata={"decided_by": "ground_truth", "undecided": True}
+        )
+
+    def _match_any(self, task: str, answer: str, expected: Any) -> Optional[Tuple[bool, str, str]]:
+        """
+        Matches against one expected value or any of several.
+        Returns (passed, match_type, detail), or None if no check was conclusive.
+        """
+        if not isinstance(expected, (list, tuple, set, frozenset)):
+            return self._match(task, answer, expected)
+
+        failures = []
+        for option in expected:
+            verdict = self._match(task, answer, option)
+            if verdict is None:
+                continue
+            if verdict[0]:
+                return verdict
+            failures.append(verdict)
+        # A failure is only conclusive if every option was decided.
+        if failures and len(failures) == len(expected):
+            return failures[0]
+        return None
+
+    def _match(self, task: str, answer: str, expected: Any) -> Optional[Tuple[bool, str, str]]:
+        """ Dispatches on the type of the expected answer. """
+        if isinstance(expected, re.Pattern):
+            match = expected.search(answer)
+            return (match is not None, "regex", match.group(0) if match else "no match")
+
+        if isinstance(expected, bool):
+            expected = str(expected)
+
+        if isinstance(expected, (int, float)):
+            return self._match_numeric(task, answer, (float(expected), None))
+
+        expected_text = str(expected)
+        quantities = extract_quantities(expected_text)
+        leftover = _QUANTITY.sub("", expected_text).strip(" .,")
+        if len(quantities) == 1 and not leftover:
+            return self._match_numeric(task, answer, quantities[0])
+
+        return self._match_text(answer, expected_text)
+
+    def _match_numeric(self, task: str, answer: str, expected: Quantity) -> Optional[Tuple[bool, str, str]]:
+        """
+        Passes if a quantity in the answer equals the expected one within tolerance
+        and with a compatible unit. Numbers that merely echo the task ("15% of 200")
+        are ignored, unless they are the only numbers in the answer.
+
+        Returns None (undecided) rather than a failure when no number has a compatible
+        unit, or one is off by a power of 1000: the answer may use a unit or scale this
+        parser misreads, which is for the fallback judge to decide. An answer offering
+        several different numbers ("12, 42 or 97") is undecided too, even if one matches.
+        """
+        candidates = extract_quantities(answer)
+        if not candidates:
+            return None
+
+        task_values = [value for value, _ in extract_quantities(task)]
+        novel = [c for c in candidates if not any(self._close(c[0], v) for v in task_values)]
+        candidates = novel or candidates
+
+        expected_value, expected_unit = expected
+        comparable = [(value, unit) for value, unit in candidates if self._units_compatible(unit, expected_unit)]
+        matches = [value for value, unit in comparable if self._matches(value, unit, expected)]
+        if matches:
+            if len(matches) < len(comparable):
+                logger.info("The answer gives several different numbers; leaving the verdict to the fallback.")
+                return None
+            return (True, "numeric", f"{matches[0]:g}")
+
+        if not comparable or any(self._scale_mismatch(value, expected_value) for value, _ in comparable):
+            return None
+
+        found = ", ".join(f"{v:g}{u or ''}" for v, u in candidates)
+        return (False, "numeric", f"found {found}")
+
+    def _match_text(self, answer: str, expected: str) -> Optional[Tuple[bool, str, str]]:
+        """ Text matching only decides positively; a missing phrase might just be a paraphrase. """
+        normalized_answer = normalize_text(answer)
+        normalized_expected = normalize_text(expected)
+        if not normalized_expected:
+            return None
+
+        if self.match_substring:
+            pattern = r"(?<!\w)" + re.escape(normalized_expected) + r"(?!\w)"
+            if re.search(pattern, normalized_answer):
+                return (True, "text", "expected text found in answer")
+        elif normalized_answer == normalized_expected:
+            return (True, "text", "exact match")
+        return None
+
+    def _matches(self, value: float, unit: Optional[str], expected: Quantity) -> bool:
+        expected_value, expected_unit = expected
+        if self._close(value, expected_value):
+            return True
+        # Percentages are often written as fractions and vice versa.
+        if "%" in (unit, expected_unit) and unit != expected_unit:
+            return self._close(value * 100, expected_value) or self._close(value / 100, expected_value)
+        return False
+
+    def _close(self, a: float, b: float) -> bool:
+        return math.isclose(a, b, rel_tol=self.rel_tol, abs_tol=self.abs_tol)
+
+    def _scale_mismatch(self, value: float, expected: float) -> bool:
+        """ Whether `value` equals `expected` up to a thousand/million/billion/trillion factor. """
+        return any(self._close(value * 1000 ** k, expected) for k in (-4, -3, -2, -1, 1, 2, 3, 4))
+
+    @staticmethod
+    def _units_compatible(unit: Optional[str], expected_unit: Optional[str]) -> bool:
+        return unit is None or expected_unit is None or unit == expected_unit
@@ -0,0 +1,58 @@
+import json
+import logging
+from typing import Dict, Any, List
+
+from .llm_judge import LLMJudgeEvaluator
+from src.llm import LLMInterface
+from src.agent import PromptBuilder
+from src.components import EvaluationReport, EvaluationStatus, Reflection
+from src.components.reflectors import BaseReflector, LLMReflector
+
+logger = logging.getLogger(__name__)
+
+
+class LLMJudgeReflector(LLMJudgeEvaluator, BaseReflector):
+    """
+    A fused Evaluator + Reflector: one JSON-mode call returns the verdict and, when the
+    attempt fell short, the lesson for the next trial.
+
+    The reflection rides on `EvaluationReport.reflection`; ReflexionAgent uses it instead
+    of calling its Reflector, saving one judge round trip per failed trial. Pass the
+    same instance as both `evaluator` and `reflector`: if the fused response carried no
+    usable reflection, reflect() falls back to a regular LLMReflector call.
+    """
+
+    def __init__(self, llm_interface: LLMInterface):
+        """
+        Args:
+            llm_interface: The LLM interface used for both judging and reflecting.
+        """
+        super().__init__(llm_interface)
+        self._reflector = LLMReflector(llm_interface)
+
+    def reflect(self, task: str, actor_result: Dict[str, Any], eval_report: EvaluationReport) -> Reflection:
+        """ Returns the reflection produced during evaluation, or reflects separately if there is none. """
+        if eval_report.reflection is not None:
+            return eval_report.reflection
+        return self._reflector.reflect(task, actor_result, eval_report)
+
+    def _build_messages(self, task: str, actor_result: Dict[str, Any]) -> List[Dict[str, str]]:
+        return PromptBuilder.build_judge_reflector_prompt(task, actor_result)
+
+    def _parse_and_validate_response(self, response_content: str) -> EvaluationReport:
+        """ Splits the fused response into the report and its (optional) reflection. """
+        try:
+            data = json.loads(response_content)
+        except json.JSONDecodeError:
+            # Let the parent produce its standard non-JSON failure report.
+            return super()._parse_and_validate_response(response_content)
+
+        reflection_data = data.pop("reflection", None) if isinstance(data, dict) else None
+        report = super()._parse_and_validate_response(json.dumps(data))
+
+        if report.status != EvaluationStatus.FULL_SUCCESS and isinstance(reflection_data, dict):
+            try:
+                report.reflection = self._reflector._parse_and_validate_response(json.dumps(reflection_data))
+            except ValueError:
+                logger.warning("Fused response carried an invalid reflection. The Reflector will be called separately.")
+        return report
@@ -1,6 +1,6 @@
 import logging
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from .base import BaseEvaluator
 from src.llm import LLMInterface
@@ -52,7 +52,7 @@ class LLMJudgeEvaluator(BaseEvaluator):
             
             
         # --- 2. Build the Prompt ---
-        messages = PromptBuilder.build_evaluator_prompt(task, actor_result)
+        messages = self._build_messages(task, actor_result)
         
         # --- 3. Call the LLM Judge ---
         logger.info("Calling LLM Judge for evaluation...")
@@ -72,7 +72,10 @@ class LLMJudgeEvaluator(BaseEvaluator):
                 metadata={"error": str(e)}
             )
 
-    
+    def _build_messages(self, task: str, actor_result: Dict[str, Any]) -> List[Dict[str, str]]:
+        """ Builds the Judge prompt. Subclasses override this to ask for more in the same call. """
+        return PromptBuilder.build_evaluator_prompt(task, actor_result)
+
     def _parse_and_validate_response(self, response_content: str) -> EvaluationReport:
         """
         Parses the JSON string from the LLM, validates its schema,
@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_sandbox_worker.py")
+
+
+class _Zygote:
+    """
+    One pre-warmed sandbox slot: a long-lived `python -I` process that forks a
+    resource-limited child per job (see _sandbox_worker.py). It runs in a throwaway
+    working directory with a minimal environment, so jobs cannot read the agent's
+    API keys or files through relative paths.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.workdir = tempfile.mkdtemp(prefix="sandbox-")
+        self._start()
+
+    def _start(self) -> None:
+        self.process = subprocess.Popen(
+            [sys.executable, "-I", _WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            cwd=self.workdir,
+            env={"PATH": os.defpath, "HOME": self.workdir, "TMPDIR": self.workdir, "LANG": "C.UTF-8"},
+        )
+        handshake = self.process.stdout.readline()
+        if not handshake:
+            raise RuntimeError("Sandbox worker failed to start.")
+
+    def execute(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """ Sends one job and waits for its result. Restarts the zygote if it died. """
+        with self._lock:
+            if self.process.poll() is not None:
+                logger.warning("Sandbox worker died. Restarting it.")
+                self._start()
+            try:
+                self.process.stdin.write(json.dumps(job) + "\n")
+                self.process.stdin.flush()
+                line = self.process.stdout.readline()
+            except (BrokenPipeError, OSError) as e:
+                line = ""
+                logger.error(f"Sandbox worker I/O failed: {e}")
+            if not line:
+                self.close()
+                return {"passed": False, "error": "SandboxError: worker exited unexpectedly", "duration": 0.0}
+            return json.loads(line)
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class SandboxPool:
+    """
+    A pool of pre-forked sandbox processes that run untrusted test code in parallel.
+
+    Each slot pays interpreter start-up once; every job then runs in a forked child
+    with its own CPU-time, address-space, file-size and process limits plus a
+    wall-clock timeout, in a scratch directory without the agent's environment. Slots are spawned as fresh interpreters (not forked from the caller),
+    so it is safe to use from multi-threaded agents. Requires a POSIX system.
+    """
+
+    def __init__(self, size: Optional[int] = None, timeout: float = 5.0, memory_mb: int = 256,
+                 cpu_seconds: Optional[int] = None):
+        """
+        Args:
+            size: Number of sandbox slots (parallel tests). Defaults to the number of CPU cores.
+            timeout: Wall-clock limit per test, in seconds.
+            memory_mb: Address-space limit per test, in megabytes.
+            cpu_seconds: CPU-time limit per test. Defaults to the timeout rounded up.
+        """
+        if not hasattr(os, "fork"):
+            raise RuntimeError("SandboxPool requires a POSIX system with os.fork().")
+        self.size = size or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.cpu_seconds = cpu_seconds
+        self._idle = queue.Queue()
+        self._zygotes = [_Zygote() for _ in range(self.size)]
+        for zygote in self._zygotes:
+            self._idle.put(zygote)
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="sandbox")
+        logger.info(f"SandboxPool started with {self.size} pre-warmed workers.")
+
+    def run_test(self, code: str, test: str) -> Dict[str, Any]:
+        """ Runs `code` then `test` in a sandbox. Returns {"passed", "error", "duration"}. """
+        zygote = self._idle.get()
+        try:
+            return zygote.execute({
+                "code": code,
+                "test": test,
+                "timeout": self.timeout,
+                "memory_mb": self.memory_mb,
+                "cpu_seconds": self.cpu_seconds,
+            })
+        finally:
+            self._idle.put(zygote)
+
+    def run_tests(self, code: str, tests: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """ Runs every named test against `code` in parallel across the pool. """
+        futures = {name: self._executor.submit(self.run_test, code, test) for name, test in tests.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    def close(self) -> None:
+        """ Shuts down all sandbox processes. """
+        self._executor.shutdown(wait=True)
+        for zygote in self._zygotes:
+            zygote.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,132 @@
+import logging
+import re
+from typing import Dict, Any, Optional, List, Union
+
+from .base import BaseEvaluator
+from .sandbox_pool import SandboxPool
+from src.components import EvaluationReport, EvaluationStatus
+from src.utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+_CODE_BLOCK = re.compile(r"```(?:python|py)?[ \t]*\n(.*?)```", re.DOTALL | re.IGNORECASE)
+
+TestSuite = Union[List[str], Dict[str, str]]
+
+
+def extract_code(answer: str) -> str:
+    """ Returns the fenced code blocks of an answer joined together, or the whole answer if there are none. """
+    blocks = _CODE_BLOCK.findall(answer or "")
+    if blocks:
+        return "\n\n".join(block.strip("\n") for block in blocks)
+    return (answer or "").strip()
+
+
+class UnitTestEvaluator(BaseEvaluator):
+    """
+    Evaluates coding tasks by running the agent's code against known unit tests
+    in a pre-forked SandboxPool.
+
+    Tests are plain Python snippets (typically `assert` statements) executed after the
+    solution in the same namespace. The report's metadata carries per-test results so
+    the Reflector can point at the exact failing case.
+    """
+
+    def __init__(self,
+                 tests: Optional[Dict[str, TestSuite]] = None,
+                 pool: Optional[SandboxPool] = None,
+                 fallback: Optional[BaseEvaluator] = None,
+                 timeout: float = 5.0,
+                 memory_mb: int = 256,
+                 workers: Optional[int] = None):
+        """
+        Args:
+            tests: Mapping of task -> tests. Tests are a list of snippets or a {name: snippet} dict.
+            pool: A shared SandboxPool. If omitted, one is started (and pre-warmed) right away.
+            fallback: Evaluator used for tasks that have no registered tests.
+            timeout: Per-test wall-clock limit, used when creating a pool.
+            memory_mb: Per-test memory limit, used when creating a pool.
+            workers: Number of sandbox workers, used when creating a pool. Defaults to the CPU count.
+        """
+        self.tests = {}
+        for task, suite in (tests or {}).items():
+            self.add(task, suite)
+        self.pool = pool or SandboxPool(size=workers, timeout=timeout, memory_mb=memory_mb)
+        self.fallback = fallback
+
+    def add(self, task: str, tests: TestSuite) -> None:
+        """ Registers (or replaces) the test suite for a task. """
+        if not isinstance(tests, dict):
+            tests = {f"test_{i}": test for i, test in enumerate(tests, 1)}
+        self.tests[normalize_text(task)] = tests
+
+    def evaluate(self, task: str, actor_result: Dict[str, Any]) -> EvaluationReport:
+        """ Runs the registered tests against the code in the actor's final answer. """
+        # --- 1. Pre-checks for Fast Failure ---
+        actor_status = actor_result.get("status")
+        if actor_status != "finished":
+            return EvaluationReport(
+                status=EvaluationStatus.FAILURE,
+                confidence=1.0,
+                reason=f"Evaluation skipped. Actor did not finish successfully (status: '{actor_status}').",
+                metadata={"decided_by": "unit_tests"}
+            )
+
+        code = extract_code(actor_result.get("final_answer") or "")
+        if not code:
+            return EvaluationReport(
+                status=EvaluationStatus.FAILURE,
+                confidence=1.0,
+                reason="Actor finished but provided no code to test.",
+                metadata={"decided_by": "unit_tests"}
+            )
+
+        tests = self.tests.get(normalize_text(task))
+        if not tests:
+            if self.fallback is not None:
+                report = self.fallback.evaluate(task, actor_result=actor_result)
+                report.metadata.setdefault("decided_by", "fallback")
+                return report
+            return EvaluationReport(
+                status=EvaluationStatus.FAILURE,
+                confidence=0.5,
+                reason="No unit tests registered for this task.",
+                metadata={"decided_by": "unit_tests", "undecided": True}
+            )
+
+        # --- 2. Run the tests in parallel ---
+        logger.info(f"Running {len(tests)} unit tests in the sandbox pool...")
+        results = self.pool.run_tests(code, tests)
+        return self._build_report(tests, results)
+
+    def _build_report(self, tests: Dict[str, str], results: Dict[str, Dict[str, Any]]) -> EvaluationReport:
+        """ Turns raw sandbox results into an EvaluationReport with per-test metadata. """
+        test_results = {
+            name: {"passed": bool(result.get("passed")), "error": result.get("error"), "test": tests[name]}
+            for name, result in results.items()
+        }
+        failed = [name for name, result in test_results.items() if not result["passed"]]
+        passed_count = len(test_results) - len(failed)
+
+        metadata = {
+            "decided_by": "unit_tests",
+            "tests_passed": passed_count,
+            "tests_failed": len(failed),
+            "test_results": test_results,
+        }
+        if not failed:
+            return EvaluationReport(
+                status=EvaluationStatus.FULL_SUCCESS,
+                confidence=1.0,
+                reason=f"All {passed_count} unit tests passed.",
+                metadata=metadata
+            )
+
+        metadata["failed_test"] = failed[0]
+        first = test_results[failed[0]]
+        reason = (
+            f"{passed_count} of {len(test_results)} unit tests passed. "
+            f"Test '{failed[0]}' failed: {first['error']} (test: {first['test'].strip()!r})."
+        )
+        status = EvaluationStatus.PARTIAL_SUCCESS if passed_count else EvaluationStatus.FAILURE
+        return EvaluationReport(status=status, confidence=1.0, reason=reason, metadata=metadata)
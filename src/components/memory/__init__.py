@@ -1,4 +1,6 @@
 from .base import BaseMemory
 from .simple_memory import SimpleMemory
+from .consolidating_memory import ConsolidatingMemory
+from .persistent_memory import PersistentMemory
 
-__all__ = ["BaseMemory", "SimpleMemory"]
\ No newline at end of file
+__all__ = ["BaseMemory", "SimpleMemory", "ConsolidatingMemory", "PersistentMemory"]
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List
-from src.components import Reflection
+from src.components import Reflection, ReflectionContext
 
 class BaseMemory(ABC):
     """ The base interface for all memory components. """
@@ -11,8 +11,8 @@ class BaseMemory(ABC):
         pass
 
     @abstractmethod
-    def get_context(self) -> str:
-        """ Retrieves the formatted memory context for the agent's prompt. """
+    def get_context(self) -> ReflectionContext:
+        """ Retrieves the lessons to inject into the agent's prompt. """
         pass
 
     @abstractmethod
@@ -23,4 +23,18 @@ class BaseMemory(ABC):
     @abstractmethod
     def clear(self):
         """ Clears all reflections from the memory. """
-        pass
\ No newline at end of file
+        pass
+
+    def start_task(self, task: str) -> None:
+        """
+        Called by the orchestrator before the first trial of a new task.
+        Working memories simply start empty; long-term memories may preload relevant lessons.
+        """
+        self.clear()
+
+    def record_outcome(self, success: bool) -> None:
+        """
+        Called by the orchestrator once the task is over, so long-term memories can
+        learn which of the lessons they provided were actually useful.
+        """
+        pass
@@ -0,0 +1,225 @@
+import json
+import logging
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from .simple_memory import SimpleMemory
+from src.components import Reflection, ReflectionContext
+from src.llm import LLMInterface
+from src.agent import PromptBuilder
+from src.utils.text import text_similarity, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+_WORD = re.compile(r"\w+")
+# A sentence whose words are mostly already present in the kept lesson adds nothing new
+_COVERED_WORD_FRACTION = 0.7
+
+
+class ConsolidatingMemory(SimpleMemory):
+    """
+    A working memory that consolidates overlapping lessons instead of forgetting the oldest.
+
+    - A new heuristic that is a near-duplicate of a stored one is merged into it.
+    - When the buffer exceeds max_size, or the rendered context exceeds token_budget,
+      the most similar pair is merged (or, if nothing overlaps, the weakest lesson dropped)
+      until both limits hold.
+    - A merge keeps the more confident lesson's wording and appends the other's sentences
+      that add something new, within a per-lesson share of token_budget.
+    - With an llm_interface, a background LLM pass rewrites the set into a compact list.
+      It never blocks add() or get_context(), and its result is discarded if memory
+      changed meanwhile or if it would not fit token_budget (the local merge stays).
+
+    The context object (and its rendering) is cached and only rebuilt after the memory changes.
+    """
+
+    def __init__(self,
+                 max_size: int = 5,
+                 confidence_threshold: float = 0.6,
+                 token_budget: int = 300,
+                 similarity_threshold: float = 0.8,
+                 merge_threshold: float = 0.4,
+                 llm_interface: Optional[LLMInterface] = None):
+        """
+        Args:
+            max_size: Maximum number of lessons kept.
+            confidence_threshold: Reflections below this confidence are discarded.
+            token_budget: Maximum estimated tokens of the rendered context.
+            similarity_threshold: Similarity above which a new lesson is merged on arrival.
+            merge_threshold: Minimum similarity for two lessons to be merged when over a limit.
+                             Below it, the lowest-confidence lesson is dropped instead.
+            llm_interface: Optional LLM used to consolidate the set in the background.
+        """
+        super().__init__(max_size=max_size, confidence_threshold=confidence_threshold)
+        self.token_budget = token_budget
+        self.similarity_threshold = similarity_threshold
+        self.merge_threshold = merge_threshold
+        self.llm = llm_interface
+        self._lock = threading.RLock()
+        self._version = 0
+        self._cached_context = None
+        self._cached_version = -1
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-merge") if llm_interface else None
+        self._pending_merge = None
+
+    def add(self, reflection: Reflection):
+        """ Adds a reflection, merging it into a near-duplicate and consolidating if over a limit. """
+        if reflection.confidence < self.add_threshold:
+            logger.debug(
+                f"Reflection confidence ({reflection.confidence:.2f}) is below "
+                f"threshold ({self.add_threshold}). Discarding."
+            )
+            return
+
+        with self._lock:
+            match, similarity = self._most_similar(reflection.actionable_heuristic)
+            if match is not None and similarity >= self.similarity_threshold:
+                logger.info(f"Reflection overlaps a stored lesson (similarity {similarity:.2f}). Merged.")
+                self.reflections[match] = self._merge(self.reflections[match], reflection)
+            else:
+                self.reflections.append(reflection)
+            self._version += 1
+
+            if self._over_limits():
+                self._consolidate()
+                self._schedule_llm_merge()
+
+    def get_context(self) -> ReflectionContext:
+        """ The lessons for the actor's prompt. The same (render-cached) object is returned until memory changes. """
+        with self._lock:
+            if self._cached_version != self._version:
+                self._cached_context = super().get_context()
+                self._cached_version = self._version
+            return self._cached_context
+
+    def get_all(self) -> List[Reflection]:
+        with self._lock:
+            return list(self.reflections)
+
+    def clear(self):
+        with self._lock:
+            self.reflections = []
+            self._version += 1
+
+    def wait_for_consolidation(self, timeout: Optional[float] = None) -> None:
+        """ Blocks until a pending background LLM merge (if any) has been applied. """
+        pending = self._pending_merge
+        if pending is not None:
+            pending.result(timeout=timeout)
+
+    # --- Internals ---
+
+    def _over_limits(self) -> bool:
+        return len(self.reflections) > self.max_size or \
+            estimate_tokens(ReflectionContext.from_reflections(self.reflections).render()) > self.token_budget
+
+    def _most_similar(self, heuristic: str):
+        """ Returns (index, similarity) of the stored lesson most similar to `heuristic`. """
+        best, best_similarity = None, -1.0
+        for i, stored in enumerate(self.reflections):
+            similarity = text_similarity(heuristic, stored.actionable_heuristic)
+            if similarity > best_similarity:
+                best, best_similarity = i, similarity
+        return best, best_similarity
+
+    def _consolidate(self) -> None:
+        """ Merges the closest pairs (or drops the weakest lesson) until within max_size and token_budget. """
+        while self._over_limits() and len(self.reflections) > 1:
+            pair, similarity = None, -1.0
+            for i in range(len(self.reflections)):
+                for j in range(i + 1, len(self.reflections)):
+                    s = text_similarity(self.reflections[i].actionable_heuristic, self.reflections[j].actionable_heuristic)
+                    if s > similarity:
+                        pair, similarity = (i, j), s
+
+            i, j = pair
+            if similarity >= self.merge_threshold:
+                self.reflections[i] = self._merge(self.reflections[i], self.reflections[j])
+                del self.reflections[j]
+                logger.info(f"Memory over limit. Merged two overlapping lessons (similarity {similarity:.2f}).")
+            else:
+                weakest = min(range(len(self.reflections)), key=lambda k: self.reflections[k].confidence)
+                removed = self.reflections.pop(weakest)
+                logger.info("Memory over limit and no lessons overlap. Removed the lowest-confidence lesson.")
+                logger.debug(f"Removed heuristic: '{removed.actionable_heuristic}'")
+        self._version += 1
+
+    def _merge(self, kept: Reflection, other: Reflection) -> Reflection:
+        """
+        Keeps the more confident lesson's wording, appends the other's sentences that are not
+        already covered by it (as long as the result fits one lesson's share of the token
+        budget), and records what was folded into it.
+        """
+        if other.confidence > kept.confidence:
+            kept, other = other, kept
+        heuristic = kept.actionable_heuristic.strip()
+        max_tokens = max(self.token_budget // max(self.max_size, 1),
+                         estimate_tokens(kept.actionable_heuristic), estimate_tokens(other.actionable_heuristic))
+        for sentence in _SENTENCE_END.split(other.actionable_heuristic.strip()):
+            words = set(_WORD.findall(sentence.lower()))
+            known = set(_WORD.findall(heuristic.lower()))
+            if not words or len(words & known) / len(words) >= _COVERED_WORD_FRACTION:
+                continue
+            candidate = f"{heuristic} {sentence}" if heuristic.endswith((".", "!", "?", ";")) else f"{heuristic}; {sentence}"
+            if estimate_tokens(candidate) > max_tokens:
+                break
+            heuristic = candidate
+
+        metadata = dict(kept.metadata)
+        metadata["merged_ids"] = metadata.get("merged_ids", []) + [other.id] + other.metadata.get("merged_ids", [])
+        return Reflection(
+            id=kept.id,
+            root_cause_analysis=kept.root_cause_analysis,
+            actionable_heuristic=heuristic,
+            confidence=kept.confidence,
+            metadata=metadata,
+            valid_prefix_steps=kept.valid_prefix_steps,
+        )
+
+    def _schedule_llm_merge(self) -> None:
+        """ Submits a background LLM consolidation of the current snapshot, if an LLM is configured. """
+        if self._executor is None or (self._pending_merge is not None and not self._pending_merge.done()):
+            return
+        snapshot, version = list(self.reflections), self._version
+        self._pending_merge = self._executor.submit(self._llm_merge, snapshot, version)
+
+    def _llm_merge(self, snapshot: List[Reflection], version: int) -> None:
+        messages = PromptBuilder.build_memory_consolidation_prompt(
+            [r.actionable_heuristic for r in snapshot], max_items=self.max_size
+        )
+        try:
+            response = self.llm.get_chat_completion(messages, json_mode=True)
+            heuristics = json.loads(response.get("content", "{}"))["heuristics"]
+            heuristics = [str(h).strip() for h in heuristics if str(h).strip()][:self.max_size]
+        except Exception as e:
+            logger.warning(f"Background memory consolidation failed. Keeping the local merge. Error: {e}")
+            return
+        if not heuristics:
+            return
+
+        with self._lock:
+            if self._version != version:
+                logger.info("Memory changed during background consolidation. Discarding the LLM merge.")
+                return
+            confidence = min(r.confidence for r in snapshot)
+            merged = [
+                Reflection(
+                    id=f"ref_{uuid.uuid4()}",
+                    root_cause_analysis="Consolidated from earlier lessons.",
+                    actionable_heuristic=h,
+                    confidence=confidence,
+                    metadata={"consolidated_from": [r.id for r in snapshot]},
+                )
+                for h in heuristics
+            ]
+            # The LLM may return longer lessons than it was given; never let them push the prompt over budget.
+            if estimate_tokens(ReflectionContext.from_reflections(merged).render()) > self.token_budget:
+                logger.info("Background consolidation result exceeds the token budget. Keeping the local merge.")
+                return
+            self.reflections = merged
+            self._version += 1
+            logger.info(f"Background consolidation merged {len(snapshot)} lessons into {len(heuristics)}.")
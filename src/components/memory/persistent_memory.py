@@ -0,0 +1,303 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from .base import BaseMemory
+from src.components import Reflection, ReflectionContext
+from src.utils.text import hashed_ngram_vector
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reflections (
+    row INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    task TEXT NOT NULL,
+    heuristic TEXT NOT NULL,
+    root_cause TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    metadata TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    uses INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+class PersistentMemory(BaseMemory):
+    """
+    A long-term, on-disk reflection store shared across tasks and runs.
+
+    Reflections live in SQLite; alongside it two memory-mapped float32 matrices hold
+    hashed n-gram vectors of each reflection's task and heuristic (one row per SQLite
+    `row`). Retrieval for a new task is a single matrix-vector product, so no embedding
+    service is needed.
+
+    Per task it behaves like a working memory: start_task() preloads the top-k most
+    relevant past lessons, add() appends new ones (deduplicating near-identical
+    heuristics against the whole store), and record_outcome() credits the preloaded
+    lessons with the task's outcome (lessons written during the task were never
+    retrieved, so they get no credit for it). When the store is full, the entry with
+    the lowest usefulness (success rate x confidence x recency) is evicted.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 top_k: int = 3,
+                 max_entries: int = 1000,
+                 confidence_threshold: float = 0.6,
+                 dedup_threshold: float = 0.85,
+                 min_similarity: float = 0.25,
+                 half_life_days: float = 30.0,
+                 dim: int = 512):
+        """
+        Args:
+            path: Directory holding the store. Defaults to ~/.cache/ai_agent/reflections.
+            top_k: Number of past reflections preloaded for a new task.
+            max_entries: Capacity of the store; the least useful entry is evicted beyond it.
+                         Lowering it never deletes stored rows on load: rows that no longer
+                         fit stay on disk, unindexed, until the capacity is raised again.
+            confidence_threshold: Reflections below this confidence are not stored.
+            dedup_threshold: Heuristic cosine similarity above which two reflections are merged.
+            min_similarity: Minimum task similarity for a stored reflection to be retrieved.
+            half_life_days: Recency half-life used when scoring entries for eviction.
+            dim: Dimension of the hashed n-gram vectors.
+        """
+        if top_k < 0 or max_entries < 1:
+            raise ValueError("top_k must be >= 0 and max_entries must be at least 1.")
+        self.path = os.path.expanduser(path or os.path.join("~", ".cache", "ai_agent", "reflections"))
+        self.top_k = top_k
+        self.max_entries = max_entries
+        self.add_threshold = confidence_threshold
+        self.dedup_threshold = dedup_threshold
+        self.min_similarity = min_similarity
+        self.half_life_seconds = half_life_days * 86400
+        self.dim = dim
+
+        self._lock = threading.RLock()
+        self._task = ""
+        self._working: List[Reflection] = []
+        self._retrieved_ids: List[str] = []
+        os.makedirs(self.path, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.path, "reflections.sqlite3"), check_same_thread=False)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+        self._task_vectors = self._open_matrix("task_vectors.f32")
+        self._heuristic_vectors = self._open_matrix("heuristic_vectors.f32")
+        self._alive = np.zeros(self.max_entries, dtype=bool)
+        self._load_index()
+
+    # --- BaseMemory interface ---
+
+    def start_task(self, task: str) -> None:
+        """ Resets the working set and preloads the most relevant past reflections for `task`. """
+        with self._lock:
+            self._task = task
+            self._working = self.search(task, self.top_k) if self.top_k else []
+            self._retrieved_ids = [r.id for r in self._working]
+            if self._working:
+                now = time.time()
+                self._db.executemany("UPDATE reflections SET last_used_at = ? WHERE id = ?",
+                                     [(now, r.id) for r in self._working])
+                self._db.commit()
+                logger.info(f"Preloaded {len(self._working)} past reflections for this task.")
+
+    def add(self, reflection: Reflection) -> None:
+        """ Adds a reflection to the working set and persists it, merging near-duplicates. """
+        if reflection.confidence < self.add_threshold:
+            logger.debug(
+                f"Reflection confidence ({reflection.confidence:.2f}) is below "
+                f"threshold ({self.add_threshold}). Discarding."
+            )
+            return
+
+        with self._lock:
+            heuristic_vector = hashed_ngram_vector(reflection.actionable_heuristic, self.dim)
+            duplicate_row = self._find_duplicate(heuristic_vector)
+            if duplicate_row is not None:
+                self._db.execute(
+                    "UPDATE reflections SET confidence = MAX(confidence, ?), last_used_at = ? WHERE row = ?",
+                    (reflection.confidence, time.time(), duplicate_row)
+                )
+                self._db.commit()
+                existing = self._fetch_rows([duplicate_row])[0]
+                logger.info("Reflection is a near-duplicate of a stored lesson. Merged.")
+                if all(r.id != existing.id for r in self._working):
+                    self._working.append(existing)
+                return
+
+            row = self._free_row()
+            now = time.time()
+            self._db.execute(
+                "INSERT INTO reflections (row, id, task, heuristic, root_cause, confidence, metadata, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (row, reflection.id, self._task, reflection.actionable_heuristic, reflection.root_cause_analysis,
+                 reflection.confidence, json.dumps(reflection.metadata, default=str), now, now)
+            )
+            self._db.commit()
+            self._task_vectors[row] = hashed_ngram_vector(self._task, self.dim)
+            self._heuristic_vectors[row] = heuristic_vector
+            self._task_vectors.flush()
+            self._heuristic_vectors.flush()
+            self._alive[row] = True
+            self._working.append(reflection)
+
+    def get_context(self) -> ReflectionContext:
+        """ The working set's heuristics for the actor's prompt. """
+        return ReflectionContext.from_reflections(self._working)
+
+    def get_all(self) -> List[Reflection]:
+        """ Returns the reflections in play for the current task (preloaded + new). """
+        return list(self._working)
+
+    def clear(self):
+        """ Clears the working set. The on-disk store is kept; use purge() to wipe it. """
+        self._working = []
+
+    def record_outcome(self, success: bool) -> None:
+        """
+        Credits each reflection retrieved by start_task() with one use (and one success).
+        Reflections added during the task are not credited: they did not guide this attempt.
+        """
+        with self._lock:
+            ids = [(int(success), reflection_id) for reflection_id in self._retrieved_ids]
+            self._retrieved_ids = []
+            self._db.executemany("UPDATE reflections SET uses = uses + 1, successes = successes + ? WHERE id = ?", ids)
+            self._db.commit()
+
+    # --- Store management ---
+
+    def search(self, query: str, k: int) -> List[Reflection]:
+        """ Returns up to k stored reflections whose task or heuristic is most similar to `query`. """
+        with self._lock:
+            if k <= 0 or not self._alive.any():
+                return []
+            q = hashed_ngram_vector(query, self.dim)
+            scores = 0.7 * (self._task_vectors @ q) + 0.3 * (self._heuristic_vectors @ q)
+            scores[~self._alive] = -np.inf
+            k = min(k, int(self._alive.sum()))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            rows = [int(r) for r in top if scores[r] >= self.min_similarity]
+            return self._fetch_rows(rows)
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+    def purge(self) -> None:
+        """ Deletes every stored reflection. """
+        with self._lock:
+            self._db.execute("DELETE FROM reflections")
+            self._db.commit()
+            self._alive[:] = False
+            self._working = []
+            self._retrieved_ids = []
+
+    def close(self) -> None:
+        with self._lock:
+            self._task_vectors.flush()
+            self._heuristic_vectors.flush()
+            self._db.close()
+
+    # --- Internals ---
+
+    def _open_matrix(self, filename: str) -> np.memmap:
+        """ Opens (or creates) a (max_entries, dim) float32 memmap. A size mismatch triggers a rebuild. """
+        file_path = os.path.join(self.path, filename)
+        expected_bytes = self.max_entries * self.dim * 4
+        mode = "r+" if os.path.exists(file_path) and os.path.getsize(file_path) == expected_bytes else "w+"
+        matrix = np.memmap(file_path, dtype=np.float32, mode=mode, shape=(self.max_entries, self.dim))
+        if mode == "w+":
+            self._needs_reindex = True
+        return matrix
+
+    def _load_index(self) -> None:
+        """
+        Marks live rows, recomputing vectors if the matrices were recreated. Rows beyond
+        capacity (after max_entries was lowered) are moved into free rows where possible;
+        the rest stay on disk unindexed, with a warning, rather than being deleted.
+        """
+        rows = self._db.execute("SELECT row, task, heuristic FROM reflections WHERE row < ?", (self.max_entries,)).fetchall()
+        overflow = self._db.execute(
+            "SELECT row, task, heuristic FROM reflections WHERE row >= ? ORDER BY last_used_at DESC", (self.max_entries,)
+        ).fetchall()
+        rebuild = getattr(self, "_needs_reindex", False)
+        for row, task, heuristic in rows:
+            self._alive[row] = True
+            if rebuild:
+                self._task_vectors[row] = hashed_ngram_vector(task, self.dim)
+                self._heuristic_vectors[row] = hashed_ngram_vector(heuristic, self.dim)
+
+        free_rows = np.flatnonzero(~self._alive)
+        moved = list(zip(free_rows.tolist(), overflow))
+        for new_row, (old_row, task, heuristic) in moved:
+            self._db.execute("UPDATE reflections SET row = ? WHERE row = ?", (new_row, old_row))
+            self._task_vectors[new_row] = hashed_ngram_vector(task, self.dim)
+            self._heuristic_vectors[new_row] = hashed_ngram_vector(heuristic, self.dim)
+            self._alive[new_row] = True
+        if moved:
+            self._db.commit()
+        if len(overflow) > len(moved):
+            logger.warning(f"Reflection store holds {len(overflow) - len(moved)} entries beyond max_entries="
+                           f"{self.max_entries}. They are kept on disk but not used until the capacity is raised.")
+        if (rebuild and rows) or moved:
+            self._task_vectors.flush()
+            self._heuristic_vectors.flush()
+        self._needs_reindex = False
+
+    def _find_duplicate(self, heuristic_vector: np.ndarray) -> Optional[int]:
+        if not self._alive.any():
+            return None
+        similarities = self._heuristic_vectors @ heuristic_vector
+        similarities[~self._alive] = -np.inf
+        best = int(np.argmax(similarities))
+        return best if similarities[best] >= self.dedup_threshold else None
+
+    def _free_row(self) -> int:
+        """ Returns an unused row, evicting the least useful entry if the store is full. """
+        free = np.flatnonzero(~self._alive)
+        if free.size:
+            return int(free[0])
+
+        rows = np.array(self._db.execute(
+            "SELECT row, confidence, last_used_at, uses, successes FROM reflections WHERE row < ?", (self.max_entries,)
+        ).fetchall(), dtype=np.float64)
+        row_ids, confidence, last_used, uses, successes = rows.T
+        success_rate = (successes + 1) / (uses + 2)  # Laplace-smoothed usefulness
+        recency = 0.5 ** ((time.time() - last_used) / self.half_life_seconds)
+        victim = int(row_ids[np.argmin(success_rate * confidence * recency)])
+
+        self._db.execute("DELETE FROM reflections WHERE row = ?", (victim,))
+        self._db.commit()
+        self._alive[victim] = False
+        logger.info("Reflection store full. Evicted the least useful entry.")
+        return victim
+
+    def _fetch_rows(self, rows: List[int]) -> List[Reflection]:
+        """ Loads reflections by row, preserving the given order. """
+        if not rows:
+            return []
+        placeholders = ",".join("?" * len(rows))
+        records = {
+            record[0]: record for record in self._db.execute(
+                f"SELECT row, id, heuristic, root_cause, confidence, metadata FROM reflections WHERE row IN ({placeholders})",
+                rows
+            )
+        }
+        return [
+            Reflection(
+                id=records[row][1],
+                actionable_heuristic=records[row][2],
+                root_cause_analysis=records[row][3],
+                confidence=records[row][4],
+                metadata=json.loads(records[row][5]),
+            )
+            for row in rows if row in records
+        ]
@@ -1,6 +1,6 @@
 from typing import List
 from .base import BaseMemory
-from src.components import Reflection
+from src.components import Reflection, ReflectionContext
 
 import logging
 
@@ -45,23 +45,13 @@ class SimpleMemory(BaseMemory):
             logger.debug(f"Removed heuristic: '{removed.actionable_heuristic}'")
 
             
-    def get_context(self) -> str:
+    def get_context(self) -> ReflectionContext:
         """
-        Formats the actionable heuristics from the stored reflections into a
-        single string, ready for injection into the actor's prompt.
+        Packages the actionable heuristics from the stored reflections into a
+        ReflectionContext, ready for injection into the actor's prompt.
         """
-        if not self.reflections:
-            return "" # Return empty string if no reflections have been added
-
         # We only want the high-signal heuristic in the prompt, not the full analysis.
-        heuristics = [r.actionable_heuristic for r in self.reflections]
-
-        header = "--- STRATEGIC REFLECTIONS ---\n" \
-                 "Review these lessons from past attempts before proceeding:"
-        
-        formatted_heuristics = "\n".join(f"- {h}" for h in heuristics)
-        
-        return f"{header}\n{formatted_heuristics}\n---------------------------\n"
+        return ReflectionContext.from_reflections(self.reflections)
 
     def get_all(self) -> List[Reflection]:
         """ Returns the full list of stored Reflection objects. """
@@ -1,4 +1,5 @@
 from .base import BaseReflector
 from .llm_reflector import LLMReflector
+from .caching_reflector import CachingReflector
 
-__all__ = ["BaseReflector", "LLMReflector"]
\ No newline at end of file
+__all__ = ["BaseReflector", "LLMReflector", "CachingReflector"]
@@ -0,0 +1,53 @@
+import logging
+import uuid
+from typing import Dict, Any, Optional
+
+from .base import BaseReflector
+from src.components import Reflection, EvaluationReport
+from src.utils.cache import BoundedCache
+from src.utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class CachingReflector(BaseReflector):
+    """
+    Memoizes another reflector's lessons on (task, evaluation status, evaluation reason).
+
+    The same failure, judged for the same reason, yields the same lesson, so a repeated
+    failed answer does not cost a second Reflector call. Fallback reflections (produced
+    when the Reflector itself failed) are never cached.
+    """
+
+    def __init__(self, reflector: BaseReflector, cache: Optional[BoundedCache] = None,
+                 max_size: int = 1024, ttl: Optional[float] = None, path: Optional[str] = None):
+        """
+        Args:
+            reflector: The reflector whose lessons are cached.
+            cache: A pre-built (possibly shared) cache. Overrides max_size/ttl/path.
+            max_size: Maximum number of cached reflections.
+            ttl: Seconds after which a cached reflection expires.
+            path: JSON file to load the cache from and save() it to.
+        """
+        self.reflector = reflector
+        self.cache = cache or BoundedCache(max_size=max_size, ttl=ttl, path=path)
+
+    def reflect(self, task: str, actor_result: Dict[str, Any], eval_report: EvaluationReport) -> Reflection:
+        key = (normalize_text(task), eval_report.status.value, normalize_text(eval_report.reason))
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("Reflection cache hit. Skipping reflection.")
+            reflection = Reflection.from_dict(cached)
+            # A fresh id keeps memories that track reflections by id consistent.
+            reflection.id = f"ref_{uuid.uuid4()}"
+            reflection.metadata["cached"] = True
+            return reflection
+
+        reflection = self.reflector.reflect(task, actor_result=actor_result, eval_report=eval_report)
+        if not reflection.metadata.get("is_fallback"):
+            self.cache.set(key, reflection.to_dict())
+        return reflection
+
+    def save(self, path: Optional[str] = None) -> None:
+        """ Persists the reflection cache to JSON. """
+        self.cache.save(path)
@@ -51,7 +51,10 @@ class LLMReflector(BaseReflector):
             response_content = response_message.get("content", "{}")
             
             # --- 4. Parse and Validate ---
-            return self._parse_and_validate_response(response_content)
+            reflection = self._parse_and_validate_response(response_content)
+            # The prefix can never be longer than what actually happened.
+            reflection.valid_prefix_steps = min(reflection.valid_prefix_steps, len(trajectory))
+            return reflection
 
         except Exception as e:
             logger.error(f"Reflector call failed with an unexpected error: {e}", exc_info=True)
@@ -72,20 +75,28 @@ class LLMReflector(BaseReflector):
                 raise KeyError(f"LLM response is missing core reflection keys: {[k for k in core_keys if k not in data]}")
 
             # All other keys from the JSON are funneled into metadata.
-            metadata = {k: v for k, v in data.items() if k not in core_keys}
+            optional_keys = ["valid_prefix_steps"]
+            metadata = {k: v for k, v in data.items() if k not in core_keys + optional_keys}
             
             confidence = float(data["confidence"])
             if not 0.0 <= confidence <= 1.0:
                 logger.warning(f"Reflection confidence {confidence} out of bounds [0,1]. Clamping.")
                 confidence = max(0.0, min(1.0, confidence))
 
+            # Optional: how many leading steps were sound. Anything unparsable means "restart".
+            try:
+                valid_prefix_steps = max(0, int(data.get("valid_prefix_steps") or 0))
+            except (TypeError, ValueError):
+                valid_prefix_steps = 0
+
             # --- Construct the Reflection ---
             return Reflection(
                 id=f"ref_{uuid.uuid4()}",
                 actionable_heuristic=str(data["actionable_heuristic"]),
                 root_cause_analysis=str(data["root_cause_analysis"]),
                 confidence=confidence,
-                metadata=metadata
+                metadata=metadata,
+                valid_prefix_steps=valid_prefix_steps
             )
 
         except json.JSONDecodeError:
@@ -1,7 +1,9 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Iterable
 from enum import Enum
 
+from src.utils.text import estimate_tokens
+
 class EvaluationStatus(Enum):
     """ An enumeration for the status of an evaluation. """
     FULL_SUCCESS = "FULL_SUCCESS"
@@ -15,6 +17,23 @@ class EvaluationReport:
     confidence: float
     reason: str
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Set by fused judge-and-reflect evaluators, so the orchestrator can skip the Reflector call.
+    reflection: Optional["Reflection"] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """ A JSON-serialisable representation, used for caching and logging. """
+        data = {"status": self.status.value, "confidence": self.confidence,
+                "reason": self.reason, "metadata": dict(self.metadata)}
+        if self.reflection is not None:
+            data["reflection"] = self.reflection.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EvaluationReport":
+        reflection = data.get("reflection")
+        return cls(status=EvaluationStatus(data["status"]), confidence=float(data["confidence"]),
+                   reason=data["reason"], metadata=dict(data.get("metadata") or {}),
+                   reflection=Reflection.from_dict(reflection) if reflection else None)
 
 @dataclass
 class Reflection:
@@ -23,4 +42,71 @@ class Reflection:
     root_cause_analysis: str
     actionable_heuristic: str
     confidence: float
-    metadata: Dict[str, Any] = field(default_factory=dict)
\ No newline at end of file
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    # Number of leading trajectory steps the Reflector judged correct; the next trial may resume after them.
+    valid_prefix_steps: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """ A JSON-serialisable representation, used for caching and logging. """
+        return {"id": self.id, "root_cause_analysis": self.root_cause_analysis,
+                "actionable_heuristic": self.actionable_heuristic, "confidence": self.confidence,
+                "metadata": dict(self.metadata), "valid_prefix_steps": self.valid_prefix_steps}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Reflection":
+        return cls(id=data["id"], root_cause_analysis=data["root_cause_analysis"],
+                   actionable_heuristic=data["actionable_heuristic"], confidence=float(data["confidence"]),
+                   metadata=dict(data.get("metadata") or {}),
+                   valid_prefix_steps=int(data.get("valid_prefix_steps") or 0))
+
+class ReflectionContext:
+    """
+    The typed channel from memory to the actor prompt: an ordered, immutable set of
+    lessons (oldest first) that renders itself as prompt bullets.
+
+    render() is cached per token budget, so an actor rebuilding its prompt every step
+    renders the lessons only once per trial. When a budget is given, the newest lessons
+    that fit are kept.
+    """
+
+    def __init__(self, heuristics: Iterable[str] = ()):
+        heuristics = tuple(heuristics)
+        if not all(isinstance(h, str) for h in heuristics):
+            raise TypeError("ReflectionContext heuristics must all be strings.")
+        self.heuristics = tuple(h.strip() for h in heuristics if h and h.strip())
+        self._rendered: Dict[Optional[int], str] = {}
+
+    @classmethod
+    def from_reflections(cls, reflections: Iterable["Reflection"]) -> "ReflectionContext":
+        return cls(r.actionable_heuristic for r in reflections)
+
+    def render(self, token_budget: Optional[int] = None) -> str:
+        """ Renders the lessons as one bullet per line, dropping the oldest ones that exceed token_budget. """
+        if token_budget not in self._rendered:
+            lines = [f"  • {h}" for h in self.heuristics]
+            if token_budget is not None:
+                kept, used = [], 0
+                for line in reversed(lines):
+                    cost = estimate_tokens(line + "\n")
+                    if used + cost > token_budget:
+                        break
+                    kept.append(line)
+                    used += cost
+                lines = kept[::-1]
+            self._rendered[token_budget] = "\n".join(lines)
+        return self._rendered[token_budget]
+
+    def __len__(self) -> int:
+        return len(self.heuristics)
+
+    def __bool__(self) -> bool:
+        return bool(self.heuristics)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ReflectionContext) and other.heuristics == self.heuristics
+
+    def __hash__(self) -> int:
+        return hash(self.heuristics)
+
+    def __repr__(self) -> str:
+        return f"ReflectionContext({list(self.heuristics)!r})"
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Iterator
 
 class LLMConnectionError(Exception):
     """Custom exception for failures in LLM API calls."""
@@ -12,7 +12,7 @@ class LLMInterface(ABC):
     Abstract Base Class for all LLM providers.
     Defines the contract that all LLM adapters must follow.
     """
-    
+
     @abstractmethod
     def get_chat_completion(self, messages: List[Dict[str, str]], json_mode: bool = False) -> Dict[str, str]:
         """
@@ -25,4 +25,14 @@ class LLMInterface(ABC):
         Returns:
             The assistant's response as a single message dictionary.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def stream_chat_completion(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """
+        Streams the assistant's response as text deltas.
+
+        Adapters whose provider supports server-side streaming override this.
+        The default falls back to a single blocking call and yields the whole content once.
+        """
+        response = self.get_chat_completion(messages)
+        yield response.get("content", "")
@@ -1,6 +1,6 @@
 import os
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterator
 
 from openai import OpenAI, APIError
 from .base import LLMInterface, LLMConnectionError
@@ -50,4 +50,24 @@ class GoogleInterface(LLMInterface):
             raise LLMConnectionError(f"Google API failed with status {e.status_code}: {e.message}")
         except Exception as e:
             logger.error(f"Unexpected error calling Google: {e}", exc_info=True)
-            raise LLMConnectionError(f"Unexpected error: {str(e)}")
\ No newline at end of file
+            raise LLMConnectionError(f"Unexpected error: {str(e)}")
+
+    def stream_chat_completion(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        try:
+            logger.debug(f"Streaming request to Google with {len(messages)} messages.")
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0,
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except APIError as e:
+            logger.error(f"Google API Error: {e}")
+            raise LLMConnectionError(f"Google API failed with status {e.status_code}: {e.message}")
+        except Exception as e:
+            logger.error(f"Unexpected error streaming from Google: {e}", exc_info=True)
+            raise LLMConnectionError(f"Unexpected error: {str(e)}")
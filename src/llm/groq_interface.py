@@ -1,6 +1,6 @@
 import os
 import logging
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Iterator
 
 from openai import OpenAI, APIError
 from .base import LLMInterface
@@ -51,4 +51,23 @@ class GroqInterface(LLMInterface):
             logger.error(f"An unexpected error occurred while calling Groq: {e}", exc_info=True)
             return {"role": "assistant", "content": f"An unexpected error occurred: {str(e)}"}
 
-            
+    def stream_chat_completion(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """ Streams text deltas from Groq. Errors are surfaced as content, like get_chat_completion. """
+        try:
+            logger.debug(f"Streaming request to Groq with {len(messages)} messages.")
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.7,
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except APIError as e:
+            logger.error(f"An API error occurred with Groq: {e}")
+            yield f"Error: The LLM API call failed with status code {e.status_code}. Details: {e.message}"
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while streaming from Groq: {e}", exc_info=True)
+            yield f"An unexpected error occurred: {str(e)}"
@@ -1,6 +1,6 @@
 import ollama
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 from .base import LLMInterface, LLMConnectionError
 
@@ -51,4 +51,25 @@ class OllamaInterface(LLMInterface):
         except Exception as e:
             # Catch generic errors
             logger.error(f"An unexpected error occurred while calling Ollama: {e}", exc_info=True)
-            raise LLMConnectionError(f"An unexpected error occurred: {str(e)}") from e
\ No newline at end of file
+            raise LLMConnectionError(f"An unexpected error occurred: {str(e)}") from e
+
+    def stream_chat_completion(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """
+        Streams text deltas from a local Ollama model.
+        Raises:
+            LLMConnectionError: If the API call to Ollama fails.
+        """
+        try:
+            logger.debug(f"Streaming request to Ollama with {len(messages)} messages.")
+            for chunk in ollama.chat(model=self.model, messages=messages, stream=True):
+                content = chunk['message']['content']
+                if content:
+                    yield content
+
+        except ollama.ResponseError as e:
+            logger.error(f"Ollama API Error: {e}")
+            raise LLMConnectionError(f"Ollama API Error: {str(e)}") from e
+
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while streaming from Ollama: {e}", exc_info=True)
+            raise LLMConnectionError(f"An unexpected error occurred: {str(e)}") from e
@@ -1,7 +1,7 @@
 import pytest
 from src.agent import PromptBuilder
 from src.tools import Tool
-from src.components.types import EvaluationReport, EvaluationStatus
+from src.components.types import EvaluationReport, EvaluationStatus, ReflectionContext
 
 # --- Reusable Test Data ---
 
@@ -153,4 +153,21 @@ def test_build_partial_success_prompt(sample_trajectory, partial_success_report)
     assert "The agent you are mentoring achieved PARTIAL SUCCESS" in system_msg["content"]
     
     assert user_msg["role"] == "user"
-    assert partial_success_report.reason in user_msg["content"]
\ No newline at end of file
+    assert partial_success_report.reason in user_msg["content"]
+
+def test_build_actor_prompt_rejects_bare_string(sample_tools):
+    """ Tests that a str (which would render one bullet per character) fails loudly. """
+    with pytest.raises(TypeError):
+        PromptBuilder.build_actor_prompt(task="t", tools=sample_tools, trajectory=[], reflections="Be careful.")
+
+def test_build_actor_prompt_respects_reflection_budget(sample_tools):
+    """ Tests that only the newest lessons that fit the budget are rendered, one bullet each. """
+    context = ReflectionContext([f"Lesson number {i} about verifying sources carefully." for i in range(20)])
+
+    content = PromptBuilder.build_actor_prompt(
+        task="t", tools=sample_tools, trajectory=[], reflections=context, reflection_token_budget=50
+    )[0]["content"]
+
+    assert "Lesson number 19" in content
+    assert "Lesson number 0 " not in content
+    assert content.count("  • Lesson number") == len(context.render(50).splitlines())
@@ -1,7 +1,10 @@
+import asyncio
+import threading
 import pytest
 from unittest.mock import Mock, MagicMock
 
 from src.architectures import ReactAgent
+from src.architectures import StepStarted, LLMTokenDelta, ActionParsed, ToolStarted, ToolFinished, AgentFinished
 from src.llm import LLMConnectionError
 from src.tools import Tool
 
@@ -142,4 +145,94 @@ def test_run_handles_hallucinated_tool(react_agent_and_mocks):
     
     # Check that the observation for the failed step contains a helpful error
     first_step_observation = trajectory[0]["observation"]
-    assert "Error: Tool 'fly_to_moon' not found." in first_step_observation
\ No newline at end of file
+    assert "Error: Tool 'fly_to_moon' not found." in first_step_observation
+
+def test_run_iter_yields_events_in_order(react_agent_and_mocks):
+    """ Tests that run_iter streams every stage of a Tool Call -> Finish trajectory. """
+    agent, mock_llm, mock_parser, _ = react_agent_and_mocks
+
+    mock_llm.get_chat_completion.side_effect = [
+        {"role": "assistant", "content": "content_for_tool_call"},
+        {"role": "assistant", "content": "content_for_finish"}
+    ]
+    mock_parser.side_effect = [
+        ("Thought: I need to search.", "search", "capital of France"),
+        ("Thought: I have the answer now.", "finish", "Paris")
+    ]
+
+    events = list(agent.run_iter(task="What is the capital of France?"))
+
+    assert [type(e) for e in events] == [
+        StepStarted, LLMTokenDelta, ActionParsed, ToolStarted, ToolFinished,
+        StepStarted, LLMTokenDelta, ActionParsed, AgentFinished
+    ]
+    tool_finished = events[4]
+    assert tool_finished.tool == "search"
+    assert tool_finished.duration >= 0
+    assert events[-1].result["final_answer"] == "Paris"
+
+def test_run_iter_streams_llm_tokens(react_agent_and_mocks):
+    """ Tests that token deltas are forwarded when streaming is enabled. """
+    agent, mock_llm, mock_parser, _ = react_agent_and_mocks
+    agent.stream_tokens = True
+
+    mock_llm.stream_chat_completion.return_value = iter(["Thought: done\n", "Action: finish\n", "Action Input: 42"])
+    mock_parser.return_value = ("done", "finish", "42")
+
+    events = list(agent.run_iter(task="Stream please."))
+
+    deltas = [e.delta for e in events if isinstance(e, LLMTokenDelta)]
+    assert deltas == ["Thought: done\n", "Action: finish\n", "Action Input: 42"]
+    mock_parser.assert_called_once_with("Thought: done\nAction: finish\nAction Input: 42")
+    mock_llm.get_chat_completion.assert_not_called()
+
+def test_arun_iter_matches_run_iter(react_agent_and_mocks):
+    """ Tests that the async variant yields the same events and the same final result. """
+    agent, mock_llm, mock_parser, _ = react_agent_and_mocks
+
+    mock_llm.get_chat_completion.return_value = {"role": "assistant", "content": "Some thought"}
+    mock_parser.return_value = ("Thought: I know the answer.", "finish", "The answer is 42.")
+
+    async def collect():
+        return [event async for event in agent.arun_iter(task="What is the meaning of life?")]
+
+    events = asyncio.run(collect())
+
+    assert isinstance(events[0], StepStarted)
+    assert isinstance(events[-1], AgentFinished)
+    assert events[-1].result["final_answer"] == "The answer is 42."
+
+def test_run_resumes_from_seed_trajectory(react_agent_and_mocks):
+    """ Tests that seeded steps are reused, not re-executed, and don't consume the step budget. """
+    agent, mock_llm, mock_parser, mock_search_tool = react_agent_and_mocks
+    seed = [{"thought": "t", "action": "search", "action_input": "capital of France",
+             "observation": "The capital of France is Paris."}]
+    mock_llm.get_chat_completion.return_value = {"role": "assistant", "content": "content_for_finish"}
+    mock_parser.return_value = ("I have it.", "finish", "Paris")
+
+    events = list(agent.run_iter(task="Capital of France?", seed_trajectory=seed))
+    result = events[-1].result
+
+    assert result["final_answer"] == "Paris"
+    assert result["trajectory"][0] == seed[0]
+    assert len(result["trajectory"]) == 2
+    mock_search_tool.execute.assert_not_called()
+    mock_llm.get_chat_completion.assert_called_once()
+    assert events[0] == StepStarted(step=2, max_steps=6)
+    # The seed is shown to the LLM as history.
+    prompt = str(mock_llm.get_chat_completion.call_args)
+    assert "The capital of France is Paris." in prompt
+
+def test_run_stops_before_next_llm_call_when_cancelled(react_agent_and_mocks):
+    """ Tests that a set cancel_event ends the run without another LLM call. """
+    agent, mock_llm, mock_parser, mock_tool = react_agent_and_mocks
+    cancel = threading.Event()
+    mock_llm.get_chat_completion.return_value = {"content": "Thought"}
+    mock_parser.return_value = ("Search first.", "search", "capital of France")
+    mock_tool.execute.side_effect = lambda _: cancel.set() or "observation"
+
+    result = agent.run("Task", cancel_event=cancel)
+
+    assert result["status"] == "cancelled"
+    assert mock_llm.get_chat_completion.call_count == 1
+    assert len(result["trajectory"]) == 1
@@ -1,7 +1,11 @@
+import threading
+import time
 import pytest
 from unittest.mock import MagicMock, call
-from src.architectures import ReflexionAgent
-from src.components import EvaluationStatus
+from src.architectures import BaseAgent, ReactAgent, ReflexionAgent
+from src.architectures import TrialStarted, TrialEvaluated, ReflectionAdded, AgentFinished, AttemptEvent, StepStarted
+from src.components import EvaluationStatus, Reflection
+from src.components.memory import SimpleMemory
 
 # We need a dummy class to mimic the EvaluationReport object
 class MockReport:
@@ -136,4 +140,216 @@ def test_is_successful_logic(mock_components):
     
     # Case 3: Failure + High Confidence -> False
     report = MockReport(EvaluationStatus.FAILURE, 0.99)
-    assert agent._is_successful(report) is False
\ No newline at end of file
+    assert agent._is_successful(report) is False
+
+def test_reflexion_run_iter_emits_trial_events(mock_components):
+    """Test that run_iter reports trial start, evaluation and reflection before finishing."""
+    actor, evaluator, reflector, memory = mock_components
+
+    actor.run.side_effect = [
+        {"final_answer": "Bad", "trajectory": ["step1"]},
+        {"final_answer": "Good", "trajectory": ["step1", "step2"]}
+    ]
+    evaluator.evaluate.side_effect = [
+        MockReport(EvaluationStatus.FAILURE, 1.0),
+        MockReport(EvaluationStatus.FULL_SUCCESS, 1.0)
+    ]
+    reflector.reflect.return_value = "Don't be bad."
+
+    agent = ReflexionAgent(actor, evaluator, reflector, memory, max_trials=3)
+    events = list(agent.run_iter("Task"))
+
+    assert [type(e) for e in events] == [
+        TrialStarted, TrialEvaluated, ReflectionAdded,
+        TrialStarted, TrialEvaluated, AgentFinished
+    ]
+    assert events[2].reflection == "Don't be bad."
+    assert events[-1].result["final_answer"] == "Good"
+
+# --- Best-of-N (parallel_attempts) ---
+
+class ScriptedActor(BaseAgent):
+    """A streaming actor that takes `steps` slow steps before answering."""
+    def __init__(self, answer, steps=0, delay=0.0):
+        self.answer = answer
+        self.steps = steps
+        self.delay = delay
+        self.steps_taken = 0
+
+    def run(self, task, context=None):
+        return self._consume(self.run_iter(task, context))
+
+    def run_iter(self, task, context=None):
+        for step in range(self.steps):
+            self.steps_taken += 1
+            yield StepStarted(step=step + 1, max_steps=self.steps)
+            time.sleep(self.delay)
+        yield AgentFinished(result={"status": "finished", "final_answer": self.answer, "trajectory": []})
+
+def judge_by_answer(task, actor_result):
+    if actor_result["final_answer"] == "Good":
+        return MockReport(EvaluationStatus.FULL_SUCCESS, 1.0)
+    return MockReport(EvaluationStatus.FAILURE, 1.0)
+
+def test_best_of_n_first_success_wins_and_cancels_the_rest(mock_components):
+    """A fast successful attempt ends the trial while slow siblings are cancelled."""
+    _, evaluator, reflector, memory = mock_components
+    evaluator.evaluate.side_effect = judge_by_answer
+
+    slow_actors = [ScriptedActor("Bad", steps=50, delay=0.02) for _ in range(2)]
+    actors = iter([slow_actors[0], ScriptedActor("Good"), slow_actors[1]])
+
+    agent = ReflexionAgent(ScriptedActor("unused"), evaluator, reflector, memory,
+                           parallel_attempts=3, actor_factory=lambda: next(actors))
+    events = list(agent.run_iter("Task"))
+    result = events[-1].result
+
+    assert result["status"] == "success"
+    assert result["final_answer"] == "Good"
+    assert result["metadata"]["trials_taken"] == 1
+    assert all(actor.steps_taken < 50 for actor in slow_actors)
+    assert any(isinstance(e, AttemptEvent) and isinstance(e.event, TrialEvaluated) for e in events)
+    reflector.reflect.assert_not_called()
+
+def test_best_of_n_reflections_from_all_failures_feed_next_trial(mock_components):
+    """When no attempt succeeds, every failed attempt's reflection is stored."""
+    actor, evaluator, reflector, memory = mock_components
+    actor.run.return_value = {"final_answer": "Bad", "trajectory": ["step1"]}
+    evaluator.evaluate.side_effect = judge_by_answer
+    reflector.reflect.return_value = "Don't be bad."
+
+    agent = ReflexionAgent(actor, evaluator, reflector, memory, max_trials=2,
+                           parallel_attempts=3, actor_factory=lambda: actor)
+    result = agent.run("Task")
+
+    assert result["status"] == "failure_max_trials"
+    assert result["metadata"]["trials_taken"] == 2
+    assert actor.run.call_count == 6
+    assert memory.add.call_count == 6
+    assert len(result["metadata"]["full_trial_history"]) == 6
+
+def test_reflection_attached_by_evaluator_skips_reflector(mock_components):
+    """ Tests that a fused judge-and-reflect report saves the separate Reflector call. """
+    actor, evaluator, reflector, memory = mock_components
+    actor.run.side_effect = [
+        {"final_answer": "Bad", "trajectory": ["step1"]},
+        {"final_answer": "Good", "trajectory": ["step1"]},
+    ]
+    failed = MockReport(EvaluationStatus.FAILURE, 1.0)
+    failed.reflection = "Fused lesson."
+    evaluator.evaluate.side_effect = [failed, MockReport(EvaluationStatus.FULL_SUCCESS, 1.0)]
+
+    result = ReflexionAgent(actor, evaluator, reflector, memory, max_trials=3).run("Task")
+
+    assert result["status"] == "success"
+    reflector.reflect.assert_not_called()
+    memory.add.assert_called_once_with("Fused lesson.")
+
+def test_next_trial_resumes_after_valid_prefix(mock_components):
+    """ Tests that the Reflector's valid prefix seeds the next trial, stopping before the Finish step. """
+    actor, evaluator, reflector, memory = mock_components
+    good_step = {"action": "search", "observation": "ok"}
+    bad_step = {"action": "search", "observation": "wrong page"}
+    finish_step = {"action": "finish", "observation": "done"}
+    actor.run.side_effect = [
+        {"final_answer": "Bad", "trajectory": [good_step, bad_step, finish_step]},
+        {"final_answer": "Good", "trajectory": [good_step, finish_step]},
+    ]
+    evaluator.evaluate.side_effect = [
+        MockReport(EvaluationStatus.FAILURE, 1.0),
+        MockReport(EvaluationStatus.FULL_SUCCESS, 1.0),
+    ]
+    lesson = MagicMock(valid_prefix_steps=1)
+    reflector.reflect.return_value = lesson
+
+    ReflexionAgent(actor, evaluator, reflector, memory, max_trials=3).run("Task")
+
+    first_call, second_call = actor.run.call_args_list
+    assert "seed_trajectory" not in first_call.kwargs
+    assert second_call.kwargs["seed_trajectory"] == [good_step]
+
+    lesson.valid_prefix_steps = 5  # Clamped: the terminal step is never reused.
+    assert ReflexionAgent(actor, evaluator, reflector, memory)._reusable_prefix(
+        {"trajectory": [good_step, bad_step, finish_step]}, lesson) == [good_step, bad_step]
+
+class NonResumableActor(ScriptedActor):
+    """A streaming actor whose run_iter() has no seed_trajectory keyword."""
+    def run_iter(self, task, context=None):
+        self.steps_taken += 1
+        step = {"action": "search", "observation": "ok"}
+        yield AgentFinished(result={"status": "finished", "final_answer": self.answer, "trajectory": [step, step]})
+
+def test_actor_that_cannot_resume_restarts_from_scratch(mock_components):
+    """ Tests that a valid prefix is dropped, not passed as an unknown keyword, for actors without seed_trajectory. """
+    _, evaluator, reflector, memory = mock_components
+    evaluator.evaluate.side_effect = judge_by_answer
+    reflector.reflect.return_value = MagicMock(valid_prefix_steps=1)
+    actor = NonResumableActor("Bad")
+
+    result = ReflexionAgent(actor, evaluator, reflector, memory, max_trials=2).run("Task")
+
+    assert result["status"] == "failure_max_trials"
+    assert actor.steps_taken == 2
+
+def test_actor_prompt_size_stays_bounded_across_trials():
+    """
+    Regression: the memory context used to reach the actor as a str and was rendered one
+    bullet per character. Prompt growth across trials must stay within the lessons' own size.
+    """
+    prompt_sizes = []
+    llm = MagicMock()
+    def respond(messages):
+        prompt_sizes.append(len(messages[0]["content"]))
+        return {"content": "finish"}
+    llm.get_chat_completion.side_effect = respond
+    actor = ReactAgent(tools=[], llm_interface=llm, parser=lambda text: ("done", "finish", "answer"), max_steps=2)
+
+    evaluator = MagicMock()
+    evaluator.evaluate.return_value = MockReport(EvaluationStatus.FAILURE, 1.0)
+    heuristic = "Heuristic: Verify every figure against the primary source before finishing."
+    reflector = MagicMock()
+    reflector.reflect.side_effect = lambda *args: Reflection(
+        id="r", root_cause_analysis="n/a", actionable_heuristic=heuristic, confidence=0.9)
+
+    ReflexionAgent(actor, evaluator, reflector, SimpleMemory(max_size=3), max_trials=3).run("Task")
+
+    assert len(prompt_sizes) == 3
+    per_lesson = len(f"  • {heuristic}\n")
+    section_overhead = 200
+    assert prompt_sizes[1] - prompt_sizes[0] <= per_lesson + section_overhead
+    assert prompt_sizes[2] - prompt_sizes[1] <= per_lesson
+
+class CancellableActor(ScriptedActor):
+    """A slow actor that, like ReactAgent, checks its cancel_event before each (simulated) LLM call."""
+    def __init__(self):
+        super().__init__("Bad")
+        self.stopped = threading.Event()
+        self.cancelled = False
+
+    def run_iter(self, task, context=None, cancel_event=None):
+        try:
+            cancel_event.wait(timeout=2)
+            self.cancelled = cancel_event.is_set()
+            yield AgentFinished(result={"status": "cancelled", "final_answer": None, "trajectory": []})
+        finally:
+            self.stopped.set()
+
+def test_best_of_n_requires_actor_factory(mock_components):
+    actor, evaluator, reflector, memory = mock_components
+    with pytest.raises(ValueError):
+        ReflexionAgent(actor, evaluator, reflector, memory, parallel_attempts=2)
+
+def test_best_of_n_signals_running_losers_to_stop(mock_components):
+    """The winner's siblings receive the cancel event, so they stop before their next LLM call."""
+    _, evaluator, reflector, memory = mock_components
+    evaluator.evaluate.side_effect = judge_by_answer
+    loser = CancellableActor()
+    actors = iter([ScriptedActor("Good", steps=1, delay=0.05), loser])
+
+    agent = ReflexionAgent(ScriptedActor("unused"), evaluator, reflector, memory,
+                           parallel_attempts=2, actor_factory=lambda: next(actors))
+    result = agent.run("Task")
+
+    assert result["final_answer"] == "Good"
+    assert loser.stopped.wait(timeout=2)
+    assert loser.cancelled
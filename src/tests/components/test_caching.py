@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock
+
+from src.components import EvaluationReport, EvaluationStatus, Reflection
+from src.components.evaluators import CachingEvaluator
+from src.components.reflectors import CachingReflector
+from src.utils import BoundedCache
+
+def finished(answer):
+    return {"status": "finished", "final_answer": answer, "trajectory": [{"step": 1}]}
+
+def failure_report(reason="Wrong total."):
+    return EvaluationReport(status=EvaluationStatus.FAILURE, confidence=0.9, reason=reason)
+
+def test_bounded_cache_evicts_lru_and_expires(monkeypatch):
+    """ Tests LRU eviction order and TTL expiry. """
+    cache = BoundedCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+    now = __import__("time").time()
+    monkeypatch.setattr("src.utils.cache.time.time", lambda: now + 11)
+    assert cache.get("a") is None
+
+def test_repeated_answer_skips_the_judge(tmp_path):
+    """ Tests that a normalised repeat of the same answer is served from cache, and survives a save/load. """
+    judge = MagicMock()
+    judge.evaluate.return_value = failure_report()
+    path = str(tmp_path / "verdicts.json")
+    evaluator = CachingEvaluator(judge, path=path)
+
+    first = evaluator.evaluate("Sum 2 and 2", finished("The answer is 5."))
+    second = evaluator.evaluate("sum 2 and 2 ", finished("the answer is 5"))
+
+    assert judge.evaluate.call_count == 1
+    assert second.status == first.status and second.reason == first.reason
+    assert second.metadata["cached"] is True
+
+    evaluator.save()
+    reloaded = CachingEvaluator(judge, path=path)
+    reloaded.evaluate("Sum 2 and 2", finished("The answer is 5."))
+    assert judge.evaluate.call_count == 1
+
+def test_failed_evaluations_are_not_cached():
+    """ Tests that zero-confidence (errored) verdicts are retried. """
+    judge = MagicMock()
+    judge.evaluate.return_value = EvaluationReport(
+        status=EvaluationStatus.FAILURE, confidence=0.0, reason="API down", metadata={"error": "timeout"}
+    )
+    evaluator = CachingEvaluator(judge)
+
+    evaluator.evaluate("task", finished("answer"))
+    evaluator.evaluate("task", finished("answer"))
+
+    assert judge.evaluate.call_count == 2
+
+def test_cached_fused_report_gets_a_fresh_reflection_id():
+    """ Tests that replaying a judge-and-reflect report does not replay its reflection's id. """
+    judge = MagicMock()
+    report = failure_report()
+    report.reflection = Reflection(
+        id="ref_1", root_cause_analysis="Added wrong.", actionable_heuristic="Use the calculator.", confidence=0.9
+    )
+    judge.evaluate.return_value = report
+    evaluator = CachingEvaluator(judge)
+
+    first = evaluator.evaluate("Sum 2 and 2", finished("5"))
+    second = evaluator.evaluate("Sum 2 and 2", finished("5"))
+    third = evaluator.evaluate("Sum 2 and 2", finished("5"))
+
+    assert judge.evaluate.call_count == 1
+    assert second.reflection.actionable_heuristic == first.reflection.actionable_heuristic
+    assert len({first.reflection.id, second.reflection.id, third.reflection.id}) == 3
+    assert second.reflection is not third.reflection
+
+def test_same_failure_reuses_reflection_with_fresh_id():
+    """ Tests that the same (task, status, reason) reuses the lesson but not its id. """
+    inner = MagicMock()
+    inner.reflect.return_value = Reflection(
+        id="ref_1", root_cause_analysis="Added wrong.", actionable_heuristic="Use the calculator.", confidence=0.9
+    )
+    reflector = CachingReflector(inner)
+
+    first = reflector.reflect("Sum 2 and 2", finished("5"), failure_report())
+    second = reflector.reflect("Sum 2 and 2", finished("5"), failure_report())
+    other = reflector.reflect("Sum 2 and 2", finished("5"), failure_report("Answer is missing units."))
+
+    assert inner.reflect.call_count == 2
+    assert second.actionable_heuristic == first.actionable_heuristic
+    assert second.id != first.id
+    assert second.metadata["cached"] is True
+    assert "cached" not in other.metadata
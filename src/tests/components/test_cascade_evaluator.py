@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.components import EvaluationReport, EvaluationStatus
+from src.components.evaluators import CascadeEvaluator
+
+RESULT = {"status": "finished", "final_answer": "42", "trajectory": []}
+
+def judge(status, confidence, reason="verdict"):
+    evaluator = MagicMock()
+    evaluator.evaluate.return_value = EvaluationReport(status=status, confidence=confidence, reason=reason)
+    return evaluator
+
+@pytest.mark.parametrize("status, confidence", [
+    (EvaluationStatus.FULL_SUCCESS, 0.97),
+    (EvaluationStatus.FAILURE, 0.85),
+    (EvaluationStatus.PARTIAL_SUCCESS, 0.9),
+])
+def test_confident_cheap_verdicts_are_final(status, confidence):
+    """ Tests that clear-cut cheap verdicts never reach the strong judge. """
+    cheap, strong = judge(status, confidence), judge(EvaluationStatus.FAILURE, 1.0)
+
+    report = CascadeEvaluator(cheap, strong).evaluate("task", RESULT)
+
+    strong.evaluate.assert_not_called()
+    assert report.status == status
+    assert report.metadata["decided_by"] == "cheap"
+
+@pytest.mark.parametrize("status, confidence", [
+    (EvaluationStatus.FULL_SUCCESS, 0.9),
+    (EvaluationStatus.FAILURE, 0.6),
+])
+def test_uncertain_cheap_verdicts_escalate(status, confidence):
+    """ Tests escalation inside the uncertainty zone, with the cheap verdict kept in metadata. """
+    cheap, strong = judge(status, confidence), judge(EvaluationStatus.FULL_SUCCESS, 0.99, "strong says yes")
+
+    report = CascadeEvaluator(cheap, strong).evaluate("task", RESULT)
+
+    strong.evaluate.assert_called_once()
+    assert report.reason == "strong says yes"
+    assert report.metadata["decided_by"] == "strong"
+    assert report.metadata["cheap_status"] == status.value
+    assert report.metadata["cheap_confidence"] == confidence
+
+def test_strong_judge_error_falls_back_to_cheap_verdict():
+    """ Tests that a failed strong call does not discard the cheap verdict. """
+    cheap = judge(EvaluationStatus.FAILURE, 0.6)
+    strong = judge(EvaluationStatus.FAILURE, 0.0, "Evaluation process failed")
+
+    report = CascadeEvaluator(cheap, strong).evaluate("task", RESULT)
+
+    assert report.confidence == 0.6
+    assert report.metadata["decided_by"] == "cheap"
+    assert "strong_error" in report.metadata
@@ -0,0 +1,88 @@
+import json
+import threading
+import uuid
+from unittest.mock import MagicMock
+
+from src.components import Reflection
+from src.components.memory import ConsolidatingMemory
+
+def lesson(heuristic, confidence=0.9):
+    return Reflection(id=str(uuid.uuid4()), root_cause_analysis="n/a", actionable_heuristic=heuristic,
+                      confidence=confidence)
+
+def test_near_duplicates_are_merged_on_add():
+    """ Tests that a reworded lesson merges into the stored one, keeping the more confident wording. """
+    memory = ConsolidatingMemory()
+    first = lesson("Always verify the ticker symbol before calling the stock tool.", 0.8)
+    memory.add(first)
+    memory.add(lesson("Always verify the ticker symbol before calling the stock tool!", 0.95))
+
+    stored = memory.get_all()
+    assert len(stored) == 1
+    assert stored[0].confidence == 0.95
+    assert first.id in stored[0].metadata["merged_ids"]
+
+def test_consolidates_instead_of_fifo_when_full():
+    """ Tests that overflow merges overlapping lessons, so the oldest distinct lesson survives. """
+    memory = ConsolidatingMemory(max_size=2, similarity_threshold=0.99, token_budget=10_000)
+    memory.add(lesson("Use the calculator for every arithmetic step."))
+    memory.add(lesson("Browse the official site before answering population questions."))
+    memory.add(lesson("Browse the official site before answering population questions, not snippets."))
+
+    heuristics = [r.actionable_heuristic for r in memory.get_all()]
+    assert len(heuristics) == 2
+    assert "Use the calculator for every arithmetic step." in heuristics
+
+def test_rendered_context_respects_token_budget_and_is_cached():
+    """ Tests the token budget and that the rendered string is reused until memory changes. """
+    memory = ConsolidatingMemory(max_size=10, token_budget=60)
+    for topic in ["stock tickers", "population figures", "unit conversions", "weather reports"]:
+        memory.add(lesson(f"Double-check {topic} against a primary source before finishing."))
+
+    context = memory.get_context()
+    assert (len(context.render()) + 3) // 4 <= 60
+    assert memory.get_context() is context
+    memory.add(lesson("Quote the headline verbatim."))
+    assert memory.get_context() is not context
+
+def test_llm_merge_runs_in_background_and_applies():
+    """ Tests that add() does not wait for the LLM, and the merge result replaces the lessons. """
+    release = threading.Event()
+    llm = MagicMock()
+    def slow_merge(messages, json_mode):
+        release.wait(5)
+        return {"content": json.dumps({"heuristics": ["Verify every figure against a primary source."]})}
+    llm.get_chat_completion.side_effect = slow_merge
+
+    memory = ConsolidatingMemory(max_size=1, merge_threshold=1.1, llm_interface=llm)
+    memory.add(lesson("Check stock prices on the exchange site."))
+    memory.add(lesson("Check population figures on the census site."))
+    assert len(memory.get_all()) == 1  # Local consolidation already applied; the LLM is still running.
+
+    release.set()
+    memory.wait_for_consolidation(timeout=5)
+    assert [r.actionable_heuristic for r in memory.get_all()] == ["Verify every figure against a primary source."]
+
+def test_merge_keeps_new_information_from_both_lessons():
+    """ Tests that merging appends the other lesson's novel sentence instead of dropping it. """
+    memory = ConsolidatingMemory(max_size=1, merge_threshold=0.0, token_budget=200)
+    memory.add(lesson("Check stock prices on the exchange site.", 0.9))
+    memory.add(lesson("Check stock prices on the exchange site. Convert currencies with the calculator.", 0.7))
+
+    [merged] = memory.get_all()
+    assert merged.actionable_heuristic == \
+        "Check stock prices on the exchange site. Convert currencies with the calculator."
+
+def test_llm_merge_over_token_budget_is_discarded():
+    """ Tests that an LLM consolidation that would not fit the budget leaves the local merge in place. """
+    llm = MagicMock()
+    llm.get_chat_completion.return_value = {"content": json.dumps({"heuristics": ["Verify every figure. " * 40]})}
+
+    memory = ConsolidatingMemory(max_size=1, merge_threshold=1.1, token_budget=60, llm_interface=llm)
+    memory.add(lesson("Check stock prices on the exchange site."))
+    memory.add(lesson("Check population figures on the census site."))
+    memory.wait_for_consolidation(timeout=5)
+
+    heuristics = [r.actionable_heuristic for r in memory.get_all()]
+    assert len(heuristics) == 1
+    assert "Verify every figure." not in heuristics[0]
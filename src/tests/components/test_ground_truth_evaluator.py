@@ -0,0 +1,120 @@
+import re
+from unittest.mock import MagicMock
+
+from src.components import EvaluationReport, EvaluationStatus
+from src.components.evaluators import GroundTruthEvaluator
+from src.components.evaluators.ground_truth_evaluator import extract_quantities
+
+def finished(answer):
+    return {"status": "finished", "final_answer": answer, "trajectory": []}
+
+def test_extract_quantities_handles_units_scales_and_separators():
+    """ Tests that currency, thousands separators, scale words and units are normalized. """
+    assert extract_quantities("$1,250.50") == [(1250.5, "usd")]
+    assert extract_quantities("about 1.5 million euros") == [(1_500_000.0, "eur")]
+    assert extract_quantities("42 KM away") == [(42.0, "km")]
+    assert extract_quantities("15%") == [(15.0, "%")]
+
+def test_numeric_answer_within_tolerance_succeeds():
+    """ Tests the '15% of 200' case: a confident success with no fallback call. """
+    fallback = MagicMock()
+    evaluator = GroundTruthEvaluator({"What's 15% of 200?": 30}, fallback=fallback)
+
+    report = evaluator.evaluate("what's 15% of 200?", finished("15% of 200 is 30.0."))
+
+    assert report.status == EvaluationStatus.FULL_SUCCESS
+    assert report.confidence == 1.0
+    assert report.metadata["decided_by"] == "ground_truth"
+    fallback.evaluate.assert_not_called()
+
+def test_numbers_echoing_the_task_are_ignored():
+    """ Tests that '15% of 200 is 31' is not accepted just because it mentions 200. """
+    evaluator = GroundTruthEvaluator({"What is 15% of 200?": "31"})
+
+    report = evaluator.evaluate("What is 15% of 200?", finished("15% of 200 is 30."))
+
+    assert report.status == EvaluationStatus.FAILURE
+    assert report.confidence >= 0.8
+
+def test_unit_mismatch_is_left_undecided():
+    """ Tests that a matching number with an incompatible unit neither passes nor fails confidently. """
+    evaluator = GroundTruthEvaluator({"distance?": "42 km"})
+
+    assert evaluator.evaluate("distance?", finished("It is 42 km.")).status == EvaluationStatus.FULL_SUCCESS
+    report = evaluator.evaluate("distance?", finished("It is 42 kg."))
+    assert report.status == EvaluationStatus.FAILURE
+    assert report.metadata.get("undecided") is True
+    assert report.confidence < 0.8
+
+def test_single_letter_scales():
+    """ Tests that "1.5M" and "$2B" are scaled rather than read as metres or ignored. """
+    assert extract_quantities("1.5M") == [(1_500_000.0, None)]
+    assert extract_quantities("$2B") == [(2e9, "usd")]
+    assert extract_quantities("3t") == [(3e12, None)]
+    assert extract_quantities("42m") == [(42.0, "m")]
+
+    evaluator = GroundTruthEvaluator({"revenue?": "1,500,000", "cap?": "$2 billion"})
+    assert evaluator.evaluate("revenue?", finished("About 1.5M.")).status == EvaluationStatus.FULL_SUCCESS
+    assert evaluator.evaluate("cap?", finished("$2B")).status == EvaluationStatus.FULL_SUCCESS
+
+def test_scale_mismatch_defers_to_fallback():
+    """ Tests that an answer off by exactly a scale factor goes to the judge instead of failing. """
+    fallback = MagicMock()
+    fallback.evaluate.return_value = EvaluationReport(EvaluationStatus.FULL_SUCCESS, 0.97, "Judge says yes.")
+    evaluator = GroundTruthEvaluator({"revenue in millions?": "1500"}, fallback=fallback)
+
+    report = evaluator.evaluate("revenue in millions?", finished("1.5 billion"))
+
+    assert report.metadata["decided_by"] == "fallback"
+
+def test_several_different_numbers_are_ambiguous():
+    """ Tests that hedging over candidates is not a confident success, while restating one value still is. """
+    evaluator = GroundTruthEvaluator({"answer?": 42})
+
+    report = evaluator.evaluate("answer?", finished("It's 12, 42 or 97."))
+    assert report.status == EvaluationStatus.FAILURE
+    assert report.metadata.get("undecided") is True
+    assert report.confidence < 0.8
+
+    assert evaluator.evaluate("answer?", finished("42 (that is, 42.0).")).status == EvaluationStatus.FULL_SUCCESS
+
+def test_reports_do_not_reveal_the_expected_answer():
+    """ Tests that nothing the reflector sees quotes the ground truth. """
+    evaluator = GroundTruthEvaluator({"answer?": 4217, "version?": re.compile(r"3\.12")})
+
+    for task, answer in [("answer?", "It is 9999."), ("version?", "3.11"), ("answer?", "It is 1, 2 or 3.")]:
+        report = evaluator.evaluate(task, finished(answer))
+        assert report.status == EvaluationStatus.FAILURE
+        seen = report.reason + repr(report.metadata)
+        assert "4217" not in seen and "3\\.12" not in seen and "3.12" not in seen
+
+def test_text_and_regex_matching():
+    """ Tests case/whitespace-insensitive text matching and regex expectations. """
+    evaluator = GroundTruthEvaluator({
+        "capital of France?": "paris",
+        "python version?": re.compile(r"3\.12(\.\d+)?"),
+    })
+
+    assert evaluator.evaluate("capital of France?", finished("The capital is  PARIS.")).status == EvaluationStatus.FULL_SUCCESS
+    assert evaluator.evaluate("python version?", finished("Python 3.12.1 is out")).status == EvaluationStatus.FULL_SUCCESS
+    assert evaluator.evaluate("python version?", finished("Python 3.11 is out")).status == EvaluationStatus.FAILURE
+
+def test_falls_back_only_when_undecided():
+    """ Tests that a paraphrased text answer or an unknown task is delegated to the fallback. """
+    fallback = MagicMock()
+    fallback.evaluate.return_value = EvaluationReport(EvaluationStatus.FULL_SUCCESS, 0.97, "Judge says yes.")
+    evaluator = GroundTruthEvaluator({"capital of France?": "Paris"}, fallback=fallback)
+
+    report = evaluator.evaluate("capital of France?", finished("It's the City of Light."))
+    assert report.metadata["decided_by"] == "fallback"
+    assert report.confidence == 0.97
+
+    evaluator.evaluate("unknown task", finished("anything"))
+    assert fallback.evaluate.call_count == 2
+
+def test_actor_failure_is_a_confident_failure():
+    """ Tests the fast-failure pre-check. """
+    evaluator = GroundTruthEvaluator({"task": 1})
+    report = evaluator.evaluate("task", {"status": "max_steps_reached", "final_answer": None})
+    assert report.status == EvaluationStatus.FAILURE
+    assert report.confidence == 1.0
@@ -0,0 +1,58 @@
+import json
+from unittest.mock import MagicMock
+
+from src.components import EvaluationStatus
+from src.components.evaluators import LLMJudgeReflector
+
+RESULT = {
+    "status": "finished",
+    "final_answer": "Paris has 10 million people.",
+    "trajectory": [{"thought": "search", "action": "Search", "action_input": "Paris population", "observation": "2.1M"}],
+}
+
+def fused_llm(payload):
+    llm = MagicMock()
+    llm.get_chat_completion.return_value = {"content": json.dumps(payload)}
+    return llm
+
+def test_failed_verdict_carries_reflection_in_one_call():
+    """ Tests that one call yields both the report and the reflection, and reflect() reuses it. """
+    llm = fused_llm({
+        "status": "FAILURE", "reason": "Wrong figure.", "confidence": 0.9, "metadata": {},
+        "reflection": {"root_cause_analysis": "Ignored the observation.",
+                       "actionable_heuristic": "Quote numbers from observations.", "confidence": 0.85},
+    })
+    judge = LLMJudgeReflector(llm)
+
+    report = judge.evaluate("Population of Paris?", RESULT)
+    reflection = judge.reflect("Population of Paris?", RESULT, report)
+
+    assert report.status == EvaluationStatus.FAILURE
+    assert "reflection" not in report.metadata
+    assert reflection is report.reflection
+    assert reflection.actionable_heuristic == "Quote numbers from observations."
+    assert llm.get_chat_completion.call_count == 1
+
+def test_success_has_no_reflection():
+    """ Tests that a FULL_SUCCESS never carries a reflection. """
+    llm = fused_llm({"status": "FULL_SUCCESS", "reason": "Correct.", "confidence": 0.99, "reflection": None})
+
+    report = LLMJudgeReflector(llm).evaluate("Population of Paris?", RESULT)
+
+    assert report.status == EvaluationStatus.FULL_SUCCESS
+    assert report.reflection is None
+
+def test_invalid_reflection_falls_back_to_separate_call():
+    """ Tests that a malformed fused reflection triggers a regular Reflector call. """
+    llm = fused_llm({"status": "FAILURE", "reason": "Wrong.", "confidence": 0.9, "reflection": {"confidence": 0.9}})
+    judge = LLMJudgeReflector(llm)
+    report = judge.evaluate("Population of Paris?", RESULT)
+    assert report.reflection is None
+
+    llm.get_chat_completion.return_value = {"content": json.dumps(
+        {"root_cause_analysis": "x", "actionable_heuristic": "Check the source.", "confidence": 0.8}
+    )}
+    reflection = judge.reflect("Population of Paris?", RESULT, report)
+
+    assert reflection.actionable_heuristic == "Check the source."
+    assert llm.get_chat_completion.call_count == 2
@@ -0,0 +1,28 @@
+import json
+from unittest.mock import MagicMock
+
+from src.components import EvaluationReport, EvaluationStatus
+from src.components.reflectors import LLMReflector
+
+RESULT = {
+    "status": "finished",
+    "final_answer": "Paris has 10 million people.",
+    "trajectory": [{"thought": "search", "action": "Search", "action_input": "Paris population", "observation": "2.1M"}],
+}
+
+def reflector_llm(payload):
+    llm = MagicMock()
+    llm.get_chat_completion.return_value = {"content": json.dumps(payload)}
+    return llm
+
+def test_reflector_parses_and_clamps_valid_prefix():
+    """ Tests that valid_prefix_steps is parsed out of metadata and clamped to the trajectory length. """
+    llm = reflector_llm({"root_cause_analysis": "x", "actionable_heuristic": "y", "confidence": 0.9,
+                         "valid_prefix_steps": 7})
+
+    report = EvaluationReport(status=EvaluationStatus.FAILURE, confidence=0.9, reason="Wrong figure.")
+
+    reflection = LLMReflector(llm).reflect("Population of Paris?", RESULT, report)
+
+    assert reflection.valid_prefix_steps == len(RESULT["trajectory"])
+    assert "valid_prefix_steps" not in reflection.metadata
@@ -0,0 +1,96 @@
+import uuid
+
+from src.components import Reflection
+from src.components.memory import PersistentMemory
+
+def lesson(heuristic, confidence=0.9):
+    return Reflection(id=str(uuid.uuid4()), actionable_heuristic=heuristic, root_cause_analysis="n/a", confidence=confidence)
+
+def test_lessons_are_retrieved_for_similar_tasks_across_instances(tmp_path):
+    """ Tests that a lesson learned on one task is preloaded for a similar task by a new instance. """
+    memory = PersistentMemory(path=str(tmp_path))
+    memory.start_task("What is the current stock price of Apple?")
+    memory.add(lesson("Use the stock price tool with the ticker symbol, not the company name."))
+    memory.start_task("Write a haiku about autumn leaves.")
+    memory.add(lesson("Count syllables per line before finishing."))
+    memory.close()
+
+    reopened = PersistentMemory(path=str(tmp_path), top_k=1)
+    reopened.start_task("What is the current stock price of Microsoft?")
+
+    assert len(reopened) == 2
+    assert [r.actionable_heuristic for r in reopened.get_all()] == \
+        ["Use the stock price tool with the ticker symbol, not the company name."]
+    assert "ticker symbol" in reopened.get_context().render()
+
+def test_unrelated_task_gets_no_lessons(tmp_path):
+    """ Tests that nothing is preloaded when no stored task is similar enough. """
+    memory = PersistentMemory(path=str(tmp_path))
+    memory.start_task("What is the current stock price of Apple?")
+    memory.add(lesson("Use the ticker symbol."))
+
+    memory.start_task("zzz qqq")
+
+    assert memory.get_all() == []
+    assert not memory.get_context()
+
+def test_near_duplicate_lessons_are_merged(tmp_path):
+    """ Tests that a near-identical heuristic does not create a second entry. """
+    memory = PersistentMemory(path=str(tmp_path))
+    memory.start_task("task")
+    memory.add(lesson("Always verify the ticker symbol before calling the stock tool."))
+    memory.add(lesson("Always verify the ticker symbol before calling the stock tool!"))
+    memory.add(lesson("too unsure to keep", confidence=0.1))
+
+    assert len(memory) == 1
+    assert len(memory.get_all()) == 1
+
+def test_least_useful_entry_is_evicted_when_full(tmp_path):
+    """ Tests that eviction keeps lessons that helped tasks succeed. """
+    memory = PersistentMemory(path=str(tmp_path), max_entries=2, top_k=1)
+    memory.start_task("search the web for the population of France")
+    memory.add(lesson("Prefer official statistics sites for population figures."))
+    memory.start_task("convert 100 miles to kilometres")
+    memory.add(lesson("Use the calculator for unit conversions instead of mental math."))
+
+    # Each lesson is retrieved for a similar task; only the first one helped
+    memory.start_task("search the web for the population of France")
+    memory.record_outcome(success=True)
+    memory.start_task("convert 100 miles to kilometres")
+    memory.record_outcome(success=False)
+
+    memory.start_task("summarise a news article")
+    memory.add(lesson("Quote the headline verbatim in the summary."))
+
+    stored = [r.actionable_heuristic for r in memory.search("population of France", 5)] + \
+             [r.actionable_heuristic for r in memory.search("summarise a news article", 5)]
+    assert len(memory) == 2
+    assert "Prefer official statistics sites for population figures." in stored
+    assert "Use the calculator for unit conversions instead of mental math." not in stored
+
+def test_only_retrieved_lessons_are_credited(tmp_path):
+    """ Tests that a lesson written during a task gets no credit for that task's outcome. """
+    memory = PersistentMemory(path=str(tmp_path), top_k=1)
+    memory.start_task("what is the population of France")
+    memory.add(lesson("Prefer official statistics sites for population figures."))
+    memory.record_outcome(success=True)
+
+    memory.start_task("what is the population of France")
+    memory.record_outcome(success=True)
+
+    assert memory._db.execute("SELECT uses, successes FROM reflections").fetchall() == [(1, 1)]
+
+def test_lowering_max_entries_keeps_stored_rows(tmp_path):
+    """ Tests that reopening with a smaller capacity does not delete rows from disk. """
+    memory = PersistentMemory(path=str(tmp_path), max_entries=3)
+    memory.start_task("task")
+    for heuristic in ["Check the ticker symbol.", "Quote the headline verbatim.", "Convert units with the calculator."]:
+        memory.add(lesson(heuristic))
+    memory.close()
+
+    smaller = PersistentMemory(path=str(tmp_path), max_entries=2)
+    assert len(smaller) == 2
+    smaller.close()
+
+    restored = PersistentMemory(path=str(tmp_path), max_entries=3)
+    assert len(restored) == 3
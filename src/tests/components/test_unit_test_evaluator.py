@@ -0,0 +1,77 @@
+import os
+import pytest
+
+from src.components import EvaluationStatus
+from src.components.evaluators import SandboxPool, UnitTestEvaluator
+from src.components.evaluators.unit_test_evaluator import extract_code
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="SandboxPool requires os.fork()")
+
+IS_PRIME_BUGGY = '''Here is my solution:
+```python
+def is_prime(n):
+    if n < 2:
+        return False
+    return n % 2 == 1 or n == 2
+```
+'''
+
+@pytest.fixture(scope="module")
+def pool():
+    with SandboxPool(size=2, timeout=2.0, memory_mb=256) as pool:
+        yield pool
+
+def finished(answer):
+    return {"status": "finished", "final_answer": answer, "trajectory": []}
+
+def test_extract_code_prefers_fenced_blocks():
+    """ Tests that prose around a fenced block is dropped. """
+    assert extract_code(IS_PRIME_BUGGY).startswith("def is_prime(n):")
+    assert extract_code("x = 1") == "x = 1"
+
+def test_per_test_results_feed_the_report(pool):
+    """ Tests that a partially correct solution yields PARTIAL_SUCCESS with per-test metadata. """
+    evaluator = UnitTestEvaluator({"Write is_prime": {
+        "test_prime_2": "assert is_prime(2)",
+        "test_prime_7": "assert is_prime(7)",
+        "test_prime_9": "assert not is_prime(9)",
+    }}, pool=pool)
+
+    report = evaluator.evaluate("Write is_prime", finished(IS_PRIME_BUGGY))
+
+    assert report.status == EvaluationStatus.PARTIAL_SUCCESS
+    assert report.confidence == 1.0
+    assert report.metadata["tests_passed"] == 2
+    assert report.metadata["failed_test"] == "test_prime_9"
+    assert report.metadata["test_results"]["test_prime_9"]["passed"] is False
+    assert "AssertionError" in report.metadata["test_results"]["test_prime_9"]["error"]
+
+def test_all_tests_pass(pool):
+    """ Tests the FULL_SUCCESS path with list-style tests. """
+    evaluator = UnitTestEvaluator({"add": ["assert add(1, 2) == 3", "assert add(-1, 1) == 0"]}, pool=pool)
+
+    report = evaluator.evaluate("add", finished("def add(a, b):\n    return a + b"))
+
+    assert report.status == EvaluationStatus.FULL_SUCCESS
+    assert report.metadata["tests_passed"] == 2
+
+def test_infinite_loop_is_killed_and_pool_survives(pool):
+    """ Tests the wall-clock limit, and that the worker is reusable afterwards. """
+    result = pool.run_test("while True:\n    pass", "assert True")
+    assert result["passed"] is False
+    assert result["error"].startswith(("Timeout", "Crashed"))
+
+    assert pool.run_test("x = 2", "assert x == 2")["passed"] is True
+
+def test_jobs_do_not_share_state(pool):
+    """ Tests that globals mutated by one job are not visible to the next. """
+    pool.run_test("import math\nmath.pi = 3", "assert True")
+    assert pool.run_test("import math", "assert math.pi > 3.14")["passed"] is True
+
+def test_jobs_cannot_see_the_agent_environment_or_directory(monkeypatch):
+    """ Tests that secrets in the agent's environment and its working directory are not exposed. """
+    monkeypatch.setenv("SANDBOX_SENTINEL_KEY", "secret")
+    with SandboxPool(size=1, timeout=2.0) as fresh_pool:
+        result = fresh_pool.run_test("import os", "assert 'SANDBOX_SENTINEL_KEY' not in os.environ")
+        assert result["passed"] is True, result["error"]
+        assert fresh_pool.run_test("import os", f"assert os.getcwd() != {os.getcwd()!r}")["passed"] is True
@@ -0,0 +1,23 @@
+import httpx
+import pytest
+
+from src.tools.http_client import HttpClient, set_http_client
+from src.tools.page_cache import set_page_cache
+
+@pytest.fixture
+def serve():
+    """
+    Installs a shared HttpClient backed by httpx.MockTransport.
+    Call it with a request handler; it returns the list of requests seen.
+    """
+    seen = []
+    def install(handler):
+        def recording_handler(request):
+            seen.append(request)
+            return handler(request)
+        set_http_client(HttpClient(transport=httpx.MockTransport(recording_handler)))
+        set_page_cache(None)  # Pages cached under a previous handler must not leak in
+        return seen
+    yield install
+    set_http_client(None)
+    set_page_cache(None)
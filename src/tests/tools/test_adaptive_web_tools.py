@@ -0,0 +1,132 @@
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.tools.adaptive_web_tools import (
+    adaptive_browse_function, looks_like_js_shell, DomainTierCache, get_domain_tiers, set_domain_tiers,
+    STATIC, DYNAMIC, TIER_CACHE_ENV_VAR
+)
+from src.tools.browser_pool import RenderedPage, set_browser_pool
+
+ARTICLE = "<html><body><main>" + "<p>Mars has two small moons, Phobos and Deimos.</p>" * 20 + "</main></body></html>"
+REACT_SHELL = '<html><body><noscript>You need to enable JavaScript to run this app.</noscript><div id="root"></div><script src="/main.js"></script></body></html>'
+
+RENDERED = "Rendered: the launch is on 12 March from pad 39A, weather permitting."
+
+class RecordingPool:
+    def __init__(self, text_blocks=(RENDERED,)):
+        self.urls = []
+        self.text_blocks = list(text_blocks)
+
+    def render(self, url, wait_for=None):
+        self.urls.append(url)
+        return RenderedPage(url=url, status=200, html="", text_blocks=self.text_blocks)
+
+@pytest.fixture
+def browser(tmp_path):
+    pool = RecordingPool()
+    set_browser_pool(pool)
+    set_domain_tiers(DomainTierCache(path=str(tmp_path / "tiers.json")))
+    yield pool
+    set_browser_pool(None)
+    set_domain_tiers(None)
+
+def ask(url, question="What is it?"):
+    return adaptive_browse_function(json.dumps({"url": url, "question": question}))
+
+def test_js_shell_detection():
+    assert looks_like_js_shell(REACT_SHELL.encode(), ["You need to enable JavaScript to run this app."])
+    assert not looks_like_js_shell(ARTICLE.encode(), ["Mars has two small moons, Phobos and Deimos."] * 20)
+    # A framework marker alone does not make a server-rendered page a shell
+    ssr = b'<div id="app"></div>' + ARTICLE.encode()
+    assert not looks_like_js_shell(ssr, ["Mars has two small moons, Phobos and Deimos. " * 30])
+    # Short responses are only shells when they are HTML with a marker
+    assert not looks_like_js_shell(b"<html><body><p>Gone fishing.</p></body></html>", ["Gone fishing."])
+    assert not looks_like_js_shell(b'{"id": "root"}', ['{"id": "root"}'], "application/json")
+    assert not looks_like_js_shell(REACT_SHELL.encode(), ["You need to enable JavaScript."], "text/plain")
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_static_page_is_answered_without_browser(mock_groq, browser, serve):
+    serve(lambda request: httpx.Response(200, html=ARTICLE))
+    mock_groq.return_value.get_chat_completion.return_value = {"content": "Phobos and Deimos"}
+
+    assert ask("https://www.mars.test/moons") == "Phobos and Deimos"
+    assert browser.urls == []
+    assert mock_groq.call_args.kwargs["model"] == "llama-3.1-8b-instant"
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_js_shell_escalates_and_domain_is_remembered(mock_groq, browser, serve, tmp_path):
+    """ Tests escalation from a JS shell, and that the next call to the domain skips the static fetch. """
+    requests_seen = serve(lambda request: httpx.Response(200, html=REACT_SHELL))
+    mock_groq.return_value.get_chat_completion.return_value = {"content": "12 March"}
+
+    assert ask("https://app.test/launch") == "12 March"
+    assert browser.urls == ["https://app.test/launch"]
+    assert RENDERED in mock_groq.return_value.get_chat_completion.call_args[0][0][0]["content"]
+    assert len(requests_seen) == 1
+
+    ask("https://www.app.test/other")
+    assert len(requests_seen) == 1  # No static attempt for a known-dynamic domain
+    assert browser.urls[-1] == "https://www.app.test/other"
+
+    # The record is persisted
+    assert DomainTierCache(path=str(tmp_path / "tiers.json")).get("https://app.test/") == DYNAMIC
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_short_plain_responses_are_not_escalated(mock_groq, browser, serve):
+    mock_groq.return_value.get_chat_completion.return_value = {"content": "ok"}
+
+    serve(lambda request: httpx.Response(200, json={"status": "ok"}))
+    assert ask("https://api.test/health") == "ok"
+    serve(lambda request: httpx.Response(200, html="<html><body><p>Gone fishing.</p></body></html>"))
+    assert ask("https://tiny.test/") == "ok"
+
+    assert browser.urls == []
+    assert get_domain_tiers().get("https://api.test/") == STATIC
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_domain_not_marked_dynamic_when_browser_finds_no_more_text(mock_groq, browser, serve):
+    serve(lambda request: httpx.Response(200, html=REACT_SHELL))
+    mock_groq.return_value.get_chat_completion.return_value = {"content": "unknown"}
+    browser.text_blocks = ["Loading..."]
+
+    assert ask("https://app.test/launch") == "unknown"
+    assert browser.urls == ["https://app.test/launch"]
+    assert "You need to enable JavaScript" in mock_groq.return_value.get_chat_completion.call_args[0][0][0]["content"]
+    assert get_domain_tiers().get("https://app.test/") is None
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_bot_block_escalates_but_other_errors_do_not(mock_groq, browser, serve):
+    mock_groq.return_value.get_chat_completion.return_value = {"content": "12 March"}
+
+    serve(lambda request: httpx.Response(403, text="Forbidden"))
+    assert ask("https://blocked.test") == "12 March"
+    assert browser.urls == ["https://blocked.test"]
+
+    serve(lambda request: httpx.Response(404, text="Not Found"))
+    assert ask("https://missing.test").startswith("Error: Could not fetch content")
+
+    serve(lambda request: httpx.Response(200, content=b"%PDF-1.7", headers={"Content-Type": "application/pdf"}))
+    assert ask("https://docs.test/a.pdf").startswith("Error: Could not read URL")
+    assert browser.urls == ["https://blocked.test"]
+
+def test_domain_tier_cache_records_by_domain(tmp_path):
+    tiers = DomainTierCache(path=str(tmp_path / "tiers.json"))
+    tiers.record("https://www.example.com/a", STATIC)
+
+    assert tiers.get("http://example.com/b") == STATIC
+    assert tiers.get("https://other.com") is None
+
+def test_tier_cache_is_in_memory_unless_configured(tmp_path, monkeypatch):
+    set_domain_tiers(None)
+    monkeypatch.delenv(TIER_CACHE_ENV_VAR, raising=False)
+    assert DomainTierCache().path is None
+    assert get_domain_tiers().path is None
+
+    set_domain_tiers(None)
+    monkeypatch.setenv(TIER_CACHE_ENV_VAR, str(tmp_path / "tiers.json"))
+    get_domain_tiers().record("https://example.com", DYNAMIC)
+    assert DomainTierCache(path=str(tmp_path / "tiers.json")).get("https://example.com") == DYNAMIC
+    set_domain_tiers(None)
@@ -0,0 +1,52 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.tools.advanced_web_tools import dynamic_web_reader_function
+from src.tools.browser_pool import RenderedPage, set_browser_pool
+
+FILLER = "Subscribe to our newsletter for the latest product updates and offers."
+
+class StaticPool:
+    """ Stands in for the shared BrowserPool, returning one pre-rendered page. """
+    def __init__(self, page):
+        self.page = page
+
+    def render(self, url, wait_for=None):
+        return self.page
+
+@pytest.fixture
+def rendered():
+    def install(page):
+        set_browser_pool(StaticPool(page))
+    yield install
+    set_browser_pool(None)
+
+@patch('src.tools.advanced_web_tools.GroqInterface')
+def test_dynamic_reader_sends_ranked_text_not_html(mock_groq, rendered):
+    """ Tests that the extractor gets rendered text passages relevant to the question, with no markup. """
+    blocks = ["Pricing"] + [FILLER] * 200 + ["The Pro plan costs $49 per month."]
+    rendered(RenderedPage(url="http://app.test", status=200, html="<html><script>app()</script></html>", text_blocks=blocks))
+    mock_groq.return_value.get_chat_completion.return_value = {"content": "$49 per month"}
+
+    result = dynamic_web_reader_function(json.dumps({"url": "http://app.test", "question": "How much is the Pro plan?"}))
+
+    assert result == "$49 per month"
+    prompt = mock_groq.return_value.get_chat_completion.call_args[0][0][0]["content"]
+    assert "The Pro plan costs $49 per month." in prompt
+    assert "<script>" not in prompt
+    assert len(prompt) < 20000
+
+@patch('src.tools.advanced_web_tools.GroqInterface')
+def test_dynamic_reader_falls_back_to_html_text(mock_groq, rendered):
+    """ Tests that the rendered HTML is parsed when the in-page text extraction returned nothing. """
+    html = "<html><body><nav>Menu</nav><main><p>Launch date: 12 March.</p></main></body></html>"
+    rendered(RenderedPage(url="http://app.test", status=200, html=html, text_blocks=[]))
+    mock_groq.return_value.get_chat_completion.return_value = {"content": "12 March"}
+
+    dynamic_web_reader_function(json.dumps({"url": "http://app.test", "question": "When is the launch date?"}))
+
+    prompt = mock_groq.return_value.get_chat_completion.call_args[0][0][0]["content"]
+    assert "Launch date: 12 March." in prompt
+    assert "Menu" not in prompt
@@ -0,0 +1,121 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tools.analytics_tools import align_closes, compute_metrics, history_period, stock_analytics_function
+from src.tools.market_data import MarketDataEngine, PriceHistory, set_market_data_engine
+
+DATES = [str(d) for d in np.arange("2024-12-30", "2025-01-10", dtype="datetime64[D]")]  # 11 days
+
+@pytest.fixture
+def fixture_engine(tmp_path):
+    """ An offline engine with a steadily rising UP and an UP-then-DOWN ticker. """
+    up = [100.0 + i for i in range(11)]
+    dip = [100.0, 110.0, 120.0, 90.0, 60.0, 80.0, 90.0, 100.0, 95.0, 105.0, 110.0]
+    path = tmp_path / "market.json"
+    path.write_text(json.dumps({"history": {
+        "UP": {"dates": DATES, "close": up},
+        "DIP": {"dates": DATES, "close": dip},
+    }}))
+    set_market_data_engine(MarketDataEngine(fixture_path=str(path)))
+    yield
+    set_market_data_engine(None)
+
+def history(ticker, dates, closes):
+    return PriceHistory(ticker, np.array(dates, dtype="datetime64[D]"), np.array(closes, dtype=np.float32), 0.0, False)
+
+def test_align_closes_forward_fills_gaps_but_not_before_start():
+    dates, closes = align_closes([
+        history("A", ["2025-01-01", "2025-01-02", "2025-01-03"], [1, 2, 3]),
+        history("B", ["2025-01-02", "2025-01-04"], [10, 20]),
+    ])
+    assert [str(d) for d in dates] == ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"]
+    np.testing.assert_array_equal(closes[:, 0], [1, 2, 3, 3])
+    assert np.isnan(closes[0, 1])
+    np.testing.assert_array_equal(closes[1:, 1], [10, 10, 20])
+
+def test_compute_metrics_vectorised_over_tickers():
+    dates = np.arange("2024-12-30", "2025-01-10", dtype="datetime64[D]")
+    closes = np.stack([100.0 + np.arange(11), np.linspace(100, 50, 11)], axis=1)
+
+    results = compute_metrics(dates, closes, ["price", "return", "ytd", "sma_3", "return_2d", "max_drawdown", "volatility"])
+
+    np.testing.assert_allclose(results["price"], [110, 50])
+    np.testing.assert_allclose(results["return"], [0.10, -0.5])
+    # The YTD base is the last close of 2024 (2024-12-31)
+    np.testing.assert_allclose(results["ytd"], [110 / 101 - 1, 50 / 95 - 1])
+    np.testing.assert_allclose(results["sma_3"], [109, 55])
+    np.testing.assert_allclose(results["return_2d"], [110 / 108 - 1, 50 / 60 - 1])
+    np.testing.assert_allclose(results["max_drawdown"], [0, -0.5])
+    assert results["volatility"][0] < results["volatility"][1]
+
+    with pytest.raises(ValueError):
+        compute_metrics(dates, closes, ["sharpe"])
+
+def test_metrics_beyond_a_short_history_are_nan():
+    """ A 6-month history must not report its 6-month return as ytd, return_1y or return_2y. """
+    dates = np.arange("2025-03-01", "2025-08-31", dtype="datetime64[D]")  # 183 days, all in one year
+    closes = np.linspace(100, 150, len(dates))[:, None]
+
+    results = compute_metrics(dates, closes, ["return", "ytd", "return_1y", "return_2y", "return_1m"])
+
+    np.testing.assert_allclose(results["return"], [0.5])
+    assert np.isnan(results["ytd"][0]) and np.isnan(results["return_1y"][0]) and np.isnan(results["return_2y"][0])
+    np.testing.assert_allclose(results["return_1m"], [150 / closes[-22, 0] - 1])
+
+def test_history_period_covers_the_requested_metrics():
+    today = np.datetime64("2025-10-15")
+    assert history_period("6mo", ["price", "return", "sma_50"], today) == "6mo"
+    assert history_period("6mo", ["return_1y"], today) == "2y"
+    assert history_period("6mo", ["sma_200"], today) == "1y"
+    assert history_period("6mo", ["ytd"], today) == "1y"
+    assert history_period("1y", ["return_5y"], today) == "10y"
+    assert history_period("1y", ["return_10y"], today) == "max"
+    assert history_period("max", ["return_2y"], today) == "max"
+
+def test_stock_analytics_fetches_longer_history_but_reports_over_the_period():
+    """ return_1y over a 6mo period downloads 2y, while 'return' still covers only the last 6 months. """
+    dates = np.arange("2023-09-01", "2025-09-01", dtype="datetime64[D]")
+    closes = np.linspace(50, 150, len(dates))
+    engine = MarketDataEngine()
+    with patch.object(engine, "get_history", return_value={"UP": history("UP", dates, closes)}) as get_history:
+        set_market_data_engine(engine)
+        try:
+            result = stock_analytics_function(json.dumps({"tickers": "UP", "metrics": ["return", "return_1y"], "period": "6mo"}))
+        finally:
+            set_market_data_engine(None)
+
+    assert get_history.call_args.kwargs["period"] == "2y"
+    six_months_ago = closes[np.searchsorted(dates, dates[-1] - np.timedelta64(183, "D"))]
+    assert f"return {(closes[-1] / six_months_ago - 1) * 100:+.2f}%" in result
+    assert f"return_1y {(closes[-1] / closes[-1 - 252] - 1) * 100:+.2f}%" in result
+
+def test_stock_analytics_tool_answers_many_tickers_in_one_call(fixture_engine):
+    result = stock_analytics_function(json.dumps({
+        "tickers": "up, dip, nope", "metrics": ["price", "return", "sma_5", "sma_50", "max_drawdown"]
+    }))
+
+    assert result.splitlines() == [
+        "UP: price 110.00 | return +10.00% | sma_5 108.00 | sma_50 n/a | max_drawdown +0.00% (period 1y, as of 2025-01-09)",
+        "DIP: price 110.00 | return +10.00% | sma_5 100.00 | sma_50 n/a | max_drawdown -50.00% (period 1y, as of 2025-01-09)",
+        "NOPE: Could not find price history. It may be an invalid symbol.",
+    ]
+
+@patch('src.tools.market_data.yf.download')
+def test_history_is_downloaded_once_in_a_batch_and_cached(mock_download):
+    dates = pd.to_datetime(DATES[:3])
+    columns = pd.MultiIndex.from_product([["Close"], ["AAA", "BBB"]])
+    mock_download.return_value = pd.DataFrame([[1.0, 5.0], [2.0, np.nan], [3.0, 6.0]], index=dates, columns=columns)
+    set_market_data_engine(MarketDataEngine())
+    try:
+        first = stock_analytics_function("AAA, BBB")
+        second = stock_analytics_function("aaa bbb")
+    finally:
+        set_market_data_engine(None)
+
+    mock_download.assert_called_once()
+    assert first == second
+    assert first.startswith("AAA: price 3.00 | return +200.00%")
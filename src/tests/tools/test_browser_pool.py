@@ -0,0 +1,174 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.tools.browser_pool import BrowserPool
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.url = "about:blank"
+        self.closed = False
+
+    async def goto(self, url, wait_until, timeout):
+        assert wait_until == "domcontentloaded"
+        if "fail" in url:
+            raise RuntimeError("net::ERR_NAME_NOT_RESOLVED")
+        if "hang" in url:
+            await asyncio.Event().wait()
+        self.browser.active += 1
+        self.browser.peak = max(self.browser.peak, self.browser.active)
+        await asyncio.sleep(0.02)
+        self.browser.active -= 1
+        self.url = url
+        return SimpleNamespace(status=200)
+
+    async def wait_for_function(self, script, arg, timeout):
+        pass
+
+    async def wait_for_selector(self, selector, timeout):
+        self.browser.selectors.append(selector)
+
+    async def content(self):
+        return f"<html><body>{self.url}</body></html>"
+
+    async def evaluate(self, script, arg):
+        return ["Title", self.url]
+
+    def is_closed(self):
+        return self.closed
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.route_handler = None
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+    async def new_page(self):
+        return FakePage(self.browser)
+
+    async def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.connected = True
+        self.active = 0
+        self.peak = 0
+        self.selectors = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+@pytest.fixture
+def make_pool():
+    pools = []
+    def make(**kwargs):
+        browsers = []
+        async def launcher():
+            browsers.append(FakeBrowser())
+            return browsers[-1]
+        pool = BrowserPool(launcher=launcher, **kwargs)
+        pools.append(pool)
+        return pool, browsers
+    yield make
+    for pool in pools:
+        pool.close()
+
+def test_contexts_are_reused_and_recycled(make_pool):
+    """ Tests that one warm context serves sequential renders and is replaced after max_uses_per_context. """
+    pool, browsers = make_pool(max_uses_per_context=3)
+
+    pages = [pool.render(f"http://site.test/{i}") for i in range(4)]
+
+    assert pages[3].html == "<html><body>http://site.test/3</body></html>"
+    assert pages[3].status == 200
+    assert pages[3].text_blocks == ["Title", "http://site.test/3"]
+    assert len(browsers) == 1  # Launched once
+    contexts = browsers[0].contexts
+    assert len(contexts) == 2
+    assert contexts[0].closed and not contexts[1].closed
+
+def test_concurrent_renders_from_threads_are_bounded(make_pool):
+    """ Tests that many agent threads can render at once, never exceeding max_contexts pages in flight. """
+    pool, browsers = make_pool(max_contexts=2)
+    results = []
+    def worker(i):
+        results.append(pool.render(f"http://site.test/{i}").url)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == sorted(f"http://site.test/{i}" for i in range(8))
+    assert browsers[0].peak == 2
+    assert len(browsers[0].contexts) == 2
+
+def test_failed_render_discards_context_and_disconnect_relaunches(make_pool):
+    """ Tests health handling: a failing context is closed, and a dead browser is relaunched. """
+    pool, browsers = make_pool()
+
+    with pytest.raises(RuntimeError):
+        pool.render("http://fail.test")
+    assert browsers[0].contexts[0].closed
+
+    browsers[0].connected = False
+    assert pool.render("http://site.test", wait_for="#app").url == "http://site.test"
+    assert len(browsers) == 2
+    assert browsers[1].selectors == ["#app"]
+
+def test_timed_out_render_is_cancelled_and_frees_its_slot(make_pool):
+    """ Tests that a render that never finishes gives its only slot back once render() times out. """
+    pool, browsers = make_pool(max_contexts=1, render_timeout=0.2)
+
+    with pytest.raises(TimeoutError):
+        pool.render("http://hang.test")
+
+    assert pool.render("http://site.test").url == "http://site.test"
+    assert browsers[0].contexts[0].closed
+
+def test_heavy_resources_are_blocked(make_pool):
+    """ Tests that the routing handler aborts images/fonts/media and lets documents and scripts through. """
+    pool, browsers = make_pool()
+    pool.render("http://site.test")
+    handler = browsers[0].contexts[0].route_handler
+
+    calls = []
+    class Route:
+        def __init__(self, resource_type):
+            self.request = SimpleNamespace(resource_type=resource_type)
+        async def abort(self):
+            calls.append((self.request.resource_type, "abort"))
+        async def continue_(self):
+            calls.append((self.request.resource_type, "continue"))
+
+    async def route_all():
+        for resource_type in ("document", "script", "image", "font", "media"):
+            await handler(Route(resource_type))
+    asyncio.run(route_all())
+
+    assert calls == [("document", "continue"), ("script", "continue"),
+                     ("image", "abort"), ("font", "abort"), ("media", "abort")]
+
+def test_render_after_close_raises(make_pool):
+    pool, _ = make_pool()
+    pool.render("http://site.test")
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.render("http://site.test")
@@ -1,9 +1,21 @@
+import json
 from unittest.mock import patch
+
+import numpy as np
 import pandas as pd
+import pytest
 
 from src.tools.financial_tools import get_stock_price_function
+from src.tools.market_data import MarketDataEngine, parse_tickers, set_market_data_engine
+
+@pytest.fixture(autouse=True)
+def fresh_engine():
+    """ Each test starts with an empty quote cache. """
+    set_market_data_engine(None)
+    yield
+    set_market_data_engine(None)
 
-@patch('src.tools.financial_tools.yf.Ticker')
+@patch('src.tools.market_data.yf.Ticker')
 def test_get_stock_price_success(mock_yf_ticker):
     """
     Tests the successful case where yfinance returns data for a valid ticker.
@@ -25,7 +37,7 @@ def test_get_stock_price_success(mock_yf_ticker):
     # This proves our function stripped the whitespace and uppercased the ticker.
     mock_yf_ticker.assert_called_once_with("AAPL")
 
-@patch('src.tools.financial_tools.yf.Ticker')
+@patch('src.tools.market_data.yf.Ticker')
 def test_get_stock_price_invalid_ticker(mock_yf_ticker):
     """
     Tests the failure case where yfinance returns no data for an invalid ticker.
@@ -43,4 +55,47 @@ def test_get_stock_price_invalid_ticker(mock_yf_ticker):
     expected_error_message = f"Could not find stock data for ticker '{invalid_ticker}'. It may be an invalid symbol."
     assert result == expected_error_message
     
-    mock_yf_ticker.assert_called_once_with(invalid_ticker)
\ No newline at end of file
+    mock_yf_ticker.assert_called_once_with(invalid_ticker)
+
+def test_parse_tickers():
+    assert parse_tickers(" aapl, MSFT;nvda aapl ") == ["AAPL", "MSFT", "NVDA"]
+
+@patch('src.tools.market_data.yf.download')
+def test_multiple_tickers_are_fetched_in_one_batch(mock_download):
+    """ Tests one download for several symbols, the last valid close per symbol, and unknown symbols. """
+    dates = pd.to_datetime(["2025-01-02", "2025-01-03"])
+    columns = pd.MultiIndex.from_product([["Close", "Open"], ["AAPL", "MSFT", "NOPE"]])
+    values = np.array([[250.0, 420.0, np.nan, 1, 1, np.nan],
+                       [251.5, np.nan, np.nan, 1, 1, np.nan]])
+    mock_download.return_value = pd.DataFrame(values, index=dates, columns=columns)
+
+    result = get_stock_price_function("aapl, msft, nope")
+
+    mock_download.assert_called_once()
+    assert mock_download.call_args[0][0] == ["AAPL", "MSFT", "NOPE"]
+    assert result.splitlines() == [
+        "AAPL: 251.5 (as of 2025-01-03 00:00 UTC, just fetched)",
+        "MSFT: 420.0 (as of 2025-01-02 00:00 UTC, just fetched)",
+        "NOPE: Could not find stock data. It may be an invalid symbol.",
+    ]
+
+@patch('src.tools.market_data.yf.Ticker')
+def test_quotes_are_cached_within_ttl(mock_yf_ticker):
+    mock_yf_ticker.return_value.history.return_value = pd.DataFrame({'Close': [301.25]})
+
+    assert get_stock_price_function("AAPL") == "301.25"
+    assert get_stock_price_function("aapl").startswith("301.25 (cached ")
+    mock_yf_ticker.assert_called_once_with("AAPL")
+
+@patch('src.tools.market_data.yf.download', side_effect=AssertionError("no network in fixture mode"))
+@patch('src.tools.market_data.yf.Ticker', side_effect=AssertionError("no network in fixture mode"))
+def test_fixture_mode_works_offline(mock_ticker, mock_download, tmp_path):
+    fixture = tmp_path / "market.json"
+    fixture.write_text(json.dumps({"quotes": {"NVDA": {"price": 140.123, "as_of": "2025-01-03T21:00:00Z"}}}))
+    set_market_data_engine(MarketDataEngine(fixture_path=str(fixture)))
+
+    assert get_stock_price_function("NVDA") == "140.12"
+    assert get_stock_price_function("NVDA, XYZ").splitlines() == [
+        "NVDA: 140.12 (as of 2025-01-03 21:00 UTC, cached 0s ago)",
+        "XYZ: Could not find stock data. It may be an invalid symbol.",
+    ]
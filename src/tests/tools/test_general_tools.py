@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from src.tools.calculator import compile_statements
+from src.tools.general_tools import calculator_function, search_function, SEARCH_PREFETCH_ENV_VAR
+
+RESULTS = [
+    {"title": f"Result {i}", "body": f"Snippet {i}", "href": f"https://site{i}.test/page"}
+    for i in range(1, 5)
+]
+
+@patch('src.tools.general_tools.prefetch_pages')
+@patch('src.tools.general_tools.get_ddgs')
+def test_search_formats_results_without_prefetch_by_default(mock_ddgs, mock_prefetch, monkeypatch):
+    monkeypatch.delenv(SEARCH_PREFETCH_ENV_VAR, raising=False)
+    mock_ddgs.return_value.text.return_value = RESULTS
+
+    result = search_function("mars moons")
+
+    assert result.splitlines()[0] == "[1] Result 1: Snippet 1 (URL: https://site1.test/page)"
+    mock_prefetch.assert_not_called()
+
+@patch('src.tools.general_tools.prefetch_pages')
+@patch('src.tools.general_tools.get_ddgs')
+def test_search_prefetches_top_urls_when_enabled(mock_ddgs, mock_prefetch, monkeypatch):
+    """ Tests that only the top results are prefetched, enabled per call or by the environment. """
+    mock_ddgs.return_value.text.return_value = RESULTS
+
+    search_function("mars moons", prefetch_top_k=2)
+    mock_prefetch.assert_called_once_with(["https://site1.test/page", "https://site2.test/page"])
+
+    monkeypatch.setenv(SEARCH_PREFETCH_ENV_VAR, "1")
+    search_function("mars moons")
+    mock_prefetch.assert_called_with(["https://site1.test/page"])
+
+def test_calculator_single_expression_output_unchanged():
+    assert calculator_function("250 * 0.15") == "37.5"
+    assert calculator_function("`2 ** 10`") == "1024"
+    assert calculator_function("round(sqrt(2), 3)") == "1.414"
+
+def test_calculator_evaluates_assignments_in_one_call():
+    result = calculator_function("subtotal = 3 * 20; tax = subtotal * 0.1\nsubtotal + tax")
+
+    assert result.splitlines() == ["subtotal = 60", "tax = 6.0", "subtotal + tax = 66.0"]
+
+def test_calculator_accepts_a_json_list_of_expressions():
+    assert calculator_function('["1 + 1", "10 / 4"]').splitlines() == ["1 + 1 = 2", "10 / 4 = 2.5"]
+
+def test_calculator_vectorises_lists():
+    assert calculator_function("[100, 200, 300] * 1.5") == "[150.0, 300.0, 450.0]"
+    assert calculator_function("prices = [10, 20, 30]; mean(prices)").splitlines()[-1] == "mean(prices) = 20.0"
+
+def test_calculator_rejects_unsafe_input():
+    """ Anything beyond numbers, arithmetic and the whitelisted functions is refused before evaluation. """
+    for expression in ["__import__('os').system('ls')", "().__class__", "open('x')", "'a' * 3", "lambda: 1"]:
+        assert calculator_function(expression).startswith("Error:"), expression
+
+def test_calculator_reports_math_errors():
+    assert calculator_function("1 / 0").startswith("Error: Division by zero")
+    assert calculator_function("9 ** 9 ** 9") == "Error: Exponent too large."
+    assert calculator_function("x + 1").startswith("Error: Unknown name")
+    assert calculator_function("(-8) ** (1/3)").startswith("Error: The result is a complex number")
+
+def test_calculator_bounds_integer_growth():
+    """ Repeated multiplication is capped like `**`, and long integers print in scientific notation. """
+    assert calculator_function("a = 2 ** 99999; a = a * a; a = a * a") == "Error: Result too large."
+    assert calculator_function("2 ** 20000") == "3.980276840337967e+6020"
+
+def test_calculator_rejects_deeply_nested_input():
+    """ Long chains that are short enough to pass the input cap must not crash the parser or compiler. """
+    for expression in ["+".join(["1.5"] * 300), "-" * 1000 + "1"]:
+        assert calculator_function(expression).startswith("Error:"), expression[:20]
+    assert calculator_function("+".join(["1.5"] * 20)) == "30.0"
+
+def test_calculator_caches_compiled_expressions():
+    compile_statements.cache_clear()
+
+    calculator_function("12 * 12")
+    calculator_function("12 * 12")
+
+    info = compile_statements.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
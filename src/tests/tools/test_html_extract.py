@@ -0,0 +1,71 @@
+from src.tools.html_extract import LxmlExtractor, SoupExtractor, extract_blocks, TextProgress
+
+PAGE = b"""
+<html>
+  <head><title>Mars Facts</title><style>body { color: red; }</style></head>
+  <body>
+    <header><a href="/">Home</a> <a href="/news">News</a></header>
+    <nav><ul><li>Planets</li><li>Moons</li></ul></nav>
+    <div class="cookie-banner">We use cookies.</div>
+    <main>
+      <article>
+        <header><h1>The Red Planet</h1></header>
+        <p>Mars has a thin atmosphere,<br>about 0.6% of Earth's pressure.</p>
+        <ul><li>Two moons</li><li>Olympus Mons</li></ul>
+        <div style="display: none">Hidden promo</div>
+        <script>track();</script>
+      </article>
+    </main>
+    <aside id="related-links">More planets</aside>
+    <footer>Copyright 2025</footer>
+  </body>
+</html>
+"""
+
+def test_lxml_extractor_drops_boilerplate_and_keeps_blocks():
+    """ Tests that navigation, banners, hidden and footer content are dropped and blocks kept in order. """
+    blocks = LxmlExtractor().extract_blocks(PAGE)
+
+    assert blocks == [
+        "Mars Facts",
+        "The Red Planet",
+        "Mars has a thin atmosphere,",
+        "about 0.6% of Earth's pressure.",
+        "Two moons",
+        "Olympus Mons",
+    ]
+
+def test_soup_extractor_keeps_original_behaviour():
+    """ Tests the fallback extractor still only removes scripts and styles. """
+    text = " ".join(SoupExtractor().extract_blocks(PAGE))
+
+    assert "Copyright 2025" in text and "track()" not in text
+
+def test_extract_blocks_falls_back_when_lxml_finds_nothing():
+    """ Tests the BeautifulSoup fallback for pages the lxml extractor considers all boilerplate. """
+    page = b"<html><body><nav>Only a navigation menu</nav></body></html>"
+
+    assert extract_blocks(page) == ["Only a navigation menu"]
+
+def test_text_progress_counts_only_readable_text():
+    """ Tests the incremental stop condition ignores scripts and boilerplate. """
+    progress = TextProgress(limit=20)
+
+    assert progress(b"<html><body><nav>" + b"x" * 100 + b"</nav><script>" + b"y" * 100 + b"</script>") is False
+    assert progress(b"<p>" + b"z" * 25 + b"</p>") is True
+
+def test_layout_classes_on_page_containers_are_not_boilerplate():
+    """ Tests that modifier classes such as 'has-main-navigation' or 'with-sidebar' don't drop the page. """
+    wordpress = b'<html><head><title>Blog</title></head><body class="home has-main-navigation"><p>Welcome to the blog.</p></body></html>'
+    wrapper = (b'<html><body><div class="wrapper with-sidebar"><main><p>The article text.</p></main>'
+               b'<aside>Sidebar links</aside></div></body></html>')
+
+    assert LxmlExtractor().extract_blocks(wordpress) == ["Blog", "Welcome to the blog."]
+    assert extract_blocks(wrapper) == ["The article text."]
+    # Whole id/class tokens naming boilerplate are still dropped
+    assert LxmlExtractor().extract_blocks(b'<body><div class="site-nav">Menu</div><p>Text</p></body>') == ["Text"]
+
+def test_title_alone_does_not_prevent_the_fallback():
+    page = b"<html><head><title>Mars</title></head><body><nav>Only a navigation menu</nav></body></html>"
+
+    assert extract_blocks(page) == ["Mars", "Only a navigation menu"]
@@ -0,0 +1,70 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.tools.page_cache import PageCache, normalize_url, get_page_cache
+from src.tools.web_tools import inquisitive_browse_function, prefetch_pages
+
+def test_normalize_url():
+    assert normalize_url(" HTTPS://Example.com/a?b=1#top ") == "https://example.com/a?b=1"
+    assert normalize_url("https://example.com") == "https://example.com/"
+
+def test_concurrent_requests_for_one_url_fetch_once():
+    """ Tests single-flight: callers arriving during a fetch share its result. """
+    cache = PageCache()
+    calls = []
+    def slow_fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "page"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("http://a.test", slow_fetch)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["page"] * 5
+    assert len(calls) == 1
+    assert cache.get_or_fetch("http://a.test/", lambda: "refetched") == "page"
+
+def test_failed_fetches_are_not_cached():
+    cache = PageCache()
+    def fail():
+        raise httpx.ConnectError("down")
+
+    with pytest.raises(httpx.ConnectError):
+        cache.get_or_fetch("http://a.test", fail)
+    assert cache.get_or_fetch("http://a.test", lambda: "page") == "page"
+
+def test_prefetch_is_bounded_and_skips_known_urls():
+    cache = PageCache(max_workers=1, max_queued=2)
+    release = threading.Event()
+    def blocked_fetch(url):
+        release.wait(1)
+        return url
+
+    assert cache.prefetch(["http://a.test", "http://b.test", "http://c.test"], blocked_fetch) == 2
+    assert cache.prefetch(["http://a.test"], blocked_fetch) == 0  # Already in flight
+    release.set()
+    assert cache.get_or_fetch("http://a.test", lambda: "refetched") == "http://a.test"
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_browse_after_prefetch_does_not_refetch(mock_groq, serve):
+    """ Tests that a prefetched page serves the following inquisitive browse without another request. """
+    requests_seen = serve(lambda request: httpx.Response(200, html="<p>Phobos is the larger moon of Mars.</p>"))
+    mock_groq.return_value.get_chat_completion.return_value = {"content": "Phobos"}
+
+    assert prefetch_pages(["http://mars.test/moons", "ftp://ignored.test"]) == 1
+    get_page_cache().get_or_fetch("http://mars.test/moons", lambda: pytest.fail("should join the prefetch"))
+
+    result = inquisitive_browse_function(json.dumps({"url": "http://mars.test/moons", "question": "Which moon is larger?"}))
+
+    assert result == "Phobos"
+    assert len(requests_seen) == 1
@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+import httpx
+
+from src.tools.research_tools import search_and_read_function
+
+PAGES = {
+    "a.test": "<h1>Mars</h1><p>The average surface pressure on Mars is about 610 pascals.</p>"
+              "<p>Mars has two moons.</p><p>It is the fourth planet from the Sun.</p>",
+    # A syndicated copy of the same paragraph should not be repeated in the digest
+    "b.test": "<p>The average surface pressure on Mars is about 610 pascals.</p>"
+              "<p>Pressure varies with the seasons as CO2 freezes at the poles.</p>",
+}
+RESULTS = [
+    {"title": "Mars facts", "body": "Facts about Mars", "href": "http://a.test/mars"},
+    {"title": "Mars weather", "body": "Weather on Mars", "href": "http://b.test/weather"},
+    {"title": "Broken", "body": "Snippet of a broken page", "href": "http://down.test/"},
+    {"title": "More", "body": "An unread result", "href": "http://d.test/"},
+]
+
+def handler(request):
+    if request.url.host in PAGES:
+        return httpx.Response(200, html=f"<html><body>{PAGES[request.url.host]}</body></html>")
+    return httpx.Response(503, text="Unavailable")
+
+@patch('src.tools.research_tools.get_ddgs')
+def test_search_and_read_returns_attributed_deduplicated_digest(mock_ddgs, serve):
+    requests_seen = serve(handler)
+    mock_ddgs.return_value.text.return_value = RESULTS
+
+    digest = search_and_read_function("Mars surface pressure")
+
+    assert sorted(r.url.host for r in requests_seen) == ["a.test", "b.test", "down.test"]
+    lines = digest.splitlines()
+    assert lines[0] == "Search results for 'Mars surface pressure':"
+    assert lines[1] == "[1] Mars facts (URL: http://a.test/mars)"
+    assert digest.count("610 pascals") == 1
+    assert "CO2 freezes at the poles" in digest
+    assert "[3] Broken (URL: http://down.test/) [could not be read] Snippet of a broken page" in lines
+    assert "[4] More (URL: http://d.test/) [snippet] An unread result" in lines
+
+@patch('src.tools.research_tools.get_ddgs')
+def test_search_and_read_without_results(mock_ddgs):
+    mock_ddgs.return_value.text.return_value = []
+    assert search_and_read_function("zzzz") == "No information found for 'zzzz'."
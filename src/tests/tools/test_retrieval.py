@@ -0,0 +1,58 @@
+import json
+from unittest.mock import patch
+
+import httpx
+
+from src.tools.retrieval import BM25Index, chunk_blocks, select_passages
+from src.tools.web_tools import inquisitive_browse_function
+from src.utils.text import estimate_tokens
+
+FILLER = "The rover drove across the plain and took more pictures of the rocks."
+
+def test_chunk_blocks_packs_small_blocks_and_splits_long_ones():
+    """ Tests that headings stay with their paragraph and oversized blocks are split at sentence ends. """
+    long_block = " ".join(["This sentence is about forty characters."] * 10)
+    chunks = chunk_blocks(["Heading", "Short paragraph.", long_block], chunk_chars=120)
+
+    assert chunks[0].startswith("Heading Short paragraph.")
+    assert all(len(c) <= 120 for c in chunks)
+    assert sum(c.count("forty characters") for c in chunks) == 10
+
+def test_bm25_ranks_passage_with_rare_query_terms_first():
+    """ Tests BM25 scoring: rare terms matter more than common ones, and unmatched passages score zero. """
+    index = BM25Index([
+        "Mars is a planet. Mars is red.",
+        "The atmospheric pressure on Mars is about 610 pascals.",
+        "Jupiter is the largest planet.",
+    ])
+    scores = index.scores("What is the atmospheric pressure on Mars?")
+
+    assert scores.argmax() == 1
+    assert scores[2] == 0
+
+def test_select_passages_finds_answer_deep_in_page_within_budget():
+    """ Tests that a relevant passage far beyond the old 8000-char window is selected under the token budget. """
+    blocks = [FILLER] * 300 + ["The surface pressure on Mars averages 610 pascals."] + [FILLER] * 50
+    passages = select_passages(blocks, "surface pressure on Mars", token_budget=300)
+
+    assert any("610 pascals" in p for p in passages)
+    assert sum(estimate_tokens(p) for p in passages) <= 300
+
+def test_select_passages_falls_back_to_page_start():
+    """ Tests that the leading passages are used when nothing matches the question. """
+    passages = select_passages(["Intro text.", FILLER], "zebra migration", token_budget=100)
+    assert passages[0].startswith("Intro text.")
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_inquisitive_browse_sends_relevant_passages(mock_groq, serve):
+    """ Tests that the extractor LLM gets the relevant passage from the full page, not just the first 8000 chars. """
+    body = "".join(f"<p>{FILLER}</p>" for _ in range(400)) + "<p>Olympus Mons is 21.9 km high.</p>"
+    serve(lambda request: httpx.Response(200, html=f"<html><body>{body}</body></html>"))
+    mock_groq.return_value.get_chat_completion.return_value = {"content": "21.9 km"}
+
+    result = inquisitive_browse_function(json.dumps({"url": "http://mars.test", "question": "How high is Olympus Mons?"}))
+
+    assert result == "21.9 km"
+    prompt = mock_groq.return_value.get_chat_completion.call_args[0][0][0]["content"]
+    assert "Olympus Mons is 21.9 km high." in prompt
+    assert len(prompt) < 12000
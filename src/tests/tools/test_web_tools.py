@@ -1,10 +1,16 @@
-from unittest.mock import patch, MagicMock
-import requests
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import patch
 
-from src.tools.web_tools import browse_function
+import httpx
+import pytest
 
-@patch('src.tools.web_tools.requests.get')
-def test_browse_success(mock_requests_get):
+from src.tools.http_client import HttpClient
+from src.tools.web_tools import browse_function, inquisitive_browse_function, multi_browse_function, web_browse_tool
+
+def test_browse_success(serve):
     """
     Tests the happy path: a successful browse, HTML parsing, and text cleaning.
     """
@@ -20,40 +26,28 @@ def test_browse_success(mock_requests_get):
         </body>
     </html>
     """
-    # A mock response object that mimics the real requests.Response
-    mock_response = MagicMock()
-    mock_response.content = fake_html_content
-    # The raise_for_status method should do nothing in the success case
-    mock_response.raise_for_status.return_value = None
-    
-    # Configure the main mock to return our fake response object
-    mock_requests_get.return_value = mock_response
+    requests_seen = serve(lambda request: httpx.Response(200, content=fake_html_content,
+                                                         headers={"Content-Type": "text/html"}))
     
-    result = browse_function("http://example.com")
+    result = browse_function(" http://example.com ")
     
     # The function should have removed the script/style tags and extracted the text.
     assert result == "Test Page Welcome This is the main content."
     
-    mock_requests_get.assert_called_once()
+    assert len(requests_seen) == 1
     # Check that the URL was stripped of any potential whitespace
-    called_url = mock_requests_get.call_args[0][0]
-    assert called_url == "http://example.com"
-    # Check that headers were passed
-    assert 'headers' in mock_requests_get.call_args[1]
+    assert str(requests_seen[0].url) == "http://example.com"
+    # Check that browser-like headers and compression were requested
+    assert "Mozilla" in requests_seen[0].headers["User-Agent"]
+    assert "br" in requests_seen[0].headers["Accept-Encoding"]
 
-@patch('src.tools.web_tools.requests.get')
-def test_browse_content_truncation(mock_requests_get):
+def test_browse_content_truncation(serve):
     """
     Tests that long content is correctly truncated to the specified max_length.
     """
 
     long_text = "a" * 10000
-    fake_html_content = f"<html><body><p>{long_text}</p></body></html>".encode('utf-8')
-    
-    mock_response = MagicMock()
-    mock_response.content = fake_html_content
-    mock_response.raise_for_status.return_value = None
-    mock_requests_get.return_value = mock_response
+    serve(lambda request: httpx.Response(200, html=f"<html><body><p>{long_text}</p></body></html>"))
     
     result = browse_function("http://longcontent.com")
     
@@ -61,38 +55,201 @@ def test_browse_content_truncation(mock_requests_get):
     assert len(result) == len(expected_truncated_text)
     assert result == expected_truncated_text
 
-@patch('src.tools.web_tools.requests.get')
-def test_browse_http_error(mock_requests_get):
+def test_web_browse_tool_output_is_truncated(serve):
+    """ Tests the web_browse tool's output contract: at most BROWSE_MAX_CHARS of text plus a truncation marker. """
+    serve(lambda request: httpx.Response(200, html=f"<html><body><p>{'b' * 20000}</p></body></html>"))
+
+    result = web_browse_tool.execute("http://longcontent.com")
+
+    assert result == ("b" * 8000) + "... (Content truncated due to length)"
+    assert "8000 characters" in web_browse_tool.description
+
+def test_browse_http_error(serve):
     """
     Tests the handling of an HTTP error (e.g., 404 Not Found).
-    This is triggered when response.raise_for_status() raises an error.
     """
-
-    # We configure the mock response's raise_for_status method to raise an HTTPError
-    mock_response = MagicMock()
-    error_message = "404 Client Error: Not Found"
-    mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(error_message)
-    mock_requests_get.return_value = mock_response
+    serve(lambda request: httpx.Response(404, text="Not Found"))
 
     url = "http://example.com/notfound"
     result = browse_function(url)
 
     # Check that the function caught the error and returned a user-friendly message.
     assert "Error: Could not fetch content from URL" in result
-    assert error_message in result
+    assert "404 Not Found" in result
 
-@patch('src.tools.web_tools.requests.get')
-def test_browse_request_exception(mock_requests_get):
+def test_browse_request_exception(serve):
     """
     Tests the handling of a network-level error (e.g., DNS failure, timeout).
-    This is triggered when requests.get() itself raises an error.
     """
-    # This time, the main mock itself raises the exception when called.
     error_message = "Failed to establish a new connection"
-    mock_requests_get.side_effect = requests.exceptions.RequestException(error_message)
+    def refuse(request):
+        raise httpx.ConnectError(error_message, request=request)
+    serve(refuse)
     
     url = "http://no-such-domain.com"
     result = browse_function(url)
     
     assert "Error: Could not fetch content from URL" in result
-    assert error_message in result
\ No newline at end of file
+    assert error_message in result
+
+def test_binary_content_type_is_rejected_before_download(serve):
+    """ Tests that a PDF is refused from its headers, without reading the body. """
+    body_reads = []
+    def pdf_body():
+        body_reads.append(1)
+        yield b"%PDF-1.7 ..."
+    serve(lambda request: httpx.Response(200, content=pdf_body(), headers={"Content-Type": "application/pdf"}))
+
+    result = browse_function("http://example.com/report.pdf")
+
+    assert result.startswith("Error:")
+    assert "application/pdf" in result
+    assert body_reads == []
+
+def test_download_stops_once_enough_text_arrived(serve):
+    """ Tests that a huge page is not read past the point where enough text has been extracted. """
+    chunks_sent = []
+    def huge_page():
+        yield b"<html><body>"
+        for i in range(10_000):
+            chunks_sent.append(i)
+            yield f"<p>{'word ' * 100}</p>".encode()
+        yield b"</body></html>"
+    serve(lambda request: httpx.Response(200, content=huge_page(), headers={"Content-Type": "text/html"}))
+
+    result = browse_function("http://example.com/huge", max_length=2000)
+
+    assert result.endswith("... (Content truncated due to length)")
+    assert len(chunks_sent) < 10
+
+def test_fetch_caps_bytes():
+    """ Tests the hard byte cap when no stop condition is given. """
+    def endless_text(request):
+        return httpx.Response(200, content=(b"x" * 1024 for _ in range(1000)), headers={"Content-Type": "text/plain"})
+    client = HttpClient(transport=httpx.MockTransport(endless_text))
+
+    result = client.fetch("http://example.com/big.txt", max_bytes=10_000)
+
+    assert len(result.body) == 10_000
+    assert result.truncated is True
+
+def test_per_host_limit_caps_concurrency():
+    """ Tests that concurrent requests to one host never exceed per_host_limit, while other hosts proceed. """
+    lock = threading.Lock()
+    active = {"a.com": 0, "b.com": 0}
+    peak = {"a.com": 0, "b.com": 0}
+    def handler(request):
+        host = request.url.host
+        with lock:
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+        time.sleep(0.05)
+        with lock:
+            active[host] -= 1
+        return httpx.Response(200, text="ok")
+    client = HttpClient(per_host_limit=2, transport=httpx.MockTransport(handler))
+
+    threads = [threading.Thread(target=client.get, args=(f"http://{host}/{i}",))
+               for i in range(6) for host in ("a.com", "b.com")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak == {"a.com": 2, "b.com": 2}
+
+def test_async_get_uses_politeness_delay():
+    """ Tests the async path and that request starts to one host are spaced by the politeness delay. """
+    starts = []
+    async def handler(request):
+        starts.append(time.monotonic())
+        return httpx.Response(200, text="ok")
+    client = HttpClient(politeness_delay=0.05, async_transport=httpx.MockTransport(handler))
+
+    async def main():
+        responses = await asyncio.gather(*(client.aget(f"http://a.com/{i}") for i in range(3)))
+        await client.aclose()
+        return responses
+
+    responses = asyncio.run(main())
+
+    assert [r.text for r in responses] == ["ok"] * 3
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert all(gap >= 0.04 for gap in gaps)
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_multi_browse_reads_pages_concurrently_with_status_per_url(mock_groq, serve):
+    """ Tests that several pages are fetched in parallel and merged into one observation. """
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+    def handler(request):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        if request.url.host == "down.test":
+            return httpx.Response(500, text="Server Error")
+        return httpx.Response(200, html=f"<p>The Pro plan on {request.url.host} costs $10.</p>")
+    serve(handler)
+    mock_groq.return_value.get_chat_completion.side_effect = lambda messages: {
+        "content": "Information not found." if "c.test" in messages[0]["content"] else "$10 per month"
+    }
+
+    items = [{"url": f"http://{host}/pricing", "question": "What does the Pro plan cost?"}
+             for host in ("a.test", "b.test", "c.test", "down.test")]
+    result = multi_browse_function(json.dumps(items))
+
+    lines = result.splitlines()
+    assert lines[:3] == [
+        "[1] http://a.test/pricing (ok): $10 per month",
+        "[2] http://b.test/pricing (ok): $10 per month",
+        "[3] http://c.test/pricing (not found): Information not found.",
+    ]
+    assert lines[3].startswith("[4] http://down.test/pricing (error): Error: Could not fetch content")
+    assert peak[0] > 1
+
+def test_multi_browse_rejects_invalid_input():
+    assert multi_browse_function("not json").startswith("Error: Invalid input format.")
+    assert multi_browse_function('[{"url": "http://a.test"}]').startswith("Error: Invalid input format.")
+    assert multi_browse_function("[]") == "Error: The list of pages to browse is empty."
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_inquisitive_browse_batches_questions_into_one_extraction(mock_groq, serve):
+    """ Tests that a list of questions costs one fetch and one JSON-mode extraction call. """
+    requests_seen = serve(lambda request: httpx.Response(
+        200, html="<p>Mars has two moons.</p><p>A Martian day lasts 24.6 hours.</p>"))
+    llm = mock_groq.return_value.get_chat_completion
+    llm.return_value = {"content": json.dumps({"answers": ["Two", "24.6 hours"]})}
+
+    result = inquisitive_browse_function(json.dumps({
+        "url": "http://mars.test", "question": ["How many moons?", "How long is a day?", "Who named it?"]
+    }))
+
+    assert result.splitlines() == [
+        "[1] How many moons?: Two",
+        "[2] How long is a day?: 24.6 hours",
+        "[3] Who named it?: Information not found.",  # Missing answers are padded
+    ]
+    assert len(requests_seen) == 1
+    llm.assert_called_once()
+    assert llm.call_args.kwargs == {"json_mode": True}
+
+@patch('src.tools.web_tools.GroqInterface')
+def test_multi_browse_coalesces_questions_for_the_same_url(mock_groq, serve):
+    requests_seen = serve(lambda request: httpx.Response(200, html="<p>Mars has two moons: Phobos and Deimos.</p>"))
+    llm = mock_groq.return_value.get_chat_completion
+    llm.return_value = {"content": json.dumps({"answers": ["Two", "Phobos and Deimos"]})}
+
+    result = multi_browse_function(json.dumps([
+        {"url": "http://mars.test/moons", "question": "How many moons?"},
+        {"url": "http://mars.test/moons", "question": "What are they called?"},
+    ]))
+
+    assert result.splitlines() == [
+        "[1] http://mars.test/moons (ok): Two",
+        "[2] http://mars.test/moons (ok): Phobos and Deimos",
+    ]
+    assert len(requests_seen) == 1
+    llm.assert_called_once()
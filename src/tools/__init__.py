@@ -3,28 +3,37 @@
 from .base import Tool
 
 from .financial_tools import get_stock_price_tool
+from .analytics_tools import stock_analytics_tool
 from .general_tools import calculator_tool, search_tool, finish_tool
-from .web_tools import inquisitive_web_browse_tool
+from .web_tools import inquisitive_web_browse_tool, multi_web_browse_tool
 from .advanced_web_tools import dynamic_web_reader_tool
+from .adaptive_web_tools import adaptive_web_browse_tool
+from .research_tools import search_and_read_tool
 
 
 # A convenient list of all tools for the agent constructor
 all_tools = [
     get_stock_price_tool,
+    stock_analytics_tool,
     search_tool,
+    search_and_read_tool,
     calculator_tool,
-    inquisitive_web_browse_tool,
-    dynamic_web_reader_tool,
+    adaptive_web_browse_tool,
+    multi_web_browse_tool,
     finish_tool,
 ]
 
 __all__ = [
     "Tool",
     "get_stock_price_tool",
+    "stock_analytics_tool",
     "search_tool",
     "calculator_tool",
     "finish_tool",
     "inquisitive_web_browse_tool",
     "dynamic_web_reader_tool",
+    "adaptive_web_browse_tool",
+    "multi_web_browse_tool",
+    "search_and_read_tool",
     "all_tools"
 ]
\ No newline at end of file
@@ -0,0 +1,181 @@
+import json
+import logging
+import os
+import re
+import threading
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .base import Tool
+from .browser_pool import get_browser_pool
+from .html_extract import extract_blocks
+from .web_tools import _fetch_page, _browse_error, _extract_answers, _parse_questions, _format_answers
+from .advanced_web_tools import DYNAMIC_EXTRACTION_TOKEN_BUDGET
+from src.utils.cache import BoundedCache
+
+logger = logging.getLogger(__name__)
+
+STATIC, DYNAMIC = "static", "dynamic"
+
+# Environment variable naming a JSON file to persist the domain tiers in. Unset keeps them in memory.
+TIER_CACHE_ENV_VAR = "AI_AGENT_DOMAIN_TIER_CACHE"
+
+# With a framework marker present, a page this thin is most likely client-rendered
+MARKED_SHELL_TEXT_CHARS = 1000
+
+_JS_SHELL_MARKERS = re.compile(
+    rb'<div[^>]+id=["\'](?:root|app|__next|__nuxt|svelte)["\'][^>]*>\s*</div>'
+    rb'|data-reactroot|ng-version=|ng-app|window\.__NUXT__|window\.__INITIAL_STATE__'
+    rb'|<noscript>[^<]{0,200}(?:enable|requires?|turn on)\s+javascript',
+    re.IGNORECASE,
+)
+
+# Statuses that often mean "bot blocked" for a plain client but load fine in a real browser
+_BROWSER_RETRY_STATUSES = {401, 403, 429}
+
+
+def looks_like_js_shell(body: bytes, blocks: List[str], content_type: str = "text/html") -> bool:
+    """
+    Guesses whether a statically fetched page needs JavaScript to show its content:
+    an HTML page with little text plus a client-side framework marker (empty #root/#app
+    mount point, Angular/Nuxt state, a "please enable JavaScript" notice). Short pages
+    without a marker, and non-HTML responses such as JSON or plain text, are taken as they are.
+    """
+    if "html" not in content_type:
+        return False
+    text_chars = sum(len(b) for b in blocks)
+    return text_chars < MARKED_SHELL_TEXT_CHARS and bool(_JS_SHELL_MARKERS.search(body[:200_000]))
+
+
+def _domain(url: str) -> str:
+    host = (urlsplit(url.strip()).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainTierCache:
+    """
+    A record of which fetch tier (static or dynamic) works for each domain, optionally
+    persisted to a JSON file. Entries expire after `ttl`, so a site that drops its
+    JavaScript shell is re-probed.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: int = 10_000, ttl: float = 30 * 24 * 3600):
+        """
+        Args:
+            path: JSON file the record is loaded from and saved to. None (the default) keeps it in memory only.
+            max_size: Maximum number of domains remembered.
+            ttl: Seconds after which a domain's tier is forgotten.
+        """
+        self.path = os.path.expanduser(path) if path else None
+        if self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._cache = BoundedCache(max_size=max_size, ttl=ttl, path=self.path)
+        self._save_lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[str]:
+        """ The tier that last worked for the URL's domain, or None if unknown. """
+        return self._cache.get(_domain(url))
+
+    def record(self, url: str, tier: str) -> None:
+        """ Records the tier that worked for the URL's domain, saving the file if it changed. """
+        domain = _domain(url)
+        if not domain or self._cache.get(domain) == tier:
+            return
+        self._cache.set(domain, tier)
+        logger.info(f"Domain '{domain}' recorded as {tier}.")
+        if self.path:
+            with self._save_lock:
+                try:
+                    self._cache.save()
+                except OSError as e:
+                    logger.warning(f"Could not save the domain tier cache: {e}")
+
+
+_shared_tiers: Optional[DomainTierCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_domain_tiers() -> DomainTierCache:
+    """
+    Returns the process-wide DomainTierCache, creating it on first use. It is persisted
+    to the file named by the AI_AGENT_DOMAIN_TIER_CACHE environment variable, if set.
+    """
+    global _shared_tiers
+    if _shared_tiers is None:
+        with _shared_lock:
+            if _shared_tiers is None:
+                _shared_tiers = DomainTierCache(path=os.environ.get(TIER_CACHE_ENV_VAR) or None)
+    return _shared_tiers
+
+
+def set_domain_tiers(tiers: Optional[DomainTierCache]) -> None:
+    """ Replaces the shared tier cache (e.g. with an in-memory one in tests). """
+    global _shared_tiers
+    with _shared_lock:
+        _shared_tiers = tiers
+
+
+def adaptive_browse_function(action_input: str) -> str:
+    """
+    Answers one or more questions about a URL, choosing the fetch tier automatically.
+
+    The page is fetched statically first unless its domain is known to need a browser.
+    If the static response looks like a JavaScript shell (or is bot-blocked), it is
+    rendered in the shared browser pool instead. The domain is remembered as dynamic
+    only if the browser found more text than the static fetch.
+    """
+    try:
+        input_data = json.loads(action_input)
+        url = input_data["url"]
+        questions = _parse_questions(input_data)
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return "Error: Invalid input format. Please provide a JSON object with 'url' and 'question' keys."
+
+    tiers = get_domain_tiers()
+    static_blocks: List[str] = []
+    if tiers.get(url) != DYNAMIC:
+        logger.info(f"Performing adaptive browse (static) on URL: {url} with question(s): {questions}")
+        try:
+            result, static_blocks = _fetch_page(url)
+            if not looks_like_js_shell(result.body, static_blocks, result.content_type):
+                tiers.record(url, STATIC)
+                return _format_answers(questions, _extract_answers(url, static_blocks, questions))
+            logger.info(f"{url} looks like a JavaScript shell. Escalating to the browser.")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in _BROWSER_RETRY_STATUSES:
+                return _browse_error(url, e)
+            logger.info(f"{url} returned {e.response.status_code} to the static client. Escalating to the browser.")
+        except Exception as e:
+            return _browse_error(url, e)
+    else:
+        logger.info(f"Performing adaptive browse (known dynamic domain) on URL: {url} with question(s): {questions}")
+
+    try:
+        page = get_browser_pool().render(url)
+    except Exception as e:
+        logger.error(f"Playwright failed for URL {url}: {e}")
+        return f"Error: The dynamic browser failed to load the URL '{url}'. It might be down or blocking automation."
+
+    blocks = page.text_blocks or extract_blocks(page.html)
+    if sum(len(b) for b in blocks) > sum(len(b) for b in static_blocks):
+        tiers.record(url, DYNAMIC)
+    elif static_blocks:
+        logger.info(f"The browser found no more text than the static fetch of {url}. Using the static page.")
+        return _format_answers(questions, _extract_answers(url, static_blocks, questions))
+    answers = _extract_answers(url, blocks, questions, model="qwen/qwen3-32b", token_budget=DYNAMIC_EXTRACTION_TOKEN_BUDGET)
+    return _format_answers(questions, answers)
+
+
+adaptive_web_browse_tool = Tool(
+    name="adaptive_web_browse",
+    description=(
+        "Use this tool when you need to find a *specific piece of information* from a webpage. "
+        "It reads both simple and JavaScript-heavy sites, switching to a real browser automatically when needed. "
+        "The input MUST be a JSON object with two keys: 'url' and 'question'. "
+        "To ask several things about the same page, pass a list of questions in one call. "
+        "Example: {\"url\": \"https://en.wikipedia.org/wiki/Mars\", \"question\": \"What is the atmospheric pressure on Mars?\"}"
+    ),
+    function=adaptive_browse_function
+)
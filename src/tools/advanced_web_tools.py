@@ -1,13 +1,18 @@
 import logging
 import json
 import json_repair
-from playwright.sync_api import sync_playwright
 
 from .base import Tool
+from .browser_pool import get_browser_pool
+from .html_extract import extract_blocks
+from .retrieval import select_passages
 from ..llm.groq_interface import GroqInterface
 
 logger = logging.getLogger(__name__)
 
+# Budget for the page passages sent to the extractor LLM (the larger model takes more context)
+DYNAMIC_EXTRACTION_TOKEN_BUDGET = 4000
+
 def dynamic_web_reader_function(action_input: str) -> str:
     """
     A "Tier 2" browsing tool that uses a headless browser to render dynamic,
@@ -23,32 +28,31 @@ def dynamic_web_reader_function(action_input: str) -> str:
     logger.info(f"Performing DYNAMIC browse on URL: {url} with question: '{question}'")
     
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            
-            # Navigate to the page and wait for it to be fully loaded
-            page.goto(url, wait_until='networkidle', timeout=30000)
-            
-            # Get the fully rendered HTML content
-            content = page.content()
-            browser.close()
+        # The shared pool keeps Chromium warm and reuses contexts across calls and threads
+        page = get_browser_pool().render(url)
 
     except Exception as e:
         logger.error(f"Playwright failed for URL {url}: {e}")
         return f"Error: The dynamic browser failed to load the URL '{url}'. It might be down or blocking automation."
 
+    # Rendered main-content text from the page itself; parse the HTML only if that came back empty
+    blocks = page.text_blocks or extract_blocks(page.html)
+    passages = select_passages(blocks, question, token_budget=DYNAMIC_EXTRACTION_TOKEN_BUDGET)
+    if not passages:
+        return "Information not found."
+    page_text = "\n\n".join(passages)
+
     # Now, use the LLM extraction logic 
     try:
         extractor_llm = GroqInterface(model="qwen/qwen3-32b")
         
         prompt = (
             "You are a highly efficient information extraction assistant. "
-            "You will be given the full HTML content of a webpage and a specific question. "
+            "You will be given passages from a rendered webpage and a specific question. "
             "Your task is to answer the question based *only* on the provided text. "
             "If the answer is not found, you MUST respond with 'Information not found.' "
             "Do not use any prior knowledge. Be concise and direct.\n\n"
-            f"--- HTML CONTENT ---\n{content[:20000]}\n\n" # We can use a larger context here
+            f"--- TEXT ---\n{page_text}\n\n"
             f"--- QUESTION ---\n{question}"
         )
         
@@ -0,0 +1,204 @@
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .base import Tool
+from .market_data import get_market_data_engine, parse_tickers, PriceHistory
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS_PER_YEAR = 252
+DEFAULT_METRICS = ["price", "return", "ytd", "sma_50", "sma_200", "volatility", "max_drawdown"]
+_SMA = re.compile(r"^sma_?(\d+)$")
+_PERIOD_RETURN = re.compile(r"^return_(\d+)([dmy])$")
+_DAYS_PER_UNIT = {"d": 1, "m": 21, "y": TRADING_DAYS_PER_YEAR}
+# Calendar days covered by each yfinance period, shortest first
+_PERIOD_CALENDAR_DAYS = {"1d": 1, "5d": 7, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731,
+                         "5y": 1827, "10y": 3653}
+
+
+def align_closes(histories: List[PriceHistory]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aligns several close histories on the union of their dates.
+
+    Returns (dates, closes) with closes of shape (days, tickers). Days before a ticker's
+    first close are NaN; later gaps (e.g. another exchange's holidays) are forward-filled.
+    """
+    dates = np.unique(np.concatenate([h.dates for h in histories]))
+    closes = np.full((len(dates), len(histories)), np.nan, dtype=np.float64)
+    for col, history in enumerate(histories):
+        closes[np.searchsorted(dates, history.dates), col] = history.closes
+
+    # Vectorised forward fill: index of the last valid row at or above each row
+    valid = ~np.isnan(closes)
+    last_valid = np.where(valid, np.arange(len(dates))[:, None], 0)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    filled = closes[last_valid, np.arange(closes.shape[1])]
+    started = np.maximum.accumulate(valid, axis=0)
+    return dates, np.where(started, filled, np.nan)
+
+
+def _trading_days_needed(metric: str) -> int:
+    """ Trading days of history `metric` needs (0 for metrics computed over the requested period). """
+    sma = _SMA.match(metric)
+    period_return = _PERIOD_RETURN.match(metric)
+    if sma:
+        return int(sma.group(1))
+    if period_return:
+        return int(period_return.group(1)) * _DAYS_PER_UNIT[period_return.group(2)] + 1
+    return 0
+
+
+def history_period(period: str, metrics: List[str], today: Optional[np.datetime64] = None) -> str:
+    """
+    The yfinance period to download so that every metric has the history it needs: at least
+    `period`, longer for e.g. sma_200 or return_2y over a '6mo' period, or ytd early in January.
+    """
+    if period not in _PERIOD_CALENDAR_DAYS:
+        return period  # 'max', or 'ytd' (where ytd itself falls back to n/a if needed)
+    # Trading days to calendar days, with a week's margin for holidays
+    needed = max((_trading_days_needed(m) * 365 // TRADING_DAYS_PER_YEAR + 7 for m in metrics), default=0)
+    if "ytd" in metrics:
+        today = today if today is not None else np.datetime64("today", "D")
+        year_start = np.datetime64(str(today.astype("datetime64[Y]")), "D")
+        needed = max(needed, int((today - year_start) / np.timedelta64(1, "D")) + 7)
+    if needed <= _PERIOD_CALENDAR_DAYS[period]:
+        return period
+    return next((p for p, days in _PERIOD_CALENDAR_DAYS.items() if days >= needed), "max")
+
+
+def period_start(last_date: np.datetime64, period: str) -> Optional[np.datetime64]:
+    """ The first date `period` covers when it ends on `last_date`, or None for 'max' and unknown periods. """
+    if period == "ytd":
+        return np.datetime64(str(last_date.astype("datetime64[Y]")), "D")
+    if period in _PERIOD_CALENDAR_DAYS:
+        return last_date - np.timedelta64(_PERIOD_CALENDAR_DAYS[period], "D")
+    return None
+
+
+def compute_metrics(dates: np.ndarray, closes: np.ndarray, metrics: List[str],
+                    start: Optional[np.datetime64] = None) -> Dict[str, np.ndarray]:
+    """
+    Computes each metric for every column of `closes` at once. Returns {metric: values per ticker}.
+
+    Supported metrics: price, return (over the period), ytd, return_<N><d|m|y>
+    (e.g. return_1m), sma_<N>, volatility (annualised, from daily log returns) and max_drawdown.
+    return, volatility and max_drawdown cover the rows from `start` on (default: the whole
+    history); the others use all rows. A metric whose base date or window is not covered by
+    the history is NaN.
+
+    Raises:
+        ValueError: For an unknown metric name.
+    """
+    n_days, n_tickers = closes.shape
+    first_row = np.argmax(~np.isnan(closes), axis=0)
+    last = closes[-1]
+    period_closes = closes[np.searchsorted(dates, start):] if start is not None else closes
+    period_first = period_closes[np.argmax(~np.isnan(period_closes), axis=0), np.arange(n_tickers)]
+    results = {}
+
+    for metric in metrics:
+        sma = _SMA.match(metric)
+        period_return = _PERIOD_RETURN.match(metric)
+        if metric == "price":
+            results[metric] = last
+        elif metric == "return":
+            results[metric] = last / period_first - 1
+        elif metric == "ytd":
+            # Relative to the last close of the previous year; NaN if the history starts later
+            year_start = np.datetime64(str(dates[-1].astype("datetime64[Y]")), "D")
+            base_row = np.searchsorted(dates, year_start) - 1
+            results[metric] = last / closes[base_row] - 1 if base_row >= 0 else np.full(n_tickers, np.nan)
+        elif period_return:
+            base_row = n_days - 1 - int(period_return.group(1)) * _DAYS_PER_UNIT[period_return.group(2)]
+            results[metric] = last / closes[base_row] - 1 if base_row >= 0 else np.full(n_tickers, np.nan)
+        elif sma:
+            window = int(sma.group(1))
+            values = np.nanmean(closes[-window:], axis=0) if n_days else np.full(n_tickers, np.nan)
+            # Not enough history for the full window
+            results[metric] = np.where(n_days - first_row >= window, values, np.nan)
+        elif metric == "volatility":
+            log_returns = np.diff(np.log(period_closes), axis=0)
+            results[metric] = np.nanstd(log_returns, axis=0, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)
+        elif metric == "max_drawdown":
+            running_max = np.fmax.accumulate(period_closes, axis=0)
+            results[metric] = np.nanmin(period_closes / running_max - 1, axis=0)
+        else:
+            raise ValueError(f"Unknown metric '{metric}'.")
+    return results
+
+
+def _format_metric(metric: str, value: float) -> str:
+    if np.isnan(value):
+        return f"{metric} n/a"
+    if metric == "price" or metric.startswith("sma"):
+        return f"{metric} {value:.2f}"
+    return f"{metric} {value * 100:+.2f}%"
+
+
+def _parse_input(action_input: str) -> Tuple[List[str], List[str], str]:
+    """ Accepts 'NVDA, AAPL' or {"tickers": "NVDA, AAPL", "metrics": [...], "period": "1y"}. """
+    text = action_input.strip()
+    if text.startswith("{"):
+        data = json.loads(text)
+        tickers = data["tickers"]
+        tickers = parse_tickers(tickers if isinstance(tickers, str) else ",".join(tickers))
+        metrics = data.get("metrics") or DEFAULT_METRICS
+        if isinstance(metrics, str):
+            metrics = [m for m in re.split(r"[\s,]+", metrics) if m]
+        return tickers, [str(m).strip().lower() for m in metrics], str(data.get("period", "1y"))
+    return parse_tickers(text), DEFAULT_METRICS, "1y"
+
+
+def stock_analytics_function(action_input: str) -> str:
+    """
+    Computes price analytics for one or many tickers in a single call, from one (cached,
+    batched) history download: returns, moving averages, volatility and drawdown.
+    """
+    try:
+        tickers, metrics, period = _parse_input(action_input)
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return ("Error: Invalid input. Provide tickers like 'NVDA, AAPL', or a JSON object like "
+                "{\"tickers\": \"NVDA, AAPL\", \"metrics\": [\"ytd\", \"sma_50\"], \"period\": \"1y\"}.")
+    if not tickers:
+        return "Error: Please provide at least one ticker symbol."
+
+    logger.info(f"Computing {metrics} over {period} for: {', '.join(tickers)}")
+    fetch_period = history_period(period, metrics)
+    try:
+        histories = get_market_data_engine().get_history(tickers, period=fetch_period)
+    except Exception as e:
+        logger.error(f"Price history download failed: {e}")
+        return f"Error: Could not download price history. Reason: {e}"
+
+    found = [histories[t] for t in tickers if histories[t] is not None and len(histories[t].closes)]
+    lines = []
+    if found:
+        dates, closes = align_closes(found)
+        try:
+            start = period_start(dates[-1], period) if fetch_period != period else None
+            results = compute_metrics(dates, closes, metrics, start=start)
+        except ValueError as e:
+            return f"Error: {e} Supported: price, return, ytd, return_<N>d/m/y, sma_<N>, volatility, max_drawdown."
+        as_of = str(dates[-1])
+        for col, history in enumerate(found):
+            values = " | ".join(_format_metric(m, results[m][col]) for m in metrics)
+            lines.append(f"{history.ticker}: {values} (period {period}, as of {as_of})")
+    missing = [t for t in tickers if histories[t] is None]
+    lines.extend(f"{t}: Could not find price history. It may be an invalid symbol." for t in missing)
+    return "\n".join(lines)
+
+
+stock_analytics_tool = Tool(
+    name="stock_analytics",
+    description=(
+        "Computes stock analytics from daily price history for one or more tickers in a single call: "
+        "price, return (over the period), ytd, return_1m / return_3m / return_1y, sma_<N> (e.g. sma_50), "
+        "volatility (annualised) and max_drawdown; a metric the price history cannot cover is 'n/a'. Input is either tickers like 'NVDA, AAPL' (all metrics over 1y), "
+        "or a JSON object like {\"tickers\": \"NVDA, AAPL\", \"metrics\": [\"ytd\", \"sma_50\"], \"period\": \"6mo\"}."
+    ),
+    function=stock_analytics_function
+)
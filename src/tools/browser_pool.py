@@ -0,0 +1,292 @@
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from .http_client import DEFAULT_HEADERS
+
+logger = logging.getLogger(__name__)
+
+# Resource types that are never needed to read a page's text
+BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+
+# Heuristic readiness check used when no selector is given: the page has rendered some text
+_TEXT_READY_JS = "(n) => !!document.body && document.body.innerText.trim().length >= n"
+
+# Reads the rendered text of the main content in-page. Boilerplate inside it is hidden first,
+# since innerText skips non-rendered elements. Falls back to <body> if the main node is nearly empty.
+_MAIN_TEXT_JS = """
+(minChars) => {
+  const boilerplate = 'script, style, noscript, template, svg, nav, footer, aside, form, dialog, ' +
+      '[role="navigation"], [role="banner"], [role="contentinfo"], [role="complementary"], [aria-hidden="true"]';
+  const read = (root) => {
+    root.querySelectorAll(boilerplate).forEach(el => el.style.setProperty('display', 'none', 'important'));
+    return root.innerText.split('\\n').map(line => line.replace(/\\s+/g, ' ').trim()).filter(Boolean);
+  };
+  if (!document.body) return [];
+  const main = document.querySelector('main, [role="main"], article');
+  let lines = main ? read(main) : [];
+  if (lines.join(' ').length < minChars) lines = read(document.body);
+  return document.title ? [document.title.trim(), ...lines] : lines;
+}
+"""
+
+
+@dataclass
+class RenderedPage:
+    """ A page rendered by BrowserPool.render(). """
+    url: str
+    status: Optional[int]
+    html: str
+    text_blocks: List[str]  # Rendered text of the main content (innerText lines), boilerplate removed
+
+
+class _Slot:
+    """ A reusable browser context with one open page. """
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    A long-lived headless Chromium shared by all dynamic web tools.
+
+    - The browser is launched once and kept warm; it is relaunched if it disconnects.
+    - At most `max_contexts` pages render at once. Each context keeps its page open and is
+      reused, then recycled after `max_uses_per_context` renders or after any failure.
+    - Images, fonts and media are aborted at the request-routing layer.
+    - Navigation waits for `domcontentloaded`, then for a selector (or, by default, for
+      some body text to appear), never for `networkidle`.
+
+    Playwright objects are bound to the event loop that created them, so the pool runs the
+    async API on its own background loop thread. render() may be called from any number of
+    threads; calls block until their page is rendered.
+    """
+
+    def __init__(self,
+                 max_contexts: int = 4,
+                 max_uses_per_context: int = 50,
+                 headless: bool = True,
+                 blocked_resource_types: Tuple[str, ...] = BLOCKED_RESOURCE_TYPES,
+                 navigation_timeout: float = 30.0,
+                 ready_timeout: float = 5.0,
+                 min_text_chars: int = 200,
+                 render_timeout: Optional[float] = None,
+                 launcher: Optional[Callable[[], Awaitable]] = None):
+        """
+        Args:
+            max_contexts: Maximum browser contexts (and so concurrent renders).
+            max_uses_per_context: Renders after which a context is closed and replaced.
+            headless: Run Chromium headless.
+            blocked_resource_types: Playwright resource types to abort.
+            navigation_timeout: Seconds to wait for `domcontentloaded`.
+            ready_timeout: Seconds to wait for the selector / text heuristic after that.
+                           On timeout, whatever has rendered so far is returned.
+            min_text_chars: Body text length that counts as "ready" for the heuristic.
+            render_timeout: Seconds render() waits in total before cancelling the render and
+                            freeing its context. Defaults to both timeouts above plus 10 seconds.
+            launcher: Coroutine function returning a connected browser. Defaults to launching
+                      Chromium with Playwright (a custom launcher is mainly for tests).
+        """
+        self.max_contexts = max_contexts
+        self.max_uses_per_context = max_uses_per_context
+        self.headless = headless
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self.navigation_timeout = navigation_timeout
+        self.ready_timeout = ready_timeout
+        self.min_text_chars = min_text_chars
+        self.render_timeout = render_timeout if render_timeout is not None else navigation_timeout + ready_timeout + 10
+        self._launcher = launcher or self._launch_chromium
+
+        self._start_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._playwright = None
+        self._browser = None
+        # The following are only touched from the pool's loop thread
+        self._idle: List[_Slot] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+    # --- Public API ---
+
+    def render(self, url: str, wait_for: Optional[str] = None) -> RenderedPage:
+        """
+        Renders `url` and returns its HTML and the rendered text of its main content.
+        Safe to call from multiple threads.
+
+        Args:
+            url: The page to load.
+            wait_for: Optional CSS selector to wait for after `domcontentloaded`.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+            TimeoutError: If the render took longer than `render_timeout`. It is cancelled,
+                          so its context is discarded and the slot freed.
+            Exception: Playwright errors from navigation.
+        """
+        future = self._submit(self._render(url, wait_for))
+        try:
+            return future.result(timeout=self.render_timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning(f"Rendering {url} took longer than {self.render_timeout}s. Cancelled it.")
+            raise
+
+    def close(self) -> None:
+        """ Closes all contexts and the browser, and stops the loop thread. Idempotent. """
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=30)
+        except Exception as e:
+            logger.warning(f"Error while closing the browser pool: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+
+    # --- Loop thread management ---
+
+    def _submit(self, coroutine):
+        with self._start_lock:
+            if self._closed:
+                coroutine.close()
+                raise RuntimeError("The browser pool is closed.")
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="browser-pool", daemon=True)
+                self._thread.start()
+            return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    # --- Coroutines (run on the pool's loop) ---
+
+    async def _launch_chromium(self):
+        from playwright.async_api import async_playwright
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=self.headless)
+
+    async def _ensure_browser(self):
+        """ Launches the browser, or relaunches it (dropping stale contexts) if it disconnected. """
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_contexts)
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._browser is not None:
+                    logger.warning("Browser disconnected. Relaunching.")
+                self._idle.clear()
+                self._browser = await self._launcher()
+                logger.info("Browser pool: browser launched.")
+            return self._browser
+
+    async def _new_slot(self) -> _Slot:
+        browser = await self._ensure_browser()
+        context = await browser.new_context(user_agent=DEFAULT_HEADERS["User-Agent"])
+        if self.blocked_resource_types:
+            await context.route("**/*", self._route)
+        page = await context.new_page()
+        return _Slot(context, page)
+
+    async def _route(self, route):
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire(self) -> _Slot:
+        await self._ensure_browser()
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                slot = self._idle.pop()
+                if self._browser.is_connected() and not slot.page.is_closed():
+                    return slot
+                await self._discard(slot)
+            return await self._new_slot()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def _release(self, slot: _Slot, healthy: bool) -> None:
+        try:
+            slot.uses += 1
+            if healthy and slot.uses < self.max_uses_per_context and not self._closed:
+                self._idle.append(slot)
+            else:
+                await self._discard(slot)
+        finally:
+            self._slots.release()
+
+    async def _discard(self, slot: _Slot) -> None:
+        try:
+            await slot.context.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing a browser context: {e}")
+
+    async def _render(self, url: str, wait_for: Optional[str]) -> RenderedPage:
+        slot = await self._acquire()
+        healthy = False
+        try:
+            page = slot.page
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=self.navigation_timeout * 1000)
+            await self._wait_until_ready(page, wait_for)
+            html = await page.content()
+            text_blocks = await page.evaluate(_MAIN_TEXT_JS, self.min_text_chars)
+            healthy = True
+            return RenderedPage(url=page.url, status=response.status if response else None,
+                                html=html, text_blocks=list(text_blocks or []))
+        finally:
+            await self._release(slot, healthy)
+
+    async def _wait_until_ready(self, page, wait_for: Optional[str]) -> None:
+        """ Waits for the selector (or some body text). A timeout is not an error: we read what rendered. """
+        try:
+            if wait_for:
+                await page.wait_for_selector(wait_for, timeout=self.ready_timeout * 1000)
+            else:
+                await page.wait_for_function(_TEXT_READY_JS, arg=self.min_text_chars, timeout=self.ready_timeout * 1000)
+        except Exception as e:
+            logger.debug(f"Page not ready after {self.ready_timeout}s ({e}). Reading it as rendered so far.")
+
+    async def _shutdown(self) -> None:
+        for slot in self._idle:
+            await self._discard(slot)
+        self._idle.clear()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+
+_shared_pool: Optional[BrowserPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """ Returns the process-wide BrowserPool, creating it on first use. It is closed at exit. """
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_lock:
+            if _shared_pool is None:
+                _shared_pool = BrowserPool()
+                atexit.register(_shared_pool.close)
+    return _shared_pool
+
+
+def set_browser_pool(pool: Optional[BrowserPool]) -> None:
+    """ Replaces the shared pool (e.g. to change limits, or to inject a fake browser in tests). """
+    global _shared_pool
+    with _shared_lock:
+        _shared_pool = pool
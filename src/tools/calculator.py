@@ -0,0 +1,238 @@
+import ast
+import json
+import logging
+import math
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_INPUT_CHARS = 4000
+# Largest integer a statement may produce, in bits (2**100_000 is ~30k digits)
+MAX_INT_BITS = 100_000
+
+
+class CalculatorError(ValueError):
+    """ Raised for input the calculator refuses or cannot evaluate. """
+
+
+def _array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+def _pow(base, exponent):
+    """ `**` with a guard against results too large to compute (e.g. 9 ** 9 ** 9) and complex results. """
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        if exponent * math.log2(abs(base)) > MAX_INT_BITS:
+            raise CalculatorError("Exponent too large.")
+    result = base ** exponent
+    if isinstance(result, complex):
+        raise CalculatorError("The result is a complex number (e.g. a fractional power of a negative number).")
+    return result
+
+def _mul(left, right):
+    """ `*` with the same size guard for integers, so repeated squaring cannot grow without bound. """
+    if isinstance(left, int) and isinstance(right, int) and left.bit_length() + right.bit_length() > MAX_INT_BITS + 1:
+        raise CalculatorError("Result too large.")
+    return left * right
+
+def _round(x, ndigits=None):
+    if isinstance(x, np.ndarray):
+        return np.round(x, ndigits or 0)
+    return round(x) if ndigits is None else round(x, int(ndigits))
+
+def _reduce(function, scalar_function=None):
+    """ min/max/sum that take either several numbers or one array; plain numbers stay plain Python numbers. """
+    def reduce(*args):
+        if scalar_function and len(args) > 1 and not any(isinstance(a, np.ndarray) for a in args):
+            return scalar_function(args)
+        return function(args[0]) if len(args) == 1 else function(_array(args))
+    return reduce
+
+FUNCTIONS = {
+    "abs": abs, "round": _round,
+    "min": _reduce(np.min, min), "max": _reduce(np.max, max), "sum": _reduce(np.sum, sum),
+    "mean": _reduce(np.mean), "median": _reduce(np.median), "std": _reduce(np.std),
+    "sqrt": np.sqrt, "exp": np.exp, "log": np.log, "log10": np.log10, "log2": np.log2,
+    "sin": np.sin, "cos": np.cos, "tan": np.tan, "floor": np.floor, "ceil": np.ceil,
+    "cumsum": np.cumsum, "cumprod": np.cumprod, "array": _array,
+}
+CONSTANTS = {"pi": math.pi, "e": math.e}
+_HELPERS = {"_array": _array, "_pow": _pow, "_mul": _mul}
+_HELPER_FOR_OP = {ast.Pow: "_pow", ast.Mult: "_mul"}
+
+_ALLOWED_NODES = (
+    ast.Module, ast.Expr, ast.Assign, ast.Name, ast.Load, ast.Store, ast.Constant,
+    ast.BinOp, ast.UnaryOp, ast.Call, ast.List, ast.Tuple,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub,
+)
+
+
+class _Compiler(ast.NodeTransformer):
+    """ Rejects anything outside the arithmetic whitelist and rewrites `**`, `*` and list literals to safe helpers. """
+
+    def generic_visit(self, node):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise CalculatorError(f"'{type(node).__name__}' is not allowed.")
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise CalculatorError(f"Only numbers are allowed, not {node.value!r}.")
+        return node
+
+    def visit_Name(self, node):
+        if node.id.startswith("_"):
+            raise CalculatorError(f"Name '{node.id}' is not allowed.")
+        if isinstance(node.ctx, ast.Store) and (node.id in FUNCTIONS or node.id in CONSTANTS):
+            raise CalculatorError(f"Cannot assign to '{node.id}'.")
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+            raise CalculatorError("Only calls to the built-in math functions are allowed.")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+    def visit_Assign(self, node):
+        if len(node.targets) != 1 or not isinstance(node.targets[0], ast.Name):
+            raise CalculatorError("Assignments must look like 'name = expression'.")
+        return self.generic_visit(node)
+
+    def visit_BinOp(self, node):
+        node = self.generic_visit(node)
+        helper = _HELPER_FOR_OP.get(type(node.op))
+        if helper:
+            return ast.copy_location(ast.Call(func=ast.Name(helper, ast.Load()), args=[node.left, node.right], keywords=[]), node)
+        return node
+
+    def visit_List(self, node):
+        node = self.generic_visit(node)
+        return ast.copy_location(ast.Call(func=ast.Name("_array", ast.Load()), args=[ast.List(node.elts, ast.Load())], keywords=[]), node)
+
+    visit_Tuple = visit_List
+
+
+@lru_cache(maxsize=1024)
+def compile_statements(source: str) -> Tuple[Tuple[Optional[str], str, Any], ...]:
+    """
+    Parses and validates `source` (one or more statements) and compiles each one.
+    Results are cached, so repeated expressions skip parsing entirely.
+
+    Returns:
+        A tuple of (assigned name or None, statement text, code object) per statement.
+
+    Raises:
+        CalculatorError: For syntax errors, expressions nested too deeply to compile,
+            or anything outside the arithmetic whitelist.
+    """
+    try:
+        return _compile_statements(source)
+    except (RecursionError, MemoryError):
+        raise CalculatorError("The expression is too long or too deeply nested.") from None
+
+
+def _compile_statements(source: str) -> Tuple[Tuple[Optional[str], str, Any], ...]:
+    try:
+        tree = ast.parse(source, mode="exec")
+    except SyntaxError as e:
+        raise CalculatorError(f"Invalid syntax: {e.msg}.") from None
+    if not tree.body:
+        raise CalculatorError("The expression is empty.")
+
+    compiled = []
+    for statement in tree.body:
+        text = ast.get_source_segment(source, statement) or ""
+        statement = _Compiler().visit(statement)
+        if isinstance(statement, ast.Assign):
+            target, value = statement.targets[0].id, statement.value
+        else:
+            target, value = None, statement.value
+        expression = ast.fix_missing_locations(ast.Expression(value))
+        compiled.append((target, text, compile(expression, "<calculator>", "eval")))
+    return tuple(compiled)
+
+
+def evaluate(source: str, variables: Optional[Dict[str, Any]] = None) -> List[Tuple[Optional[str], str, Any]]:
+    """
+    Evaluates one or more statements (separated by newlines or ';'), in order.
+    Assignments (`x = 2 * 3`) define variables for later statements. List literals
+    become NumPy arrays, so `[100, 250] * 1.08` is computed element-wise.
+
+    Returns:
+        (assigned name or None, statement text, value) per statement.
+
+    Raises:
+        CalculatorError: For rejected input, unknown names or math errors.
+    """
+    if len(source) > MAX_INPUT_CHARS:
+        raise CalculatorError(f"Input is longer than {MAX_INPUT_CHARS} characters.")
+    namespace = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS, **_HELPERS, **(variables or {})}
+    results = []
+    with np.errstate(divide="raise", invalid="raise", over="raise"):
+        for target, text, code in compile_statements(source):
+            try:
+                value = eval(code, namespace)
+            except CalculatorError:
+                raise
+            except NameError as e:
+                raise CalculatorError(f"Unknown name in '{text}': {e}.") from None
+            except (ZeroDivisionError, FloatingPointError):
+                raise CalculatorError(f"Division by zero or invalid math in '{text}'.") from None
+            except (OverflowError, TypeError, ValueError) as e:
+                raise CalculatorError(f"Could not evaluate '{text}': {e}.") from None
+            if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+                raise CalculatorError(f"Result of '{text}' is too large.")
+            if target:
+                namespace[target] = value
+            results.append((target, text, value))
+    return results
+
+
+def format_value(value: Any) -> str:
+    """ Plain numbers as Python prints them; arrays as lists; integers too long to print in scientific notation. """
+    if isinstance(value, np.ndarray):
+        return str(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    try:
+        return str(value)
+    except ValueError:  # More digits than sys.get_int_max_str_digits() allows
+        return f"{Decimal(value):.15e}"
+
+
+_CODE_FENCE = re.compile(r"^```\w*|```$")
+
+
+def calculate(expression: str) -> str:
+    """
+    The calculator tool's entry point. Accepts:
+      - a single expression: '250 * 0.15'                    -> '37.5'
+      - statements with assignments: 'a = 120 * 3; b = a * 0.2; a + b'
+      - a JSON list of expressions: '["250 * 0.15", "2 ** 10"]'
+    Several statements return one 'statement = value' line each.
+    """
+    source = _CODE_FENCE.sub("", expression.strip()).replace("`", "").strip()
+    if source.startswith("[") and source.endswith("]") and '"' in source:
+        try:
+            items = json.loads(source)
+            if isinstance(items, list) and all(isinstance(i, str) for i in items):
+                source = "\n".join(items)
+        except json.JSONDecodeError:
+            pass
+
+    logger.info(f"Calculator Expression: {source}")
+    try:
+        results = evaluate(source)
+    except CalculatorError as e:
+        return f"Error: {e}"
+
+    if len(results) == 1 and results[0][0] is None:
+        return format_value(results[0][2])
+    return "\n".join(
+        f"{target} = {format_value(value)}" if target else f"{text} = {format_value(value)}"
+        for target, text, value in results
+    )
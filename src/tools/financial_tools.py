@@ -1,27 +1,46 @@
 import logging
 
-import yfinance as yf
-
 from .base import Tool
+from .market_data import get_market_data_engine, parse_tickers
 
 logger = logging.getLogger(__name__)
 
 def get_stock_price_function(ticker: str) -> str:
-    """Gets the current stock price for a given ticker symbol."""
-    
-    logger.info(f"Fetching stock price for: {ticker}")
-    stock = yf.Ticker(ticker.strip().upper())
-    history = stock.history(period="1d")
+    """
+    Gets the current stock price for one or more (comma-separated) ticker symbols.
+    All symbols are fetched in one batch and cached briefly by the shared MarketDataEngine.
+    """
     
-    if history.empty:
-        return f"Could not find stock data for ticker '{ticker}'. It may be an invalid symbol."
-        
-    price = history['Close'].iloc[-1]
-    return str(round(price, 2))
+    tickers = parse_tickers(ticker)
+    if not tickers:
+        return "Error: Please provide at least one ticker symbol, e.g. 'AAPL' or 'AAPL, MSFT'."
+
+    logger.info(f"Fetching stock price for: {', '.join(tickers)}")
+    quotes = get_market_data_engine().get_quotes(tickers)
+
+    if len(tickers) == 1:
+        quote = quotes[tickers[0]]
+        if quote is None:
+            return f"Could not find stock data for ticker '{tickers[0]}'. It may be an invalid symbol."
+        price = str(round(quote.price, 2))
+        return f"{price} ({quote.staleness()})" if quote.from_cache else price
+
+    lines = []
+    for symbol in tickers:
+        quote = quotes[symbol]
+        if quote is None:
+            lines.append(f"{symbol}: Could not find stock data. It may be an invalid symbol.")
+        else:
+            lines.append(f"{symbol}: {round(quote.price, 2)} ({quote.staleness()})")
+    return "\n".join(lines)
 
 
 get_stock_price_tool = Tool(
     name="get_stock_price",
-    description="Gets the current, real-time stock price for a given stock ticker symbol. Input MUST be a valid ticker like 'AAPL' or 'GOOG'.",
+    description=(
+        "Gets the current, real-time stock price for one or more stock ticker symbols. "
+        "Input MUST be a valid ticker like 'AAPL', or several comma-separated tickers like 'AAPL, MSFT, NVDA' "
+        "to get them all in one call."
+    ),
     function=get_stock_price_function
-)
\ No newline at end of file
+)
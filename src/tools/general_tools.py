@@ -1,58 +1,83 @@
 import logging
+import os
+import threading
+from typing import Optional
 
 from ddgs import DDGS
 from .base import Tool 
+from .calculator import calculate
+from .web_tools import prefetch_pages
 
 logger = logging.getLogger(__name__)
 
 # --- Calculator ---
 def calculator_function(expression: str) -> str:
-    """Evaluates a python mathematical expression"""
-    # 1. SANITIZATION
-    # Remove anything that isn't a digit, operator, dot, or parenthesis
-    # This fixes the "\n---" issue by simply deleting the ---
-    # We keep newlines out.
-    clean_expression = expression.strip()
-    
-    # Remove markdown artifacts if they slipped through parser
-    clean_expression = clean_expression.replace("`", "").replace("\n", " ")
-
-    logger.info(f"Calculator Expression: {clean_expression}")
-
-    # 2. Safety Check (Basic)
-    # Prevent import execution
-    if "__" in clean_expression or "import" in clean_expression:
-            return "Error: Unsafe characters detected in expression."
-    
-    # 3. Execution
-    # eval is safe-ish here because we are in a controlled environment,
-    # but in production, use a library like 'numexpr' or 'asteval'.    
-    # A safer way to eval, but still be careful in real production
-    return str(eval(expression, {"__builtins__": None}, {}))
+    """
+    Evaluates arithmetic safely: the input is parsed and checked against a whitelist of
+    numbers, operators and math functions (see src.tools.calculator), never passed to a bare eval.
+    Several expressions or `name = value` assignments can be evaluated in one call.
+    """
+    return calculate(expression)
 
 calculator_tool = Tool(
     name="calculator",
-    description="Calculates the result of a mathematical expression. Input MUST be a valid mathematical formula (e.g., '250 * 0.15'). Do NOT include currency symbols, text, or commas.",
+    description=(
+        "Calculates the result of a mathematical expression. Input MUST be a valid mathematical formula (e.g., '250 * 0.15'). "
+        "Do NOT include currency symbols, text, or thousands separators. "
+        "To do several steps at once, separate expressions with ';' and name intermediate results, "
+        "e.g. 'subtotal = 3 * 19.99; tax = subtotal * 0.08; subtotal + tax'. "
+        "Lists apply element-wise, e.g. '[120, 340, 95] * 1.08'. "
+        "Functions: sqrt, log, exp, abs, round, min, max, sum, mean, median, std, cumsum; constants pi, e."
+    ),
     function=calculator_function
 )
 
 # --- Search ---
-def search_function(query: str) -> str:
-    """Performs a web search and returns titles, snippets, and URLs."""
+_ddgs_sessions = threading.local()
+
+def get_ddgs() -> DDGS:
+    """ Returns this thread's long-lived DDGS session, so queries reuse its connections. """
+    ddgs = getattr(_ddgs_sessions, "ddgs", None)
+    if ddgs is None:
+        ddgs = _ddgs_sessions.ddgs = DDGS()
+    return ddgs
+
+# Number of top result pages fetched in the background after a search. Off unless
+# enabled per call or with the AI_AGENT_SEARCH_PREFETCH_TOP_K environment variable.
+SEARCH_PREFETCH_TOP_K = 0
+SEARCH_PREFETCH_ENV_VAR = "AI_AGENT_SEARCH_PREFETCH_TOP_K"
+
+def _default_prefetch_top_k() -> int:
+    try:
+        return int(os.environ.get(SEARCH_PREFETCH_ENV_VAR, SEARCH_PREFETCH_TOP_K))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {SEARCH_PREFETCH_ENV_VAR}={os.environ[SEARCH_PREFETCH_ENV_VAR]!r}.")
+        return SEARCH_PREFETCH_TOP_K
+
+def search_function(query: str, prefetch_top_k: Optional[int] = None) -> str:
+    """
+    Performs a web search and returns titles, snippets, and URLs.
+    Optionally, the top `prefetch_top_k` result pages start downloading into the page cache
+    right away, since the next step is usually to browse one of them. Prefetch is off by
+    default; None uses the AI_AGENT_SEARCH_PREFETCH_TOP_K environment variable, if set.
+    """
     
     logger.info(f"Search Query: {query}")
     
-    with DDGS() as ddgs:
-        # The result object contains 'title', 'body', and 'href'
-        results = [result for result in ddgs.text(query, max_results=4)]
-        if not results:
-            return f"No information found for '{query}'."
-        
-        formatted_results = "\n".join(
-            f"[{i+1}] {res['title']}: {res['body']} (URL: {res['href']})" 
-            for i, res in enumerate(results)
-        )        
-        return formatted_results
+    # The result object contains 'title', 'body', and 'href'
+    results = [result for result in get_ddgs().text(query, max_results=4)]
+    if not results:
+        return f"No information found for '{query}'."
+
+    top_k = _default_prefetch_top_k() if prefetch_top_k is None else prefetch_top_k
+    if top_k > 0:
+        prefetch_pages([res.get('href') for res in results[:top_k]])
+    
+    formatted_results = "\n".join(
+        f"[{i+1}] {res['title']}: {res['body']} (URL: {res['href']})" 
+        for i, res in enumerate(results)
+    )        
+    return formatted_results
 
 search_tool = Tool(
     name="search",
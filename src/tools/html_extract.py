@@ -0,0 +1,222 @@
+import logging
+import re
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Elements whose content is never readable page text.
+_SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object", "embed",
+    "nav", "footer", "aside", "form", "button", "select", "dialog", "menu",
+}
+# Elements that start a new block of text.
+_BLOCK_TAGS = {
+    "title", "p", "div", "section", "article", "main", "header", "h1", "h2", "h3", "h4", "h5", "h6",
+    "ul", "ol", "li", "dl", "dt", "dd", "table", "thead", "tbody", "tr", "td", "th", "caption",
+    "pre", "blockquote", "figure", "figcaption", "br", "hr", "address", "details", "summary",
+}
+_BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search", "dialog", "menu", "alert"}
+# Words that mark an id or class token as boilerplate, alone or as a part of it ("site-nav", "footer_col")
+_BOILERPLATE_NAMES = {
+    "nav", "navbar", "navigation", "menu", "footer", "sidebar", "breadcrumb", "breadcrumbs", "cookie", "cookies",
+    "consent", "banner", "advert", "ad", "ads", "sponsored", "share", "sharing", "social", "popup", "modal",
+    "newsletter", "subscribe", "related", "promo", "skip",
+}
+# Modifier tokens describe the layout around the content ("has-main-navigation", "with-sidebar"), not boilerplate
+_MODIFIER_PREFIXES = {"has", "with", "without", "no", "is", "show", "hide"}
+# Page-level containers are never dropped for their id or class
+_STRUCTURAL_TAGS = {"html", "body", "main", "article"}
+_NAME_SEPARATORS = re.compile(r"[_-]+")
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+Markup = Union[bytes, str]
+
+
+def _is_boilerplate_name(token: str) -> bool:
+    """ Whether one id or class token names a boilerplate element. """
+    parts = [part for part in _NAME_SEPARATORS.split(token) if part]
+    return bool(parts) and parts[0] not in _MODIFIER_PREFIXES and any(part in _BOILERPLATE_NAMES for part in parts)
+
+
+class _BlockCollector:
+    """
+    An lxml parser target that turns a stream of parse events into text blocks,
+    dropping boilerplate subtrees. No tree is built, so memory stays flat and the
+    work happens in libxml2 rather than Python object graphs.
+    """
+
+    def __init__(self):
+        self.blocks: List[str] = []
+        self.body_block_count = 0  # Blocks outside <title>
+        self.char_count = 0
+        self._buffer: List[str] = []
+        self._skip_depth = 0
+        self._skipping_stack: List[bool] = []
+        self._content_depth = 0  # Depth inside <article>/<main>, where <header> is content
+        self._in_title = False
+
+    def _is_boilerplate(self, tag: str, attrib) -> bool:
+        if tag in _SKIP_TAGS:
+            return True
+        if tag == "header" and not self._content_depth:
+            return True
+        if attrib.get("role", "").lower() in _BOILERPLATE_ROLES:
+            return True
+        if attrib.get("aria-hidden") == "true" or "hidden" in attrib:
+            return True
+        if _HIDDEN_STYLE.search(attrib.get("style", "")):
+            return True
+        if tag in _STRUCTURAL_TAGS:
+            return False
+        tokens = f"{attrib.get('id', '')} {attrib.get('class', '')}".lower().split()
+        return any(_is_boilerplate_name(token) for token in tokens)
+
+    def _flush(self) -> None:
+        if self._buffer:
+            block = _WHITESPACE.sub(" ", "".join(self._buffer)).strip()
+            self._buffer = []
+            if block:
+                self.blocks.append(block)
+                self.body_block_count += not self._in_title
+
+    # --- lxml parser target interface ---
+    def start(self, tag, attrib):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        skip = not self._skip_depth and self._is_boilerplate(tag, attrib)
+        self._skipping_stack.append(skip)
+        if skip:
+            self._flush()
+            self._skip_depth += 1
+        if tag in ("article", "main"):
+            self._content_depth += 1
+        if tag in _BLOCK_TAGS and not self._skip_depth:
+            self._flush()
+        if tag == "title":
+            self._in_title = True
+
+    def end(self, tag):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in _BLOCK_TAGS and not self._skip_depth:
+            self._flush()
+        if tag == "title":
+            self._in_title = False
+        if tag in ("article", "main") and self._content_depth:
+            self._content_depth -= 1
+        if self._skipping_stack and self._skipping_stack.pop():
+            self._skip_depth -= 1
+
+    def data(self, data):
+        if not self._skip_depth:
+            self._buffer.append(data)
+            self.char_count += len(data.strip())
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        self._flush()
+        return self.blocks
+
+
+class HtmlExtractor(ABC):
+    """ Turns raw HTML into readable text blocks (paragraphs, headings, list items...). """
+
+    @abstractmethod
+    def extract_blocks(self, markup: Markup, encoding: Optional[str] = None) -> List[str]:
+        pass
+
+    def extract(self, markup: Markup, encoding: Optional[str] = None) -> str:
+        """ Readable text: one block per line. """
+        return "\n".join(self.extract_blocks(markup, encoding))
+
+    def _extract_checked(self, markup: Markup, encoding: Optional[str] = None) -> Tuple[List[str], bool]:
+        """ The blocks, and whether they hold any page text beyond the <title>. """
+        blocks = self.extract_blocks(markup, encoding)
+        return blocks, bool(blocks)
+
+
+class LxmlExtractor(HtmlExtractor):
+    """
+    Streams the document through libxml2's HTML parser with an event target: no DOM
+    is built, and navigation, headers/footers, sidebars, cookie banners, ads and
+    hidden elements are dropped while parsing.
+    """
+
+    def extract_blocks(self, markup: Markup, encoding: Optional[str] = None) -> List[str]:
+        return self._extract_checked(markup, encoding)[0]
+
+    def _extract_checked(self, markup: Markup, encoding: Optional[str] = None) -> Tuple[List[str], bool]:
+        if isinstance(markup, str):
+            markup, encoding = markup.encode("utf-8"), "utf-8"
+        if not markup:
+            return [], False
+        collector = _BlockCollector()
+        parser = etree.HTMLParser(target=collector, encoding=encoding, remove_comments=True)
+        parser.feed(markup)
+        return parser.close(), collector.body_block_count > 0
+
+
+class SoupExtractor(HtmlExtractor):
+    """ The original BeautifulSoup extractor: drops scripts and styles, keeps everything else. """
+
+    def extract_blocks(self, markup: Markup, encoding: Optional[str] = None) -> List[str]:
+        soup = BeautifulSoup(markup, "html.parser", from_encoding=encoding if isinstance(markup, bytes) else None)
+        for script_or_style in soup(["script", "style"]):
+            script_or_style.decompose()
+        return list(soup.stripped_strings)
+
+
+class TextProgress:
+    """
+    A stop condition for HttpClient.fetch(): feeds each downloaded chunk to an incremental
+    LxmlExtractor-equivalent parser and reports True once `limit` characters of readable
+    text have arrived, so the rest of the page is never downloaded.
+    """
+
+    def __init__(self, limit: int, encoding: Optional[str] = None):
+        self.limit = limit
+        self._collector = _BlockCollector()
+        self._parser = etree.HTMLParser(target=self._collector, encoding=encoding)
+
+    @property
+    def count(self) -> int:
+        return self._collector.char_count
+
+    def __call__(self, chunk: bytes) -> bool:
+        try:
+            self._parser.feed(chunk)
+        except etree.LxmlError:
+            return False
+        return self.count >= self.limit
+
+
+_lxml_extractor = LxmlExtractor()
+_soup_extractor = SoupExtractor()
+
+
+def extract_blocks(markup: Markup, encoding: Optional[str] = None, extractor: Optional[HtmlExtractor] = None) -> List[str]:
+    """
+    Extracts readable text blocks with the given extractor (lxml by default).
+    Falls back to BeautifulSoup if lxml fails or finds nothing but the <title> on a non-empty page.
+    """
+    extractor = extractor or _lxml_extractor
+    try:
+        blocks, has_text = extractor._extract_checked(markup, encoding)
+        if has_text or not markup or extractor is _soup_extractor:
+            return blocks
+        logger.debug("Primary extractor found no text. Falling back to BeautifulSoup.")
+    except Exception as e:
+        if extractor is _soup_extractor:
+            raise
+        logger.warning(f"HTML extraction failed ({e}). Falling back to BeautifulSoup.")
+    return _soup_extractor.extract_blocks(markup, encoding)
+
+
+def extract_text(markup: Markup, encoding: Optional[str] = None, extractor: Optional[HtmlExtractor] = None) -> str:
+    """ Readable text of a page, one block per line. See extract_blocks(). """
+    return "\n".join(extract_blocks(markup, encoding, extractor))
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    # Mimic a real browser to avoid being blocked
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,text/plain;q=0.8,*/*;q=0.5",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "br, gzip, deflate",
+}
+
+
+# Content types worth downloading for text extraction. Anything else is rejected from the headers.
+TEXT_CONTENT_TYPES = ("text/", "application/xhtml+xml", "application/xml", "application/json", "+xml", "+json")
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+
+
+class FetchError(Exception):
+    """ Raised when a response is rejected before (or while) downloading its body. """
+
+
+@dataclass
+class FetchResult:
+    """ A (possibly partial) response body fetched by HttpClient.fetch(). """
+    url: str
+    status_code: int
+    content_type: str
+    encoding: Optional[str]
+    body: bytes
+    truncated: bool  # True if reading stopped early (byte cap or stop condition)
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _check_content_type(response: httpx.Response, allowed_types: Optional[Tuple[str, ...]]) -> str:
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if allowed_types and content_type and not any(t in content_type for t in allowed_types):
+        raise FetchError(f"Unsupported content type '{content_type}'.")
+    return content_type
+
+
+class HttpClient:
+    """
+    The shared fetch layer for all web tools.
+
+    - Pooled keep-alive connections (HTTP/2 when the server supports it, brotli/gzip bodies).
+    - A per-host concurrency cap, so many agents running at once don't hammer one site.
+    - An optional per-host politeness delay between request starts.
+
+    Sync callers use get()/stream(); async callers use aget()/astream(). The async
+    client is created lazily per event loop, since httpx async clients are loop-bound.
+    """
+
+    def __init__(self,
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 per_host_limit: int = 4,
+                 politeness_delay: float = 0.0,
+                 timeout: float = 15.0,
+                 http2: bool = True,
+                 headers: Optional[Dict[str, str]] = None,
+                 transport: Optional[httpx.BaseTransport] = None,
+                 async_transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            max_connections: Total connections the pool may open.
+            max_keepalive_connections: Idle connections kept open for reuse.
+            per_host_limit: Maximum concurrent requests to a single host.
+            politeness_delay: Minimum seconds between two request starts to the same host.
+            timeout: Per-request timeout in seconds.
+            http2: Negotiate HTTP/2 where available.
+            headers: Default headers. Defaults to browser-like headers.
+            transport / async_transport: Custom httpx transports (e.g. httpx.MockTransport in tests).
+        """
+        self.per_host_limit = per_host_limit
+        self.politeness_delay = politeness_delay
+        self._client_kwargs = dict(
+            http2=http2,
+            headers=headers or DEFAULT_HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections),
+        )
+        self._client = httpx.Client(transport=transport, **self._client_kwargs)
+        self._async_transport = async_transport
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+        self._lock = threading.Lock()
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    # --- Sync API ---
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        """ GETs a URL through the pool, honoring the per-host cap and politeness delay. """
+        with self._host_slot(url):
+            return self._client.get(url, **kwargs)
+
+    @contextmanager
+    def stream(self, url: str, **kwargs):
+        """ Streams a GET response (the body is read lazily). The host slot is held until the block exits. """
+        with self._host_slot(url):
+            with self._client.stream("GET", url, **kwargs) as response:
+                yield response
+
+    def fetch(self, url: str,
+              max_bytes: int = DEFAULT_MAX_BYTES,
+              allowed_types: Optional[Tuple[str, ...]] = TEXT_CONTENT_TYPES,
+              stop: Optional[Callable[[bytes], bool]] = None) -> FetchResult:
+        """
+        Streams a page body without buffering more than needed.
+
+        The Content-Type header is checked before any of the body is read, so PDFs,
+        images and other binaries are rejected (FetchError) without downloading them.
+        Reading stops after `max_bytes` (decompressed), or as soon as `stop(chunk)`
+        returns True, e.g. once enough text has been extracted.
+
+        Raises:
+            FetchError: For a rejected content type.
+            httpx.HTTPError: For network errors and 4xx/5xx responses.
+        """
+        with self.stream(url) as response:
+            response.raise_for_status()
+            content_type = _check_content_type(response, allowed_types)
+            chunks, size, truncated = [], 0, False
+            for chunk in response.iter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes or (stop is not None and stop(chunk)):
+                    truncated = True
+                    break
+            body = b"".join(chunks)[:max_bytes]
+            return FetchResult(str(response.url), response.status_code, content_type, response.charset_encoding, body, truncated)
+
+    # --- Async API ---
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        async with self._async_host_slot(url):
+            return await self._get_async_client().get(url, **kwargs)
+
+    @asynccontextmanager
+    async def astream(self, url: str, **kwargs):
+        async with self._async_host_slot(url):
+            async with self._get_async_client().stream("GET", url, **kwargs) as response:
+                yield response
+
+    async def afetch(self, url: str,
+                     max_bytes: int = DEFAULT_MAX_BYTES,
+                     allowed_types: Optional[Tuple[str, ...]] = TEXT_CONTENT_TYPES,
+                     stop: Optional[Callable[[bytes], bool]] = None) -> FetchResult:
+        """ Async counterpart of fetch(). """
+        async with self.astream(url) as response:
+            response.raise_for_status()
+            content_type = _check_content_type(response, allowed_types)
+            chunks, size, truncated = [], 0, False
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes or (stop is not None and stop(chunk)):
+                    truncated = True
+                    break
+            body = b"".join(chunks)[:max_bytes]
+            return FetchResult(str(response.url), response.status_code, content_type, response.charset_encoding, body, truncated)
+
+    def close(self) -> None:
+        """ Closes the sync pool. Async clients are closed with aclose() from their own loop. """
+        self._client.close()
+
+    async def aclose(self) -> None:
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    # --- Internals ---
+
+    def _politeness_wait(self, host: str) -> float:
+        """ Reserves the next start slot for `host` and returns how long to wait for it. """
+        if self.politeness_delay <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.politeness_delay
+            return start - now
+
+    @contextmanager
+    def _host_slot(self, url: str):
+        host = _host(url)
+        with self._lock:
+            semaphore = self._host_semaphores.setdefault(host, threading.BoundedSemaphore(self.per_host_limit))
+        with semaphore:
+            wait = self._politeness_wait(host)
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+    @asynccontextmanager
+    async def _async_host_slot(self, url: str):
+        host = _host(url)
+        loop = asyncio.get_running_loop()
+        semaphores = self._async_semaphores.setdefault(loop, {})
+        semaphore = semaphores.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        async with semaphore:
+            wait = self._politeness_wait(host)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(transport=self._async_transport, **self._client_kwargs)
+            self._async_clients[loop] = client
+        return client
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """ Returns the process-wide HttpClient shared by all web tools, creating it on first use. """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = HttpClient()
+    return _shared_client
+
+
+def set_http_client(client: Optional[HttpClient]) -> None:
+    """ Replaces the shared client (e.g. to change limits, or to inject a mock transport in tests). """
+    global _shared_client
+    with _shared_lock:
+        _shared_client = client
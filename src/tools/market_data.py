@@ -0,0 +1,309 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+# Environment variable naming a JSON fixture file. When set, no network calls are made.
+FIXTURE_ENV_VAR = "MARKET_DATA_FIXTURE"
+
+_TICKER_SEPARATORS = re.compile(r"[\s,;]+")
+
+
+def parse_tickers(text: str, max_tickers: int = 20) -> List[str]:
+    """ Splits 'aapl, MSFT nvda' into ['AAPL', 'MSFT', 'NVDA'] (deduplicated, order kept). """
+    tickers = []
+    for token in _TICKER_SEPARATORS.split(text.strip().strip("'\"").upper()):
+        token = token.strip("'\"")
+        if token and token not in tickers:
+            tickers.append(token)
+    return tickers[:max_tickers]
+
+
+@dataclass
+class Quote:
+    """ The latest known price of a ticker. """
+    ticker: str
+    price: float
+    as_of: Optional[float]  # Epoch seconds of the market bar the price comes from, if known
+    fetched_at: float       # Epoch seconds when the quote was downloaded
+    from_cache: bool
+
+    @property
+    def age(self) -> float:
+        """ Seconds since the quote was downloaded. """
+        return max(0.0, time.time() - self.fetched_at)
+
+    def staleness(self) -> str:
+        """ A short human-readable note on how old the quote is. """
+        parts = []
+        if self.as_of is not None:
+            parts.append("as of " + time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime(self.as_of)))
+        parts.append(f"cached {int(self.age)}s ago" if self.from_cache else "just fetched")
+        return ", ".join(parts)
+
+
+@dataclass
+class PriceHistory:
+    """ Daily closing prices of a ticker: day-resolution dates and float32 closes (12 bytes per day). """
+    ticker: str
+    dates: np.ndarray   # datetime64[D]
+    closes: np.ndarray  # float32
+    fetched_at: float
+    from_cache: bool
+
+
+class _QuoteTable:
+    """
+    Quotes stored column-wise in NumPy arrays (price, bar time, fetch time) with a
+    ticker -> row index, so thousands of symbols cost a few KB and expiry checks are vectorised.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.rows: Dict[str, int] = {}
+        self.price = np.full(capacity, np.nan, dtype=np.float64)
+        self.as_of = np.full(capacity, np.nan, dtype=np.float64)
+        self.fetched = np.zeros(capacity, dtype=np.float64)
+
+    def put(self, ticker: str, price: float, as_of: Optional[float], fetched: float) -> None:
+        row = self.rows.get(ticker)
+        if row is None:
+            row = self.rows[ticker] = len(self.rows)
+            if row >= len(self.price):
+                grow = len(self.price)
+                self.price = np.concatenate([self.price, np.full(grow, np.nan)])
+                self.as_of = np.concatenate([self.as_of, np.full(grow, np.nan)])
+                self.fetched = np.concatenate([self.fetched, np.zeros(grow)])
+        self.price[row] = price
+        self.as_of[row] = np.nan if as_of is None else as_of
+        self.fetched[row] = fetched
+
+    def fresh(self, tickers: List[str], ttl: float, now: float) -> np.ndarray:
+        """ A boolean mask: which of `tickers` have a quote younger than `ttl`. """
+        rows = np.array([self.rows.get(t, -1) for t in tickers], dtype=np.intp)
+        known = rows >= 0
+        mask = np.zeros(len(tickers), dtype=bool)
+        mask[known] = (now - self.fetched[rows[known]]) < ttl
+        return mask
+
+    def get(self, ticker: str) -> Quote:
+        row = self.rows[ticker]
+        as_of = self.as_of[row]
+        return Quote(ticker, float(self.price[row]), None if np.isnan(as_of) else float(as_of),
+                     float(self.fetched[row]), from_cache=True)
+
+    def clear(self) -> None:
+        self.rows.clear()
+
+
+class MarketDataEngine:
+    """
+    Batched, cached stock quotes and price histories.
+
+    - Tickers missing from the cache (or older than `ttl`) are fetched together: one
+      `yf.download` call for several symbols, `yf.Ticker(...).history` for a single one.
+    - Quotes live in a compact NumPy-backed table and are reused for `ttl` seconds.
+    - Every quote carries its market bar time and fetch time, so callers can report staleness.
+    - In fixture mode (a JSON file, or the MARKET_DATA_FIXTURE environment variable) quotes
+      come from the file and no network calls are made, for tests and benchmarks.
+
+    - get_history() does the same for daily close histories (see PriceHistory).
+
+    Fixture format: {"quotes": {"AAPL": {"price": 301.25, "as_of": "2025-01-02T21:00:00Z"}, ...},
+                     "history": {"AAPL": {"dates": ["2025-01-02", ...], "close": [243.85, ...]}, ...}}
+    """
+
+    def __init__(self, ttl: float = 60.0, history_ttl: float = 900.0, fixture_path: Optional[str] = None):
+        """
+        Args:
+            ttl: Seconds a quote is served from the cache before it is refetched.
+            history_ttl: Seconds a price history is served from the cache.
+            fixture_path: Optional JSON fixture file; enables offline fixture mode.
+        """
+        self.ttl = ttl
+        self.history_ttl = history_ttl
+        self.fixture_history: Dict[str, tuple] = {}
+        self.fixture = self._load_fixture(fixture_path) if fixture_path else None
+        self._table = _QuoteTable()
+        self._histories: Dict[tuple, PriceHistory] = {}
+        self._lock = threading.Lock()
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Optional[Quote]]:
+        """
+        Returns a quote per ticker (None if no data was found), in the order given.
+        Only expired or unknown tickers are fetched, all in one batch.
+        """
+        now = time.time()
+        with self._lock:
+            fresh = self._table.fresh(tickers, self.ttl, now)
+            quotes = {t: self._table.get(t) if ok else None for t, ok in zip(tickers, fresh)}
+        missing = [t for t, ok in zip(tickers, fresh) if not ok]
+
+        if missing:
+            logger.info(f"Fetching quotes for: {', '.join(missing)}")
+            fetched = self._fetch(missing)
+            with self._lock:
+                for ticker, (price, as_of) in fetched.items():
+                    self._table.put(ticker, price, as_of, now)
+            for ticker in missing:
+                if ticker in fetched:
+                    price, as_of = fetched[ticker]
+                    quotes[ticker] = Quote(ticker, price, as_of, now, from_cache=False)
+        return quotes
+
+    def get_history(self, tickers: List[str], period: str = "1y") -> Dict[str, Optional[PriceHistory]]:
+        """
+        Returns the daily close history per ticker over `period` (a yfinance period such as
+        '6mo', '1y', 'ytd'), or None for tickers without data. Histories are cached for
+        `history_ttl`; the missing ones are downloaded in one batch.
+        """
+        now = time.time()
+        with self._lock:
+            histories = {}
+            for ticker in tickers:
+                cached = self._histories.get((ticker, period))
+                if cached is not None and now - cached.fetched_at < self.history_ttl:
+                    histories[ticker] = PriceHistory(ticker, cached.dates, cached.closes, cached.fetched_at, from_cache=True)
+                else:
+                    histories[ticker] = None
+        missing = [t for t in tickers if histories[t] is None]
+
+        if missing:
+            logger.info(f"Fetching {period} price history for: {', '.join(missing)}")
+            fetched = self._fetch_history(missing, period)
+            with self._lock:
+                for ticker, (dates, closes) in fetched.items():
+                    history = PriceHistory(ticker, dates, closes, now, from_cache=False)
+                    self._histories[(ticker, period)] = history
+                    if ticker in histories:
+                        histories[ticker] = history
+        return histories
+
+    def clear(self) -> None:
+        with self._lock:
+            self._table.clear()
+            self._histories.clear()
+
+    # --- Fetching ---
+
+    def _fetch(self, tickers: List[str]) -> Dict[str, tuple]:
+        """ Returns {ticker: (price, bar_epoch_or_None)} for the tickers that have data. """
+        if self.fixture is not None:
+            return {t: self.fixture[t] for t in tickers if t in self.fixture}
+        if len(tickers) == 1:
+            return self._fetch_single(tickers[0])
+        return self._fetch_batch(tickers)
+
+    @staticmethod
+    def _fetch_single(ticker: str) -> Dict[str, tuple]:
+        history = yf.Ticker(ticker).history(period="1d")
+        if history.empty:
+            return {}
+        return {ticker: (float(history['Close'].iloc[-1]), _bar_epoch(history.index[-1]))}
+
+    @staticmethod
+    def _fetch_batch(tickers: List[str]) -> Dict[str, tuple]:
+        # A few days back, so every symbol has a last valid close even across holidays
+        data = yf.download(tickers, period="5d", group_by="column", auto_adjust=False,
+                           progress=False, threads=True)
+        if data is None or data.empty:
+            return {}
+        index, columns, values = _close_matrix(data, tickers)
+
+        # Last non-NaN close per column, vectorised
+        valid = ~np.isnan(values)
+        has_data = valid.any(axis=0)
+        last_rows = values.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+        result = {}
+        for col, ticker in enumerate(columns):
+            if has_data[col]:
+                row = last_rows[col]
+                result[ticker] = (float(values[row, col]), _bar_epoch(index[row]))
+        return result
+
+    def _fetch_history(self, tickers: List[str], period: str) -> Dict[str, tuple]:
+        """ Returns {ticker: (dates as datetime64[D], closes as float32)} for the tickers that have data. """
+        if self.fixture is not None:
+            return {t: self.fixture_history[t] for t in tickers if t in self.fixture_history}
+        # Adjusted closes, so returns include splits and dividends
+        data = yf.download(tickers, period=period, group_by="column", auto_adjust=True,
+                           progress=False, threads=True)
+        if data is None or data.empty:
+            return {}
+        index, columns, values = _close_matrix(data, tickers)
+        dates = pd.DatetimeIndex(index).tz_localize(None).values.astype("datetime64[D]")
+        result = {}
+        for col, ticker in enumerate(columns):
+            valid = ~np.isnan(values[:, col])
+            if valid.any():
+                result[ticker] = (dates[valid], values[valid, col].astype(np.float32))
+        return result
+
+    def _load_fixture(self, path: str) -> Dict[str, tuple]:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        quotes = {}
+        for ticker, entry in data.get("quotes", {}).items():
+            as_of = entry.get("as_of")
+            quotes[ticker.upper()] = (float(entry["price"]), _bar_epoch(as_of) if as_of else None)
+        self.fixture_history = {
+            ticker.upper(): (np.array(entry["dates"], dtype="datetime64[D]"), np.array(entry["close"], dtype=np.float32))
+            for ticker, entry in data.get("history", {}).items()
+        }
+        logger.info(f"Market data fixture mode: {len(quotes)} quotes and {len(self.fixture_history)} histories "
+                    f"loaded from {path}.")
+        return quotes
+
+
+def _close_matrix(data: pd.DataFrame, tickers: List[str]):
+    """ (index, tickers, float64 values of shape dates x tickers) of the 'Close' columns of a yf.download frame. """
+    closes = data["Close"]
+    values = closes.to_numpy(dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    columns = [str(c).upper() for c in getattr(closes, "columns", tickers[:1])]
+    return closes.index, columns, values
+
+
+def _bar_epoch(timestamp) -> Optional[float]:
+    """ Epoch seconds of a bar timestamp (pandas Timestamp, datetime or ISO string), or None. """
+    if not isinstance(timestamp, (str, datetime, np.datetime64)):
+        return None
+    try:
+        value = pd.Timestamp(timestamp)
+        if value.tzinfo is None:
+            value = value.tz_localize("UTC")
+        return float(value.timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+_shared_engine: Optional[MarketDataEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_market_data_engine() -> MarketDataEngine:
+    """ Returns the process-wide MarketDataEngine (in fixture mode if MARKET_DATA_FIXTURE is set). """
+    global _shared_engine
+    if _shared_engine is None:
+        with _shared_lock:
+            if _shared_engine is None:
+                _shared_engine = MarketDataEngine(fixture_path=os.environ.get(FIXTURE_ENV_VAR) or None)
+    return _shared_engine
+
+
+def set_market_data_engine(engine: Optional[MarketDataEngine]) -> None:
+    """ Replaces the shared engine (e.g. with a fixture-backed one in tests). """
+    global _shared_engine
+    with _shared_lock:
+        _shared_engine = engine
@@ -0,0 +1,151 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from src.utils.cache import BoundedCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url: str) -> str:
+    """ A cache key for a URL: scheme and host lower-cased, fragment dropped. """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+class PageCache:
+    """
+    A short-lived, in-memory cache of fetched pages shared by the web tools.
+
+    - get_or_fetch() is single-flight: concurrent requests for the same URL wait for
+      one fetch instead of each downloading the page.
+    - prefetch() warms the cache in the background (e.g. with the top search results while
+      the model is still thinking). It uses a small bounded worker pool and drops URLs once
+      `max_queued` are waiting, so it can never flood hosts; the per-host caps of the
+      shared HttpClient apply on top.
+
+    Failed fetches are not cached.
+    """
+
+    def __init__(self, max_pages: int = 64, ttl: float = 600.0, max_workers: int = 2, max_queued: int = 8):
+        """
+        Args:
+            max_pages: Maximum pages kept (least recently used evicted).
+            ttl: Seconds a fetched page stays valid.
+            max_workers: Background prefetch threads.
+            max_queued: Maximum prefetches in flight or waiting; further URLs are skipped.
+        """
+        self.max_queued = max_queued
+        self._pages = BoundedCache(max_size=max_pages, ttl=ttl)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._queued = 0
+
+    def get(self, url: str) -> Optional[Any]:
+        """ The cached page for `url`, or None. Does not wait for an in-flight fetch. """
+        return self._pages.get(normalize_url(url))
+
+    def get_or_fetch(self, url: str, fetch: Callable[[], Any], accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Returns the cached page for `url`, joins an in-flight fetch of it, or calls `fetch()`.
+
+        Args:
+            url: The page URL.
+            fetch: Fetches the page. Its exceptions propagate to every waiting caller.
+            accept: Optional check that a cached/in-flight page is good enough for this caller
+                    (e.g. not truncated). If it is not, the page is fetched again.
+        """
+        key = normalize_url(url)
+        cached = self._pages.get(key)
+        if cached is not None and (accept is None or accept(cached)):
+            logger.debug(f"Page cache hit: {url}")
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            logger.debug(f"Joining in-flight fetch of {url}")
+            page = future.result()
+            if accept is None or accept(page):
+                return page
+            return self._store(key, fetch())
+        return self._run(key, fetch, future)
+
+    def prefetch(self, urls: Iterable[str], fetch: Callable[[str], Any]) -> int:
+        """
+        Starts background fetches of `urls` that are neither cached nor in flight.
+        Returns the number of fetches started. Never blocks.
+        """
+        started = 0
+        for url in urls:
+            key = normalize_url(url)
+            if self._pages.get(key) is not None:
+                continue
+            with self._lock:
+                if key in self._inflight or self._queued >= self.max_queued:
+                    continue
+                future = self._inflight[key] = Future()
+                self._queued += 1
+            self._executor.submit(self._run_prefetch, key, url, fetch, future)
+            started += 1
+        if started:
+            logger.info(f"Prefetching {started} page(s) in the background.")
+        return started
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+    # --- Internals ---
+
+    def _store(self, key: str, page: Any) -> Any:
+        self._pages.set(key, page)
+        return page
+
+    def _run(self, key: str, fetch: Callable[[], Any], future: Future) -> Any:
+        try:
+            page = self._store(key, fetch())
+            future.set_result(page)
+            return page
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _run_prefetch(self, key: str, url: str, fetch: Callable[[str], Any], future: Future) -> None:
+        try:
+            self._run(key, lambda: fetch(url), future)
+        except Exception as e:
+            logger.debug(f"Prefetch of {url} failed: {e}")
+        finally:
+            with self._lock:
+                self._queued -= 1
+
+
+_shared_cache: Optional[PageCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """ Returns the process-wide PageCache shared by the web tools, creating it on first use. """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = PageCache()
+    return _shared_cache
+
+
+def set_page_cache(cache: Optional[PageCache]) -> None:
+    """ Replaces the shared page cache (e.g. with a fresh one in tests). """
+    global _shared_cache
+    with _shared_lock:
+        _shared_cache = cache
@@ -0,0 +1,114 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .base import Tool
+from .general_tools import get_ddgs
+from .web_tools import _browse_blocks
+from .retrieval import BM25Index, chunk_blocks
+from src.utils.text import estimate_tokens, hashed_ngram_vector, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# How many search results are fetched and read
+SEARCH_AND_READ_TOP_K = 3
+# Budget of the passages in the digest, and the cap per source so one page can't crowd out the rest
+DIGEST_TOKEN_BUDGET = 1500
+MAX_PASSAGES_PER_SOURCE = 3
+DIGEST_PASSAGE_CHARS = 600
+# Passages this similar (hashed n-gram cosine) to an already chosen one are dropped as near-duplicates
+DUPLICATE_SIMILARITY = 0.9
+
+
+def _read_source(url: str) -> Optional[List[str]]:
+    """ The text blocks of a result page, or None if it could not be read. """
+    try:
+        return _browse_blocks(url)
+    except Exception as e:
+        logger.info(f"search_and_read skipped {url}: {e}")
+        return None
+
+
+def search_and_read_function(query: str, top_k: int = SEARCH_AND_READ_TOP_K) -> str:
+    """
+    Searches the web and reads the top result pages in one step.
+
+    The top `top_k` results are fetched in parallel (through the shared page cache and
+    HTTP pool). Their passages are ranked together against the query with BM25, near-duplicates
+    across sources are dropped, and the best passages within DIGEST_TOKEN_BUDGET are kept.
+    Results are listed in search order, each with its passages, or with its search snippet
+    if it was not read or had nothing relevant.
+    """
+    query = query.strip().strip('"')
+    if not query:
+        return "Error: Please provide a search query."
+    logger.info(f"Search-and-read query: {query}")
+
+    results = [r for r in get_ddgs().text(query, max_results=max(top_k, 4)) if r.get("href")]
+    if not results:
+        return f"No information found for '{query}'."
+    to_read = results[:top_k]
+
+    with ThreadPoolExecutor(max_workers=len(to_read), thread_name_prefix="search-read") as pool:
+        pages = list(pool.map(lambda r: _read_source(r["href"]), to_read))
+
+    # One passage list across all sources, so passages compete on relevance.
+    # Paragraphs already seen on an earlier source (syndicated copies, boilerplate) are dropped first.
+    passages, sources, seen_blocks = [], [], set()
+    for source, blocks in enumerate(pages):
+        unique_blocks = []
+        for block in blocks or []:
+            key = normalize_text(block)
+            if key not in seen_blocks:
+                seen_blocks.add(key)
+                unique_blocks.append(block)
+        for passage in chunk_blocks(unique_blocks, chunk_chars=DIGEST_PASSAGE_CHARS):
+            passages.append(passage)
+            sources.append(source)
+
+    chosen: Dict[int, List[int]] = {}
+    if passages:
+        scores = BM25Index(passages).scores(query)
+        kept_vectors, used = [], 0
+        for i in np.argsort(-scores, kind="stable"):
+            if scores[i] <= 0:
+                break
+            source = sources[i]
+            if len(chosen.get(source, [])) >= MAX_PASSAGES_PER_SOURCE:
+                continue
+            cost = estimate_tokens(passages[i])
+            if used + cost > DIGEST_TOKEN_BUDGET:
+                continue
+            vector = hashed_ngram_vector(passages[i])
+            if kept_vectors and float(np.max(np.stack(kept_vectors) @ vector)) >= DUPLICATE_SIMILARITY:
+                continue
+            kept_vectors.append(vector)
+            chosen.setdefault(source, []).append(int(i))
+            used += cost
+
+    lines = [f"Search results for '{query}':"]
+    for n, result in enumerate(results, start=1):
+        source = n - 1
+        header = f"[{n}] {result.get('title', '').strip()} (URL: {result['href']})"
+        if source in chosen:
+            lines.append(header)
+            # Passages in page order, so each source reads coherently
+            lines.extend(f"  - {passages[i]}" for i in sorted(chosen[source]))
+        elif source < len(to_read) and pages[source] is None:
+            lines.append(f"{header} [could not be read] {result.get('body', '').strip()}")
+        else:
+            lines.append(f"{header} [snippet] {result.get('body', '').strip()}")
+    return "\n".join(lines)
+
+
+search_and_read_tool = Tool(
+    name="search_and_read",
+    description=(
+        "Searches the web AND reads the top result pages in a single step. Returns the most relevant passages "
+        "from each page with their source URL, so you usually don't need to browse the results separately. "
+        "Use it for research questions. Input MUST be a specific search query (e.g. 'Mars average surface pressure')."
+    ),
+    function=search_and_read_function
+)
@@ -0,0 +1,144 @@
+import logging
+import re
+from typing import List, Sequence, Union
+
+import numpy as np
+
+from src.utils.text import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from has have how in is it its of on or that the this to was were "
+    "what when where which who why with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """ Lower-cased alphanumeric terms, minus a few stopwords. """
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def chunk_blocks(blocks: Sequence[str], chunk_chars: int = 1000) -> List[str]:
+    """
+    Packs consecutive text blocks (paragraphs, headings, list items...) into passages of
+    at most ~`chunk_chars` characters. Blocks longer than that are split at sentence ends.
+    Short headings thus stay with the text that follows them.
+    """
+    pieces = []
+    for block in blocks:
+        if len(block) <= chunk_chars:
+            pieces.append(block)
+        else:
+            pieces.extend(s for s in _SENTENCE_END.split(block) if s)
+
+    chunks, current, size = [], [], 0
+    for piece in pieces:
+        if current and size + len(piece) + 1 > chunk_chars:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        # A single sentence may still exceed chunk_chars; hard-split it
+        while len(piece) > chunk_chars:
+            chunks.append(piece[:chunk_chars])
+            piece = piece[chunk_chars:]
+        current.append(piece)
+        size += len(piece) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class BM25Index:
+    """
+    An in-memory Okapi BM25 index over a list of passages.
+
+    Term occurrences are stored as two flat arrays (passage id, term id), so scoring a
+    query is a handful of vectorised NumPy operations over only the matching occurrences,
+    without building a passages x vocabulary matrix.
+    """
+
+    def __init__(self, passages: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.passages = list(passages)
+        self.k1 = k1
+        self.b = b
+        self._vocab = {}
+        doc_ids, term_ids = [], []
+        lengths = np.zeros(len(self.passages), dtype=np.float32)
+        for i, passage in enumerate(self.passages):
+            terms = tokenize(passage)
+            lengths[i] = len(terms)
+            doc_ids.extend([i] * len(terms))
+            term_ids.extend(self._vocab.setdefault(t, len(self._vocab)) for t in terms)
+        self._doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        self._term_ids = np.asarray(term_ids, dtype=np.int32)
+        avg_length = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+        self._length_norm = k1 * (1 - b + b * lengths / avg_length)
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def scores(self, query: str) -> np.ndarray:
+        """ BM25 score of every passage for `query` (zeros where no query term occurs). """
+        n = len(self.passages)
+        query_ids = np.unique([self._vocab[t] for t in tokenize(query) if t in self._vocab]).astype(np.int32)
+        if n == 0 or query_ids.size == 0:
+            return np.zeros(n, dtype=np.float32)
+
+        # Map vocabulary ids to query columns, then count only the matching occurrences
+        columns = np.full(len(self._vocab), -1, dtype=np.int32)
+        columns[query_ids] = np.arange(query_ids.size, dtype=np.int32)
+        mask = columns[self._term_ids] >= 0
+        tf = np.zeros((n, query_ids.size), dtype=np.float32)
+        np.add.at(tf, (self._doc_ids[mask], columns[self._term_ids[mask]]), 1.0)
+
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        weighted = tf * (self.k1 + 1) / (tf + self._length_norm[:, None])
+        return (weighted * idf).sum(axis=1)
+
+
+def select_passages(content: Union[str, Sequence[str]],
+                    query: str,
+                    token_budget: int = 1500,
+                    chunk_chars: int = 1000) -> List[str]:
+    """
+    Picks the passages of a page most relevant to `query`, within `token_budget`.
+
+    Args:
+        content: The page as text blocks (see html_extract.extract_blocks) or a single string.
+        query: The question the passages should answer.
+        token_budget: Maximum estimated tokens of the selected passages combined.
+        chunk_chars: Target passage size in characters.
+
+    Returns:
+        The selected passages in their original page order. If no passage shares a term
+        with the query, the leading passages are returned instead.
+    """
+    blocks = [content] if isinstance(content, str) else list(content)
+    passages = chunk_blocks(blocks, chunk_chars)
+    if not passages:
+        return []
+
+    scores = BM25Index(passages).scores(query)
+    if scores.max() > 0:
+        # Highest score first; ties keep page order
+        ranked = np.argsort(-scores, kind="stable")
+        ranked = ranked[scores[ranked] > 0]
+    else:
+        logger.debug("No passage matches the query terms. Using the start of the page.")
+        ranked = np.arange(len(passages))
+
+    selected, used = [], 0
+    for i in ranked:
+        cost = estimate_tokens(passages[i])
+        if used + cost > token_budget:
+            if selected:
+                continue  # A smaller, lower-ranked passage may still fit
+            passages[i] = passages[i][:token_budget * 4]
+            cost = token_budget
+        selected.append(int(i))
+        used += cost
+    logger.debug(f"Selected {len(selected)} of {len(passages)} passages (~{used} tokens).")
+    return [passages[i] for i in sorted(selected)]
@@ -1,89 +1,192 @@
 import logging
 import json
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import httpx
 
 from .base import Tool
+from .http_client import get_http_client, FetchError, FetchResult, DEFAULT_MAX_BYTES
+from .html_extract import extract_blocks, TextProgress
+from .page_cache import get_page_cache
+from .retrieval import chunk_blocks, select_passages
 from src.llm import GroqInterface
 
 logger = logging.getLogger(__name__)
 
-def _browse_raw_text(url: str) -> str:
+# Budget for the page passages sent to the extractor LLM
+EXTRACTION_TOKEN_BUDGET = 2000
+# Smallest passage budget per question when several questions share one extraction call
+MIN_QUESTION_TOKEN_BUDGET = 600
+# Byte budget per page for speculative prefetches
+PREFETCH_MAX_BYTES = 512 * 1024
+# Concurrency and size limits of multi_web_browse
+MULTI_BROWSE_MAX_WORKERS = 4
+MULTI_BROWSE_MAX_ITEMS = 8
+MULTI_BROWSE_MAX_ANSWER_CHARS = 600
+
+def _download_page(url: str, max_chars: Optional[int] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> Tuple[FetchResult, List[str]]:
     """
-    Fetches the clean, readable text content of a single URL. # Post our testing -> Obervation Overload
-    The original "dumb" browse function. This will now be a private helper function
+    Fetches a single URL and returns the (possibly partial) response and its readable text blocks.
+
+    The body is streamed: non-text content types are rejected from the headers, at most
+    `max_bytes` are read, and reading stops once `max_chars` of text have been received.
+
+    Raises:
+        FetchError, httpx.HTTPError: See HttpClient.fetch().
     """
-    
     logging.info(f"Browsing URL: {url}")
-    
-    try:
-        # Set headers to mimic a real browser to avoid being blocked
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url.strip(), headers=headers, timeout=15)
-        response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
 
-        # Use BeautifulSoup to parse the HTML and extract text
-        soup = BeautifulSoup(response.content, 'html.parser')
+    # The shared client pools connections and caps concurrent requests per host
+    result = get_http_client().fetch(
+        url.strip(),
+        max_bytes=max_bytes,
+        stop=TextProgress(max_chars + 1) if max_chars else None
+    )
+    if result.truncated:
+        logging.info(f"Stopped reading {url} early after {len(result.body)} bytes.")
 
-        # Remove irrelevant tags like scripts and styles
-        for script_or_style in soup(["script", "style"]):
-            script_or_style.decompose()
+    # Extract readable text (lxml, boilerplate removed; BeautifulSoup as fallback)
+    return result, extract_blocks(result.body, encoding=result.encoding)
 
-        # Get the text, strip leading/trailing whitespace, and remove excessive newlines
-        text = ' '.join(soup.stripped_strings)
+def _fetch_page(url: str, max_chars: Optional[int] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> Tuple[FetchResult, List[str]]:
+    """
+    Like _download_page(), but served from the shared page cache when possible.
+    Full reads (no `max_chars`) are single-flight and cached; a prefetched page only
+    serves them if it was not cut short by a smaller byte budget.
+    """
+    cache = get_page_cache()
+    if max_chars is None:
+        return cache.get_or_fetch(
+            url,
+            lambda: _download_page(url, max_bytes=max_bytes),
+            accept=lambda page: not page[0].truncated or len(page[0].body) >= max_bytes
+        )
+    # Partial reads are cheap with the early stop; use a cached page if there is one, but don't cache them
+    return cache.get(url) or _download_page(url, max_chars=max_chars, max_bytes=max_bytes)
 
-        # To avoid overwhelming the agent's context window, we truncate the text.
-        # This is a simple but critical step for agent stability.
-        # max_length = 8000
-        # if len(text) > max_length:
-        #     logging.warning(f"Content from {url} was truncated.")
-        #     return text[:max_length] + "... (Content truncated due to length)"
-        
-        return text
+def prefetch_pages(urls: List[str], max_bytes: int = PREFETCH_MAX_BYTES) -> int:
+    """
+    Starts fetching `urls` into the page cache in the background, so that a following
+    browse of one of them is served without waiting. Returns the number of fetches started.
+    """
+    urls = [u for u in urls if u and u.strip().lower().startswith(("http://", "https://"))]
+    return get_page_cache().prefetch(urls, lambda u: _download_page(u, max_bytes=max_bytes))
+
+def _browse_blocks(url: str, max_chars: Optional[int] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> List[str]:
+    """ The readable text blocks of a URL. See _fetch_page(). """
+    return _fetch_page(url, max_chars=max_chars, max_bytes=max_bytes)[1]
 
-    except requests.exceptions.RequestException as e:
+def _browse_error(url: str, e: Exception) -> str:
+    """ The observation returned to the agent when a URL could not be read. """
+    if isinstance(e, FetchError):
+        logging.warning(f"Skipped URL {url}: {e}")
+        return f"Error: Could not read URL '{url}'. {e} Only web pages and text documents are supported."
+    if isinstance(e, httpx.HTTPError):
         logging.error(f"Error browsing URL {url}: {e}")
         return f"Error: Could not fetch content from URL '{url}'. Reason: {e}"
+    logging.error(f"An unexpected error occurred while browsing {url}: {e}")
+    return "Error: An unexpected error occurred while processing the URL."
+
+def _browse_raw_text(url: str, max_chars: Optional[int] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> str:
+    """
+    Fetches the clean, readable text content of a single URL. # Post our testing -> Obervation Overload
+    The original "dumb" browse function. This will now be a private helper function
+    """
+    try:
+        # Join into a single line, the observation format the agent is prompted with
+        return ' '.join(_browse_blocks(url, max_chars=max_chars, max_bytes=max_bytes))
     except Exception as e:
-        logging.error(f"An unexpected error occurred while browsing {url}: {e}")
-        return "Error: An unexpected error occurred while processing the URL."
+        return _browse_error(url, e)
+
+BROWSE_MAX_CHARS = 8000
+
+def browse_function(url: str, max_length: int = BROWSE_MAX_CHARS) -> str:
+    """
+    Returns the readable text of a URL, truncated to avoid overwhelming the agent's context window.
+    This is a simple but critical step for agent stability.
+    Text beyond `max_length` characters is cut and marked with "... (Content truncated due to length)".
+    """
+    text = _browse_raw_text(url, max_chars=max_length)
+    if len(text) > max_length:
+        logging.warning(f"Content from {url} was truncated.")
+        return text[:max_length] + "... (Content truncated due to length)"
+    return text
 
 def inquisitive_browse_function(action_input: str) -> str:
     """
-    A "smart" browse function. It takes a JSON string with a "url" and a "question",
-    browses the URL, and uses a fast LLM to extract the answer to the question.
+    A "smart" browse function. It takes a JSON string with a "url" and a "question"
+    (or a list of questions), browses the URL, and uses a fast LLM to extract the answers.
+    Several questions cost one page fetch and one extraction call.
     """
     try:
         # 1. Parse the structured input
         input_data = json.loads(action_input)
         url = input_data["url"]
-        question = input_data["question"]
-    except (json.JSONDecodeError, KeyError):
+        questions = _parse_questions(input_data)
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
         return "Error: Invalid input format. Please provide a JSON object with 'url' and 'question' keys."
 
-    # 2. Get the raw text content using our helper
-    logger.info(f"Performing inquisitive browse on URL: {url} with question: '{question}'")
-    raw_text = _browse_raw_text(url)
+    logger.info(f"Performing inquisitive browse on URL: {url} with question(s): {questions}")
+    return _format_answers(questions, _answers_from_url(url, questions))
 
-    if raw_text.startswith("Error:"):
-        return raw_text # Pass through any browsing errors
+def _parse_questions(input_data: dict) -> List[str]:
+    """ The question(s) of a browse request: 'question' (a string or a list) or 'questions'. """
+    questions = input_data["questions"] if "questions" in input_data else input_data["question"]
+    if isinstance(questions, str):
+        questions = [questions]
+    questions = [str(q).strip() for q in questions if str(q).strip()]
+    if not questions:
+        raise ValueError("No question given.")
+    return questions
+
+def _format_answers(questions: List[str], answers: List[str]) -> str:
+    """ A single answer is returned as is; several are listed one per question. """
+    if len(questions) == 1:
+        return answers[0]
+    return "\n".join(f"[{i}] {q}: {a}" for i, (q, a) in enumerate(zip(questions, answers), start=1))
+
+def _answer_from_url(url: str, question: str) -> str:
+    """ Reads a page and answers one question about it (or returns an 'Error: ...' observation). """
+    return _answers_from_url(url, [question])[0]
+
+def _answers_from_url(url: str, questions: List[str]) -> List[str]:
+    """ Reads a page once and answers all `questions` about it. A browsing error answers every question. """
+    # 2. Read the whole page and keep only the passages relevant to the questions
+    try:
+        blocks = _browse_blocks(url)
+    except Exception as e:
+        return [_browse_error(url, e)] * len(questions) # Pass through any browsing errors
+
+    # 3. Use a fast LLM to extract the specific answers
+    return _extract_answers(url, blocks, questions)
+
+def _extract_answer(url: str,
+                    blocks: List[str],
+                    question: str,
+                    model: str = "llama-3.1-8b-instant",
+                    token_budget: int = EXTRACTION_TOKEN_BUDGET) -> str:
+    """
+    Answers `question` from a page's text blocks: the passages most relevant to the
+    question (within `token_budget`) are sent to an extractor LLM.
+    """
+    passages = select_passages(blocks, question, token_budget=token_budget)
+    if not passages:
+        return "Information not found."
+    page_text = "\n\n".join(passages)
 
-    # 3. Use a fast LLM to extract the specific answer
     # We instantiate a new interface here for this specific task.
     # Using a fast model is crucial for keeping the tool responsive.
     try:
-        extractor_llm = GroqInterface(model="llama-3.1-8b-instant")
+        extractor_llm = GroqInterface(model=model)
         
         prompt = (
             "You are a highly efficient information extraction assistant. "
-            "You will be given a large body of text and a specific question. "
+            "You will be given passages from a web page and a specific question. "
             "Your task is to answer the question based *only* on the provided text. "
             "If the answer is not found in the text, you MUST respond with 'Information not found.' "
             "Do not use any prior knowledge. Be concise and direct.\n\n"
-            f"--- TEXT ---\n{raw_text[:8000]}\n\n" # Truncate for safety
+            f"--- TEXT ---\n{page_text}\n\n"
             f"--- QUESTION ---\n{question}"
         )
         
@@ -95,12 +198,117 @@ def inquisitive_browse_function(action_input: str) -> str:
         logger.error(f"LLM extraction failed for URL {url}: {e}")
         return f"Error: Failed to extract information with LLM. Reason: {e}"
 
+def _extract_answers(url: str,
+                     blocks: List[str],
+                     questions: List[str],
+                     model: str = "llama-3.1-8b-instant",
+                     token_budget: int = EXTRACTION_TOKEN_BUDGET) -> List[str]:
+    """
+    Answers several questions about one page with a single JSON-mode extraction call.
+
+    Each question gets its own share of the passage budget (at least MIN_QUESTION_TOKEN_BUDGET),
+    and the union of the selected passages, in page order, is sent once.
+    """
+    if len(questions) == 1:
+        return [_extract_answer(url, blocks, questions[0], model=model, token_budget=token_budget)]
+
+    per_question = max(token_budget // len(questions), MIN_QUESTION_TOKEN_BUDGET)
+    selected = set()
+    for question in questions:
+        selected.update(select_passages(blocks, question, token_budget=per_question))
+    if not selected:
+        return ["Information not found."] * len(questions)
+    # select_passages chunks deterministically, so page order is recovered from the full chunking
+    passages = [p for p in chunk_blocks(blocks) if p in selected] or sorted(selected)
+    page_text = "\n\n".join(passages)
+
+    numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, start=1))
+    try:
+        extractor_llm = GroqInterface(model=model)
+
+        prompt = (
+            "You are a highly efficient information extraction assistant. "
+            "You will be given passages from a web page and a numbered list of questions. "
+            "Answer each question based *only* on the provided text. "
+            "If an answer is not found in the text, answer exactly 'Information not found.' "
+            "Do not use any prior knowledge. Be concise and direct.\n"
+            'Respond with a JSON object of the form {"answers": ["answer to 1", "answer to 2", ...]}, '
+            "with exactly one answer per question, in order.\n\n"
+            f"--- TEXT ---\n{page_text}\n\n"
+            f"--- QUESTIONS ---\n{numbered}"
+        )
+
+        messages = [{"role": "user", "content": prompt}]
+        response = extractor_llm.get_chat_completion(messages, json_mode=True)
+        answers = json.loads(response['content'])["answers"]
+        answers = [str(a).strip() or "Information not found." for a in answers]
+    except Exception as e:
+        logger.error(f"Batched LLM extraction failed for URL {url}: {e}")
+        return [f"Error: Failed to extract information with LLM. Reason: {e}"] * len(questions)
+
+    if len(answers) != len(questions):
+        logger.warning(f"Extractor returned {len(answers)} answers for {len(questions)} questions.")
+    answers = answers[:len(questions)]
+    return answers + ["Information not found."] * (len(questions) - len(answers))
+
+def multi_browse_function(action_input: str) -> str:
+    """
+    Answers questions about several pages at once. Takes a JSON list of {"url", "question"}
+    objects, reads and extracts them concurrently through a bounded pool, and returns one
+    combined observation with a status per URL.
+    """
+    try:
+        items = json.loads(action_input)
+        if isinstance(items, dict):
+            items = [items]
+        requests = [(str(item["url"]), str(item["question"])) for item in items]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return ("Error: Invalid input format. Please provide a JSON list of objects with 'url' and 'question' keys, "
+                "e.g. [{\"url\": \"https://a.com\", \"question\": \"...\"}].")
+    if not requests:
+        return "Error: The list of pages to browse is empty."
+
+    skipped = requests[MULTI_BROWSE_MAX_ITEMS:]
+    requests = requests[:MULTI_BROWSE_MAX_ITEMS]
+
+    # Questions about the same URL are coalesced: one fetch and one extraction call per page
+    by_url = {}
+    for index, (url, question) in enumerate(requests):
+        by_url.setdefault(url.strip(), []).append((index, question))
+    logger.info(f"Performing multi browse on {len(by_url)} URL(s) for {len(requests)} question(s).")
+
+    def answer_page(url):
+        return _answers_from_url(url, [question for _, question in by_url[url]])
+
+    answers = [None] * len(requests)
+    with ThreadPoolExecutor(max_workers=min(MULTI_BROWSE_MAX_WORKERS, len(by_url)), thread_name_prefix="multi-browse") as pool:
+        for url, page_answers in zip(by_url, pool.map(answer_page, by_url)):
+            for (index, _), answer in zip(by_url[url], page_answers):
+                answers[index] = answer
+
+    lines = []
+    for i, ((url, _), answer) in enumerate(zip(requests, answers), start=1):
+        answer = " ".join(answer.split())
+        if answer.startswith("Error:"):
+            status = "error"
+        elif answer.lower().startswith("information not found"):
+            status = "not found"
+        else:
+            status = "ok"
+        if len(answer) > MULTI_BROWSE_MAX_ANSWER_CHARS:
+            answer = answer[:MULTI_BROWSE_MAX_ANSWER_CHARS] + "..."
+        lines.append(f"[{i}] {url} ({status}): {answer}")
+    if skipped:
+        lines.append(f"Skipped {len(skipped)} more URL(s); at most {MULTI_BROWSE_MAX_ITEMS} can be read per call.")
+    return "\n".join(lines)
+
 inquisitive_web_browse_tool = Tool(
     name="inquisitive_web_browse",
     description=(
         "Use this tool when you need to find a *specific piece of information* from a webpage. "
         "It is more effective than a simple web_browse. "
         "The input MUST be a JSON object with two keys: 'url' and 'question'. "
+        "To ask several things about the same page, pass a list of questions in one call. "
         "Example: {\"url\": \"https://en.wikipedia.org/wiki/Mars\", \"question\": \"What is the atmospheric pressure on Mars?\"}"
     ),
     function=inquisitive_browse_function
@@ -108,6 +316,22 @@ inquisitive_web_browse_tool = Tool(
 
 web_browse_tool = Tool(
     name="web_browse",
-    description="Use this to **dig deeper into a single URL** found from a 'Search' result. It provides the full text content of a webpage, allowing you to find details that are not in the search summary. Input MUST be a single, valid URL.",
-    function=_browse_raw_text
-)
\ No newline at end of file
+    description=(
+        "Use this to **dig deeper into a single URL** found from a 'Search' result. It provides the text content of a webpage "
+        f"(the first {BROWSE_MAX_CHARS} characters), allowing you to find details that are not in the search summary. "
+        "Input MUST be a single, valid URL."
+    ),
+    function=browse_function
+)
+
+multi_web_browse_tool = Tool(
+    name="multi_web_browse",
+    description=(
+        "Use this tool to find specific information on *several* webpages in one step, e.g. to compare sources. "
+        "The pages are read in parallel and you get one answer per URL. "
+        f"The input MUST be a JSON list (at most {MULTI_BROWSE_MAX_ITEMS} items) of objects with 'url' and 'question' keys. "
+        "Example: [{\"url\": \"https://a.com/pricing\", \"question\": \"What does the Pro plan cost?\"}, "
+        "{\"url\": \"https://b.com/pricing\", \"question\": \"What does the Pro plan cost?\"}]"
+    ),
+    function=multi_browse_function
+)
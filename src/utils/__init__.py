@@ -1,3 +1,6 @@
 from .parser import parse_llm_output
+from .text import normalize_text, hashed_ngram_vector, text_similarity, estimate_tokens
+from .cache import BoundedCache
 
-__all__ = ["parse_llm_output"]
\ No newline at end of file
+__all__ = ["parse_llm_output", "normalize_text", "hashed_ngram_vector", "text_similarity", "estimate_tokens",
+           "BoundedCache"]
@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class BoundedCache:
+    """
+    A thread-safe LRU cache with an optional time-to-live, persistable as JSON.
+
+    Keys are strings or tuples of strings; values must be JSON-serialisable for
+    save()/load() to work.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None, path: Optional[str] = None):
+        """
+        Args:
+            max_size: Maximum number of entries; the least recently used is evicted beyond it.
+            ttl: Seconds after which an entry expires. None means entries never expire.
+            path: Optional JSON file. If it exists it is loaded now; save() writes back to it.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """ Returns the cached value (marking it recently used), or `default` if absent or expired. """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or self._expired(entry[1]):
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """ Stores a value, evicting the least recently used entry if the cache is full. """
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and not self._expired(entry[1])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def save(self, path: Optional[str] = None) -> None:
+        """ Writes the live entries to a JSON file (atomically), oldest first. """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given to save the cache to.")
+        with self._lock:
+            entries = [
+                {"key": list(key) if isinstance(key, tuple) else key, "value": value, "stored_at": stored_at}
+                for key, (value, stored_at) in self._data.items() if not self._expired(stored_at)
+            ]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: Optional[str] = None) -> None:
+        """ Loads entries from a JSON file written by save(). Corrupt files are ignored. """
+        path = path or self.path
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+            loaded = [
+                (tuple(e["key"]) if isinstance(e["key"], list) else e["key"], e["value"], float(e["stored_at"]))
+                for e in entries
+            ]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not load cache from '{path}': {e}")
+            return
+        with self._lock:
+            for key, value, stored_at in loaded:
+                if not self._expired(stored_at):
+                    self._data[key] = (value, stored_at)
+                    self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
@@ -0,0 +1,49 @@
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\n\"'`.,;:!?()[]{}"
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes free text for comparison and cache keys:
+    Unicode NFKC, case-folded, whitespace collapsed, surrounding punctuation stripped.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", str(text)).casefold()
+    text = _WHITESPACE.sub(" ", text)
+    return text.strip(_EDGE_PUNCTUATION)
+
+def hashed_ngram_vector(text: str, dim: int = 512, ngram_range: tuple = (3, 5)) -> np.ndarray:
+    """
+    Embeds text into a fixed-size, L2-normalized float32 vector using the hashing trick
+    over word unigrams and character n-grams. No model or service needed; cosine
+    similarity is a plain dot product. crc32 is used because Python's hash() is salted
+    per process, and these vectors are persisted across runs.
+    """
+    normalized = normalize_text(text)
+    features = normalized.split()
+    padded = f" {normalized} "
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+    vector = np.zeros(dim, dtype=np.float32)
+    if not features:
+        return vector
+    hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+    np.add.at(vector, (hashes % dim).astype(np.intp), signs)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def text_similarity(a: str, b: str, dim: int = 512) -> float:
+    """ Cosine similarity of two texts under hashed_ngram_vector. """
+    return float(hashed_ngram_vector(a, dim) @ hashed_ngram_vector(b, dim))
+
+def estimate_tokens(text: str) -> int:
+    """ A cheap token estimate (~4 characters per token), good enough for budgeting prompts. """
+    return (len(text) + 3) // 4